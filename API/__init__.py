@@ -6,6 +6,10 @@ def create_app():
     app = Flask(__name__)
     CORS(app)
     
+    # Accept gzip-compressed request bodies
+    from API.utils.request_compression import GzipRequestMiddleware
+    app.wsgi_app = GzipRequestMiddleware(app.wsgi_app)
+    
     # Initialize REFPROP
     from API.refprop_setup import RP
     
@@ -8,17 +8,107 @@ of flash calculations (PT, PH, TS, etc.).
 from typing import Dict, List, Any, Tuple, Optional, Union, Callable, Iterator
 import numpy as np
 import logging
-from collections import defaultdict
-import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict, OrderedDict
+import threading
+import ctypes
 import os
 
 
 # Import from property system
 from API.core.property_system import PropertyRegistry
+from API.utils.helpers import composition_array, setup_fluids, refprop_lock
+from API.core.worker_pool import (
+    worker_pool, worker_refprop, next_job_id, default_processes, current_job, set_current_job
+)
 
 logger = logging.getLogger(__name__)
 
+# REFPROP 10 properties fetched with a single ALLPROPS0dll call for
+# single-phase points: viscosity, thermal conductivity and PVT derivatives
+ALLPROPS_FIELDS = ('ETA', 'TCX', 'DPDD', 'DPDT', 'DDDP', 'DDDT')
+
+# Per-process state for parallel grid workers (set per job by _prepare_worker)
+_worker_state: Dict[str, Any] = {}
+
+# Process-wide LRU cache of TPFLSHdll results, keyed by (fluids, composition, T, P)
+TP_FLASH_CACHE_SIZE = 65536
+# Decimals kept in T [K] and P [kPa] for the cache key
+TP_FLASH_CACHE_DECIMALS = 6
+_tp_flash_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+_tp_flash_cache_lock = threading.Lock()
+
+# Entries kept per calculator in the composition-keyed caches; pool workers
+# keep their calculators for their whole lifetime
+COMPOSITION_CACHE_SIZE = 64
+
+
+def _prepare_worker(job: Tuple[Any, ...]) -> None:
+    """
+    Make a job current in this worker process.
+    
+    Calculators are kept per class for the lifetime of the worker, so their
+    caches carry over between requests. The mixture is set up again whenever
+    another job used this worker's REFPROP instance since (see
+    API.core.worker_pool.current_job).
+    
+    Args:
+        job: Tuple with (job id, calculator class name, composition, z, grids,
+             properties, molar mass, use_cache)
+    """
+    job_id, calculator_class, composition, z, grids, properties, molar_mass, use_cache = job
+    if current_job() == job_id:
+        return
+    
+    set_current_job(None)
+    calculators = _worker_state.setdefault('calculators', {})
+    calculator = calculators.get(calculator_class)
+    if calculator is None:
+        calculator = globals()[calculator_class](worker_refprop(), PropertyRegistry())
+        calculators[calculator_class] = calculator
+    if composition is not None:
+        calculator._setup_mixture(composition)
+    calculator._compute_surface_tension = calculator._requires_property(properties, 'surface_tension')
+    calculator._use_flash_cache = use_cache
+    
+    _worker_state.update({
+        'calculator': calculator,
+        'z': z,
+        'grids': grids,
+        'properties': properties,
+        'molar_mass': molar_mass
+    })
+    set_current_job(job_id)
+
+
+def _eval_chunk(args: Tuple[Tuple[Any, ...], List[Tuple[int, Tuple[Any, ...]]]]) -> List[Dict[str, Any]]:
+    """
+    Evaluate a chunk of grid points inside a worker process.
+    
+    Args:
+        args: Tuple with (job, list of (point_idx, grid_point)), see _prepare_worker
+        
+    Returns:
+        Result dictionaries of the points that could be calculated
+    """
+    job, points = args
+    _prepare_worker(job)
+    calculator = _worker_state['calculator']
+    results = []
+    for point_idx, grid_point in points:
+        try:
+            result = calculator._calculate_point(
+                point_idx, grid_point,
+                _worker_state['z'], _worker_state['grids'],
+                _worker_state['properties'], _worker_state['molar_mass']
+            )
+        except Exception as e:
+            logger.debug(f"Error at point {grid_point}: {str(e)}")
+            continue
+        if result is not None:
+            results.append(result)
+    return results
+
+
 class FlashCalculator:
     """
     Base class for all flash calculations.
@@ -38,6 +128,22 @@ class FlashCalculator:
         """
         self.rp = rp
         self.property_registry = property_registry
+        # Composition-only REFPROP results, keyed by ((fluids, composition), composition)
+        self._critical_cache: "OrderedDict[Tuple[Any, ...], Tuple[Optional[float], ...]]" = OrderedDict()
+        # Property units, keyed by (property, unit system)
+        self._unit_cache: Dict[Tuple[str, str], str] = {}
+        # Composition converted to a ctypes array, keyed by composition tuple
+        self._ctypes_z_cache: "OrderedDict[Tuple[float, ...], Any]" = OrderedDict()
+        # ALLPROPS0dll property codes (None = not resolved yet, () = unavailable)
+        self._allprops_codes: Optional[Any] = None
+        # Reusable TPFLSHdll ctypes buffers and arguments (allocated on first use)
+        self._tpflsh_buffers: Optional[Tuple[Any, ...]] = None
+        # Whether SURTENdll is called for two-phase points
+        self._compute_surface_tension = True
+        # Whether TPFLSHdll results are cached, and the (fluids, composition)
+        # part of the cache key for the current mixture
+        self._use_flash_cache = True
+        self._flash_cache_key: Optional[Tuple[Any, ...]] = None
     
     def calculate_flash_grid(self, composition: List[Dict[str, Any]], 
                             variables: Dict[str, Dict[str, Any]], 
@@ -57,6 +163,7 @@ class FlashCalculator:
                 use_parallel: Whether to use parallel processing (default: True)
                 num_processes: Number of processes to use (default: auto)
                 chunk_size: Number of grid points per chunk (default: auto)
+                use_cache: Whether to reuse cached flash results (default: True)
             
         Returns:
             results: List of calculated property points
@@ -66,6 +173,8 @@ class FlashCalculator:
         # Setup mixture
         z = self._setup_mixture(composition)
         molar_mass = self.rp.WMOLdll(z)
+        self._compute_surface_tension = self._requires_property(properties, 'surface_tension')
+        self._use_flash_cache = options.get('use_cache', True)
         
         # Generate grids based on flash type
         grids = self._generate_grids(z, variables, options)
@@ -83,13 +192,16 @@ class FlashCalculator:
         # Determine if parallelization is appropriate
         if use_parallel and total_points > 100:  # Only parallelize for larger grids
             results = self._calculate_grid_parallel(z, grids, properties, molar_mass, 
-                                                  num_processes, chunk_size)
+                                                  num_processes, chunk_size, composition)
         else:
             # Use original sequential calculation
             results = self._calculate_grid_sequential(z, grids, properties, molar_mass)
         
         # Prepare grid info
         grid_info = self._prepare_grid_info(grids, options, len(results))
+        grid_info['failed_points'] = int(total_points - len(results))
+        if grid_info['failed_points']:
+            logger.info(f"{grid_info['failed_points']}/{total_points} grid points could not be calculated")
         
         return results, grid_info, grids
     
@@ -106,26 +218,9 @@ class FlashCalculator:
         try:
             for point_idx, grid_point in enumerate(self._grid_iterator(grids)):
                 try:
-                    # Calculate base properties at this point
-                    base_props = self._calculate_base_properties(z, grid_point)
-                    
-                    # Add molar mass for convenience in property calculations
-                    base_props['molar_mass'] = molar_mass
-                    
-                    # Calculate all requested properties
-                    calculated_props = self._calculate_all_properties(
-                        base_props, properties, z, molar_mass
-                    )
-                    
-                    # Add grid indices
-                    grid_indices = self._get_grid_indices(grid_point, grids)
-                    
-                    # Add to results
-                    results.append({
-                        'index': point_idx,
-                        **grid_indices,
-                        **calculated_props
-                    })
+                    results.append(self._calculate_point(
+                        point_idx, grid_point, z, grids, properties, molar_mass
+                    ))
                     
                     completed += 1
                     
@@ -134,9 +229,9 @@ class FlashCalculator:
                         logger.info(f"Completed {completed}/{total_points} points ({completed/total_points*100:.1f}%)")
                     
                 except Exception as e:
-                    # Log error and continue with next point
+                    # Count the failure and continue with next point
                     error_count += 1
-                    logger.warning(f"Error at point {grid_point}: {str(e)}")
+                    logger.debug(f"Error at point {grid_point}: {str(e)}")
                     continue
             
         except Exception as e:
@@ -148,170 +243,356 @@ class FlashCalculator:
         
         return results
     
+    def _calculate_point(self, point_idx: int, grid_point: Tuple[Any, ...], z: List[float],
+                        grids: Dict[str, np.ndarray], properties: List[str],
+                        molar_mass: float) -> Dict[str, Any]:
+        """
+        Calculate all requested properties at a single grid point.
+        
+        Args:
+            point_idx: Global (flattened) index of the grid point
+            grid_point: Grid point information (from grid_iterator)
+            z: Composition array
+            grids: Dictionary of grid arrays
+            properties: List of properties to calculate
+            molar_mass: Molecular weight
+            
+        Returns:
+            Result dictionary with index, grid indices and calculated properties
+            
+        Raises:
+            ValueError: If the flash calculation fails
+        """
+        # Calculate base properties at this point
+        base_props = self._calculate_base_properties(z, grid_point)
+        
+        # Add molar mass for convenience in property calculations
+        base_props['molar_mass'] = molar_mass
+        
+        # Calculate all requested properties
+        calculated_props = self._calculate_all_properties(
+            base_props, properties, z, molar_mass
+        )
+        
+        # Add grid indices
+        grid_indices = self._get_grid_indices(grid_point, grids)
+        
+        return {
+            'index': point_idx,
+            **grid_indices,
+            **calculated_props
+        }
+    
     def _calculate_grid_parallel(self, z: List[float], grids: Dict[str, np.ndarray], 
                                 properties: List[str], molar_mass: float, 
                                 num_processes: Optional[int] = None, 
-                                chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+                                chunk_size: Optional[int] = None,
+                                composition: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """
         Calculate grid points in parallel using multiple processes.
         
+        Grid points are sent in chunks to the shared worker pool (see
+        API.core.worker_pool), whose processes keep REFPROP loaded between
+        requests; each worker sets up the mixture once per calculation.
+        Results are collected as they complete, so slow points (e.g. near
+        phase boundaries) do not hold back the rest, and sorted by index at
+        the end.
+        
         Args:
             z: Composition array
             grids: Dictionary of grid arrays
             properties: List of properties to calculate
             molar_mass: Molecular weight
-            num_processes: Number of processes to use (None = auto)
+            num_processes: Number of processes to use (None = shared pool size)
             chunk_size: Number of grid points per chunk (None = auto)
+            composition: List of fluid components and fractions (for worker setup)
             
         Returns:
             List of calculated property points
         """
         # Determine number of processes
         if num_processes is None:
-            # Use available CPUs but cap at a reasonable number
-            num_processes = min(multiprocessing.cpu_count(), 8)  
+            # Use available CPUs but cap at the configured maximum
+            num_processes = default_processes()
         
-        # Create a list of all grid points
-        grid_points = list(self._grid_iterator(grids))
-        total_points = len(grid_points)
+        # Flatten the grid into (global index, grid point) pairs
+        point_args = list(enumerate(self._grid_iterator(grids)))
+        total_points = len(point_args)
         
         # Determine chunk size if not specified
         if chunk_size is None:
-            # Aim for each process to handle ~4 chunks
-            chunk_size = max(1, total_points // (num_processes * 4))
-        
-        # Create batches of grid points
-        batches = []
-        for i in range(0, total_points, chunk_size):
-            batches.append(grid_points[i:min(i + chunk_size, total_points)])
+            # Aim for each process to handle ~4 chunks, small enough to balance load
+            chunk_size = max(1, min(64, total_points // (num_processes * 4)))
         
         logger.info(f"Running parallel calculation with {num_processes} processes, "
-                   f"{len(batches)} batches of ~{chunk_size} points each")
-        
-        # Prepare parameters for batch processing
-        batch_args = []
-        for batch_idx, batch in enumerate(batches):
-            # Package everything the worker needs
-            batch_args.append((
-                batch_idx,
-                batch,
-                z,
-                properties,
-                molar_mass,
-                grids,
-                self.__class__.__name__
-            ))
-        
-        # Initialize results list
+                   f"chunks of ~{chunk_size} points")
+        
+        # Every chunk carries the job, so any worker can pick it up
+        job = (next_job_id(), self.__class__.__name__, composition, z, grids, properties,
+               molar_mass, self._use_flash_cache)
+        chunks = [(job, point_args[i:i + chunk_size]) for i in range(0, total_points, chunk_size)]
+        
         all_results = []
         
-        # Execute in parallel using ProcessPoolExecutor
-        with ProcessPoolExecutor(max_workers=num_processes) as executor:
-            future_results = list(executor.map(self._process_batch_wrapper, batch_args))
-            
-            # Collect results
-            for batch_results in future_results:
-                if batch_results:
-                    all_results.extend(batch_results)
+        with worker_pool(num_processes) as pool:
+            for results in pool.imap_unordered(_eval_chunk, chunks):
+                all_results.extend(results)
         
-        # Sort results by index to maintain consistency
-        all_results.sort(key=lambda r: r.get('index', 0))
+        # Restore grid order
+        all_results.sort(key=lambda result: result['index'])
         
         logger.info(f"Parallel calculation complete: {len(all_results)}/{total_points} points "
                   f"({len(all_results)/total_points*100:.1f}%)")
         
         return all_results
     
-    @staticmethod
-    def _process_batch_wrapper(args):
-        """
-        Static wrapper for batch processing to be used with multiprocessing.
-        Each worker process needs its own REFPROP instance.
+    def _setup_mixture(self, composition: List[Dict[str, Any]]) -> np.ndarray:
         """
-        try:
-            batch_idx, batch, z, properties, molar_mass, grids, calculator_class = args
-            
-            # Initialize REFPROP in this worker process
-            from API.refprop_setup import initialize_refprop
-            rp = initialize_refprop()
-            
-            # Create a new property registry in this worker process
-            from API.core.property_system import PropertyRegistry
-            registry = PropertyRegistry()
+        Setup REFPROP mixture.
+        
+        Args:
+            composition: List of fluid components and fractions
             
-            # Dynamically create the appropriate calculator type
-            import importlib
-            module = importlib.import_module('API.core.flash_calculators')
-            calculator_class = getattr(module, calculator_class)
-            calculator = calculator_class(rp, registry)
+        Returns:
+            z: Composition array
             
-            # Process the batch
-            return calculator._process_batch(batch_idx, batch, z, properties, molar_mass, grids)
+        Raises:
+            ValueError: If mixture setup fails
+        """
+        fluid_string = '|'.join(f"{comp['fluid']}.FLD" for comp in composition)
+        z = composition_array([comp['fraction'] for comp in composition])
         
-        except Exception as e:
-            import traceback
-            logger.error(f"Error in process_batch_wrapper: {str(e)}")
-            logger.error(traceback.format_exc())
-            return []
+        ierr, herr = setup_fluids(self.rp, len(composition), fluid_string)
+        if ierr > 0:
+            raise ValueError(f"Error setting up mixture: {herr}")
+        self._flash_cache_key = (fluid_string, tuple(z.tolist()))
+        self.property_registry.mixture_key = self._flash_cache_key
+        return z
     
-    def _process_batch(self, batch_idx: int, batch: List, z: List[float], 
-                     properties: List[str], molar_mass: float, 
-                     grids: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    def _requires_property(self, properties: List[str], name: str) -> bool:
         """
-        Process a batch of grid points in a worker process.
+        Check whether a base property is needed for the requested properties.
+        
+        Args:
+            properties: List of requested properties (aliases allowed)
+            name: Canonical name of the base property
+            
+        Returns:
+            True if the property is requested directly or as a dependency
+        """
+        registry = self.property_registry.properties
+        for prop in properties:
+            if prop not in registry:
+                continue
+            for dep in [prop, *self.property_registry.get_property_dependencies(prop)]:
+                if registry.get(dep, {}).get('alias_of', dep) == name:
+                    return True
+        return False
+    
+    def _get_critical_properties(self, z: List[float]) -> Tuple[Optional[float], Optional[float], Optional[float]]:
         """
-        batch_results = []
-        start_idx = batch_idx * len(batch)
+        Get critical properties for a composition.
         
-        for i, grid_point in enumerate(batch):
+        CRITPdll depends only on the mixture, so the result is cached and
+        reused for every grid point instead of being recalculated per point.
+        The key includes the fluids, since pure fluids all share z=(1, 0, ...).
+        
+        Args:
+            z: Composition array
+            
+        Returns:
+            Tuple with (Tc [K], Pc [kPa], Dc [mol/L]), or Nones on failure
+        """
+        key = (self._flash_cache_key, tuple(z))
+        if key in self._critical_cache:
+            self._critical_cache.move_to_end(key)
+        else:
             try:
-                # Calculate base properties at this point
-                base_props = self._calculate_base_properties(z, grid_point)
-                
-                # Add molar mass for convenience
-                base_props['molar_mass'] = molar_mass
-                
-                # Calculate all requested properties
-                calculated_props = self._calculate_all_properties(
-                    base_props, properties, z, molar_mass
-                )
-                
-                # Add grid indices
-                grid_indices = self._get_grid_indices(grid_point, grids)
-                
-                # Add to results with global index
-                batch_results.append({
-                    'index': start_idx + i,
-                    **grid_indices,
-                    **calculated_props
-                })
-                
+                Tc, Pc, Dc, ierr_crit, herr_crit = self.rp.CRITPdll(z)
+                if ierr_crit > 0:
+                    logger.warning(f"Critical properties warning: {herr_crit}")
+                    Tc = Pc = Dc = None
             except Exception as e:
-                logger.warning(f"Batch {batch_idx}, point {i} error: {str(e)}")
-                continue
+                logger.warning(f"Error calculating critical properties: {str(e)}")
+                Tc = Pc = Dc = None
+            self._critical_cache[key] = (Tc, Pc, Dc)
+            if len(self._critical_cache) > COMPOSITION_CACHE_SIZE:
+                self._critical_cache.popitem(last=False)
+        return self._critical_cache[key]
+    
+    def _tp_flash(self, T_K: float, P_kpa: float, z: List[float]) -> Any:
+        """
+        Call REFPROP TPFLSHdll, reusing results for state points already calculated.
+        
+        Results are kept in a process-wide LRU cache of TP_FLASH_CACHE_SIZE
+        entries, so repeated (T, P) pairs within a grid and across requests for
+        the same mixture skip REFPROP. The cache is bypassed when the grid is
+        calculated with use_cache=False. Cache misses are calculated under
+        refprop_lock(), with the mixture's fluids loaded again if needed.
         
-        return batch_results
+        Args:
+            T_K: Temperature [K]
+            P_kpa: Pressure [kPa]
+            z: Composition array
+            
+        Returns:
+            TPFLSHdll result tuple (D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr, herr)
+        """
+        if not self._use_flash_cache or self._flash_cache_key is None:
+            return self._tp_flash_uncached(T_K, P_kpa, z)
+        
+        T_K = round(T_K, TP_FLASH_CACHE_DECIMALS)
+        P_kpa = round(P_kpa, TP_FLASH_CACHE_DECIMALS)
+        key = (self._flash_cache_key, T_K, P_kpa)
+        with _tp_flash_cache_lock:
+            result = _tp_flash_cache.get(key)
+            if result is not None:
+                _tp_flash_cache.move_to_end(key)
+                return result
+        
+        # Another thread may have loaded other fluids since _setup_mixture;
+        # reload them under the lock so the cached result matches its key
+        fluid_string = self._flash_cache_key[0]
+        with refprop_lock(self.rp):
+            ierr, herr = setup_fluids(self.rp, fluid_string.count('|') + 1, fluid_string)
+            if ierr > 0:
+                raise ValueError(f"Error setting up mixture: {herr}")
+            result = self._tp_flash_uncached(T_K, P_kpa, z)
+        with _tp_flash_cache_lock:
+            _tp_flash_cache[key] = result
+            if len(_tp_flash_cache) > TP_FLASH_CACHE_SIZE:
+                _tp_flash_cache.popitem(last=False)
+        return result
     
-    def _setup_mixture(self, composition: List[Dict[str, Any]]) -> List[float]:
+    def _tp_flash_uncached(self, T_K: float, P_kpa: float, z: List[float]) -> Any:
         """
-        Setup REFPROP mixture.
+        Call REFPROP TPFLSHdll with a composition array converted only once.
+        
+        The ctREFPROP wrapper converts z to a ctypes array on every call; since
+        z is the same for every grid point, the converted array is cached and
+        the underlying library function is called directly. The input and
+        output buffers are allocated once and reused for every grid point.
         
         Args:
-            composition: List of fluid components and fractions
+            T_K: Temperature [K]
+            P_kpa: Pressure [kPa]
+            z: Composition array
             
         Returns:
+            TPFLSHdll result tuple (D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr, herr)
+        """
+        tpflsh = getattr(self.rp, '_TPFLSHdll', None)
+        if tpflsh is None:
+            # Not a ctREFPROP library instance, use the public wrapper
+            return self.rp.TPFLSHdll(T_K, P_kpa, z)
+        
+        from ctREFPROP.ctREFPROP import to_double_array, trim
+        
+        if self._tpflsh_buffers is None:
+            T, P, D, Dl, Dv, q, e, h, s, Cv, Cp, w = (ctypes.c_double() for _ in range(12))
+            x = (20 * ctypes.c_double)()
+            y = (20 * ctypes.c_double)()
+            ierr = ctypes.c_int()
+            herr = ctypes.create_string_buffer(255)
+            buffers = (T, P, D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr, herr)
+            # Arguments following z, passed by reference as TPFLSHdll expects
+            args_after_z = [ctypes.byref(b) for b in (D, Dl, Dv)] + [x, y] + \
+                [ctypes.byref(b) for b in (q, e, h, s, Cv, Cp, w, ierr)] + [herr, 255]
+            self._tpflsh_buffers = (buffers, (ctypes.byref(T), ctypes.byref(P)), args_after_z)
+        
+        buffers, args_before_z, args_after_z = self._tpflsh_buffers
+        T, P, D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr, herr = buffers
+        T.value = T_K
+        P.value = P_kpa
+        # Clear outputs REFPROP may leave partly unwritten
+        ctypes.memset(x, 0, ctypes.sizeof(x))
+        ctypes.memset(y, 0, ctypes.sizeof(y))
+        ctypes.memset(herr, 0, ctypes.sizeof(herr))
+        
+        tpflsh(*args_before_z, self._ctypes_composition(z), *args_after_z)
+        
+        return self.rp._TPFLSHdlloutput_tuple(
+            D.value, Dl.value, Dv.value, to_double_array(x), to_double_array(y),
+            q.value, e.value, h.value, s.value, Cv.value, Cp.value, w.value,
+            ierr.value, trim(herr.raw)
+        )
+    
+    def _ctypes_composition(self, z: List[float]) -> Any:
+        """
+        Get the composition as a ctypes array, converted once per composition.
+        
+        Args:
             z: Composition array
             
-        Raises:
-            ValueError: If mixture setup fails
+        Returns:
+            ctypes double array with the composition
         """
-        fluid_string = '|'.join(f"{comp['fluid']}.FLD" for comp in composition)
-        z = [comp['fraction'] for comp in composition] + [0] * (20 - len(composition))
+        key = tuple(z)
+        z_ct = self._ctypes_z_cache.get(key)
+        if z_ct is not None:
+            self._ctypes_z_cache.move_to_end(key)
+        else:
+            if isinstance(z, np.ndarray) and z.dtype == np.float64 and z.flags.c_contiguous:
+                # Shares the array buffer instead of copying element by element
+                z_ct = np.ctypeslib.as_ctypes(z)
+            else:
+                z_ct = (len(z) * ctypes.c_double)(*z)
+            self._ctypes_z_cache[key] = z_ct
+            if len(self._ctypes_z_cache) > COMPOSITION_CACHE_SIZE:
+                self._ctypes_z_cache.popitem(last=False)
+        return z_ct
+    
+    def _single_phase_properties(self, T_K: float, D: float, z: List[float]) -> Optional[Dict[str, float]]:
+        """
+        Get transport properties and PVT derivatives with one ALLPROPS0dll call.
         
-        ierr, herr = self.rp.SETUPdll(len(composition), fluid_string, 'HMX.BNC', 'DEF')
-        if ierr > 0:
-            raise ValueError(f"Error setting up mixture: {herr}")
-        return z
+        Replaces separate TRNPRPdll and DERVPVTdll calls for single-phase
+        points. The property codes are resolved once with GETENUMdll.
+        
+        Args:
+            T_K: Temperature [K]
+            D: Density [mol/L]
+            z: Composition array
+            
+        Returns:
+            Dictionary with eta, tcx, dPdD, dPdT, dDdP and dDdT, or None if
+            ALLPROPS0dll is not available (e.g. REFPROP 9) or the call failed
+        """
+        allprops = getattr(self.rp, '_ALLPROPS0dll', None)
+        if allprops is None:
+            return None
+        
+        if self._allprops_codes is None:
+            try:
+                codes = []
+                for field in ALLPROPS_FIELDS:
+                    iEnum, ierr, herr = self.rp.GETENUMdll(0, field)
+                    if ierr != 0:
+                        raise ValueError(herr)
+                    codes.append(iEnum)
+                self._allprops_codes = (len(codes) * ctypes.c_int)(*codes)
+            except Exception as e:
+                logger.info(f"ALLPROPS0dll not used, falling back to separate calls: {str(e)}")
+                self._allprops_codes = ()
+        if not self._allprops_codes:
+            return None
+        
+        n_props = ctypes.c_int(len(ALLPROPS_FIELDS))
+        iFlag = ctypes.c_int(0)
+        T = ctypes.c_double(T_K)
+        D_ct = ctypes.c_double(D)
+        output = (200 * ctypes.c_double)()
+        ierr = ctypes.c_int()
+        herr = ctypes.create_string_buffer(255)
+        
+        allprops(ctypes.byref(n_props), self._allprops_codes, ctypes.byref(iFlag),
+                 ctypes.byref(T), ctypes.byref(D_ct), self._ctypes_composition(z),
+                 output, ctypes.byref(ierr), herr, 255)
+        if ierr.value != 0:
+            return None
+        
+        eta, tcx, dPdD, dPdT, dDdP, dDdT = output[:len(ALLPROPS_FIELDS)]
+        return {'eta': eta, 'tcx': tcx, 'dPdD': dPdD, 'dPdT': dPdT, 'dDdP': dDdP, 'dDdT': dDdT}
     
     def _calculate_all_properties(self, base_props: Dict[str, Any], 
                                  requested_properties: List[str], 
@@ -330,6 +611,7 @@ class FlashCalculator:
             Dictionary of calculated properties with values and units
         """
         results = {}
+        unit_system = 'SI'  # TODO: Make configurable
         for prop in requested_properties:
             try:
                 value = self.property_registry.calculate_property(
@@ -338,8 +620,11 @@ class FlashCalculator:
                 
                 # Format property with units
                 if value is not None:
-                    unit_system = 'SI'  # TODO: Make configurable
-                    unit = self.property_registry.get_property_unit(prop, unit_system)
+                    unit_key = (prop, unit_system)
+                    unit = self._unit_cache.get(unit_key)
+                    if unit is None:
+                        unit = self.property_registry.get_property_unit(prop, unit_system)
+                        self._unit_cache[unit_key] = unit
                     
                     results[prop] = {
                         "value": float(value) if isinstance(value, (int, float, np.number)) else value,
@@ -505,8 +790,9 @@ class PTFlashCalculator(FlashCalculator):
         Yields:
             Tuple with (p_idx, t_idx, P_bar, T_K)
         """
-        P_grid = grids["pressure"]
-        T_grid = grids["temperature"]
+        # Native floats iterate faster than NumPy scalars and need no casts
+        P_grid = np.asarray(grids["pressure"]).tolist()
+        T_grid = np.asarray(grids["temperature"]).tolist()
         
         for p_idx, P in enumerate(P_grid):
             for t_idx, T in enumerate(T_grid):
@@ -532,7 +818,7 @@ class PTFlashCalculator(FlashCalculator):
         P_kpa = P_bar * 100
         
         # Call REFPROP TPFLSHdll
-        result = self.rp.TPFLSHdll(T_K, P_kpa, z)
+        result = self._tp_flash(T_K, P_kpa, z)
         
         if result.ierr > 0:
             raise ValueError(f"Error in TPFLSHdll: {result.herr}")
@@ -551,19 +837,25 @@ class PTFlashCalculator(FlashCalculator):
         x = result.x      # Liquid composition [mol/mol]
         y = result.y      # Vapor composition [mol/mol]
         
+        # Single-phase points get transport properties and derivatives in one call
+        fast_props = None if 0 < q < 1 else self._single_phase_properties(T_K, D, z)
+        
         # Get transport properties
-        try:
-            eta, tcx, ierr_trn, herr_trn = self.rp.TRNPRPdll(T_K, D, z)
-            if ierr_trn > 0:
-                logger.warning(f"Transport properties warning: {herr_trn}")
+        if fast_props is not None:
+            eta, tcx = fast_props['eta'], fast_props['tcx']
+        else:
+            try:
+                eta, tcx, ierr_trn, herr_trn = self.rp.TRNPRPdll(T_K, D, z)
+                if ierr_trn > 0:
+                    logger.warning(f"Transport properties warning: {herr_trn}")
+                    eta = tcx = None
+            except Exception as e:
+                logger.warning(f"Error calculating transport properties: {str(e)}")
                 eta = tcx = None
-        except Exception as e:
-            logger.warning(f"Error calculating transport properties: {str(e)}")
-            eta = tcx = None
             
-        # Get surface tension for two-phase
+        # Get surface tension for two-phase (only if it was requested)
         surface_tension = None
-        if 0 < q < 1:
+        if self._compute_surface_tension and 0 < q < 1:
             try:
                 sigma, ierr_st, herr_st = self.rp.SURTENdll(T_K, Dl, Dv, x, y)
                 if ierr_st == 0:
@@ -571,26 +863,23 @@ class PTFlashCalculator(FlashCalculator):
             except Exception as e:
                 logger.warning(f"Error calculating surface tension: {str(e)}")
                 
-        # Get critical properties
-        try:
-            Tc, Pc, Dc, ierr_crit, herr_crit = self.rp.CRITPdll(z)
-            if ierr_crit > 0:
-                logger.warning(f"Critical properties warning: {herr_crit}")
-                Tc = Pc = Dc = None
-        except Exception as e:
-            logger.warning(f"Error calculating critical properties: {str(e)}")
-            Tc = Pc = Dc = None
+        # Get critical properties (cached per composition)
+        Tc, Pc, Dc = self._get_critical_properties(z)
             
         # Get thermodynamic derivatives
-        try:
-            derivatives = self.rp.DERVPVTdll(T_K, D, z)
-            dPdD = derivatives.dPdD
-            dPdT = derivatives.dPdT
-            dDdP = derivatives.dDdP
-            dDdT = derivatives.dDdT
-        except Exception as e:
-            logger.warning(f"Error calculating derivatives: {str(e)}")
-            dPdD = dPdT = dDdP = dDdT = None
+        if fast_props is not None:
+            dPdD, dPdT = fast_props['dPdD'], fast_props['dPdT']
+            dDdP, dDdT = fast_props['dDdP'], fast_props['dDdT']
+        else:
+            try:
+                derivatives = self.rp.DERVPVTdll(T_K, D, z)
+                dPdD = derivatives.dPdD
+                dPdT = derivatives.dPdT
+                dDdP = derivatives.dDdP
+                dDdT = derivatives.dDdT
+            except Exception as e:
+                logger.warning(f"Error calculating derivatives: {str(e)}")
+                dPdD = dPdT = dDdP = dDdT = None
             
         # Calculate phase-specific properties for two-phase regions
         liquid_cp = vapor_cp = None
@@ -809,8 +1098,8 @@ class PHFlashCalculator(FlashCalculator):
         Yields:
             Tuple with (p_idx, h_idx, P_bar, h_J_mol)
         """
-        P_grid = grids["pressure"]
-        h_grid = grids["enthalpy"]
+        P_grid = np.asarray(grids["pressure"]).tolist()
+        h_grid = np.asarray(grids["enthalpy"]).tolist()
         
         for p_idx, P in enumerate(P_grid):
             for h_idx, h in enumerate(h_grid):
@@ -864,9 +1153,9 @@ class PHFlashCalculator(FlashCalculator):
             logger.warning(f"Error calculating transport properties: {str(e)}")
             eta = tcx = None
             
-        # Get surface tension for two-phase
+        # Get surface tension for two-phase (only if it was requested)
         surface_tension = None
-        if 0 < q < 1:
+        if self._compute_surface_tension and 0 < q < 1:
             try:
                 sigma_result = self.rp.SURTENdll(T, Dl, Dv, x, y)
                 if sigma_result.ierr == 0:
@@ -874,19 +1163,8 @@ class PHFlashCalculator(FlashCalculator):
             except Exception as e:
                 logger.warning(f"Error calculating surface tension: {str(e)}")
                 
-        # Get critical properties
-        try:
-            crit_result = self.rp.CRITPdll(z)
-            if crit_result.ierr == 0:
-                Tc = crit_result.Tc
-                Pc = crit_result.Pc
-                Dc = crit_result.Dc
-            else:
-                logger.warning(f"Critical properties warning: {crit_result.herr}")
-                Tc = Pc = Dc = None
-        except Exception as e:
-            logger.warning(f"Error calculating critical properties: {str(e)}")
-            Tc = Pc = Dc = None
+        # Get critical properties (cached per composition)
+        Tc, Pc, Dc = self._get_critical_properties(z)
             
         # Get thermodynamic derivatives
         try:
@@ -1122,8 +1400,8 @@ class TSFlashCalculator(FlashCalculator):
         Yields:
             Tuple with (t_idx, s_idx, T_K, S_J_mol_K)
         """
-        T_grid = grids["temperature"]
-        S_grid = grids["entropy"]
+        T_grid = np.asarray(grids["temperature"]).tolist()
+        S_grid = np.asarray(grids["entropy"]).tolist()
         
         for t_idx, T in enumerate(T_grid):
             for s_idx, S in enumerate(S_grid):
@@ -1177,9 +1455,9 @@ class TSFlashCalculator(FlashCalculator):
             logger.warning(f"Error calculating transport properties: {str(e)}")
             eta = tcx = None
             
-        # Get surface tension for two-phase
+        # Get surface tension for two-phase (only if it was requested)
         surface_tension = None
-        if 0 < q < 1:
+        if self._compute_surface_tension and 0 < q < 1:
             try:
                 sigma_result = self.rp.SURTENdll(T_K, Dl, Dv, x, y)
                 if sigma_result.ierr == 0:
@@ -1187,19 +1465,8 @@ class TSFlashCalculator(FlashCalculator):
             except Exception as e:
                 logger.warning(f"Error calculating surface tension: {str(e)}")
                 
-        # Get critical properties
-        try:
-            crit_result = self.rp.CRITPdll(z)
-            if crit_result.ierr == 0:
-                Tc = crit_result.Tc
-                Pc = crit_result.Pc
-                Dc = crit_result.Dc
-            else:
-                logger.warning(f"Critical properties warning: {crit_result.herr}")
-                Tc = Pc = Dc = None
-        except Exception as e:
-            logger.warning(f"Error calculating critical properties: {str(e)}")
-            Tc = Pc = Dc = None
+        # Get critical properties (cached per composition)
+        Tc, Pc, Dc = self._get_critical_properties(z)
             
         # Get thermodynamic derivatives
         try:
@@ -1435,8 +1702,8 @@ class VTFlashCalculator(FlashCalculator):
         Yields:
             Tuple with (v_idx, t_idx, V_m3_mol, T_K)
         """
-        V_grid = grids["specific_volume"]
-        T_grid = grids["temperature"]
+        V_grid = np.asarray(grids["specific_volume"]).tolist()
+        T_grid = np.asarray(grids["temperature"]).tolist()
         
         for v_idx, V in enumerate(V_grid):
             for t_idx, T in enumerate(T_grid):
@@ -1491,9 +1758,9 @@ class VTFlashCalculator(FlashCalculator):
             logger.warning(f"Error calculating transport properties: {str(e)}")
             eta = tcx = None
             
-        # Get surface tension for two-phase
+        # Get surface tension for two-phase (only if it was requested)
         surface_tension = None
-        if 0 < q < 1:
+        if self._compute_surface_tension and 0 < q < 1:
             try:
                 sigma_result = self.rp.SURTENdll(T_K, Dl, Dv, x, y)
                 if sigma_result.ierr == 0:
@@ -1501,19 +1768,8 @@ class VTFlashCalculator(FlashCalculator):
             except Exception as e:
                 logger.warning(f"Error calculating surface tension: {str(e)}")
                 
-        # Get critical properties
-        try:
-            crit_result = self.rp.CRITPdll(z)
-            if crit_result.ierr == 0:
-                Tc = crit_result.Tc
-                Pc = crit_result.Pc
-                Dc = crit_result.Dc
-            else:
-                logger.warning(f"Critical properties warning: {crit_result.herr}")
-                Tc = Pc = Dc = None
-        except Exception as e:
-            logger.warning(f"Error calculating critical properties: {str(e)}")
-            Tc = Pc = Dc = None
+        # Get critical properties (cached per composition)
+        Tc, Pc, Dc = self._get_critical_properties(z)
             
         # Get thermodynamic derivatives
         try:
@@ -1750,8 +2006,8 @@ class UVFlashCalculator(FlashCalculator):
         Yields:
             Tuple with (u_idx, v_idx, U_J_mol, V_m3_mol)
         """
-        U_grid = grids["internal_energy"]
-        V_grid = grids["specific_volume"]
+        U_grid = np.asarray(grids["internal_energy"]).tolist()
+        V_grid = np.asarray(grids["specific_volume"]).tolist()
         
         for u_idx, U in enumerate(U_grid):
             for v_idx, V in enumerate(V_grid):
@@ -1806,9 +2062,9 @@ class UVFlashCalculator(FlashCalculator):
             logger.warning(f"Error calculating transport properties: {str(e)}")
             eta = tcx = None
             
-        # Get surface tension for two-phase
+        # Get surface tension for two-phase (only if it was requested)
         surface_tension = None
-        if 0 < q < 1:
+        if self._compute_surface_tension and 0 < q < 1:
             try:
                 sigma_result = self.rp.SURTENdll(T, Dl, Dv, x, y)
                 if sigma_result.ierr == 0:
@@ -1816,19 +2072,8 @@ class UVFlashCalculator(FlashCalculator):
             except Exception as e:
                 logger.warning(f"Error calculating surface tension: {str(e)}")
                 
-        # Get critical properties
-        try:
-            crit_result = self.rp.CRITPdll(z)
-            if crit_result.ierr == 0:
-                Tc = crit_result.Tc
-                Pc = crit_result.Pc
-                Dc = crit_result.Dc
-            else:
-                logger.warning(f"Critical properties warning: {crit_result.herr}")
-                Tc = Pc = Dc = None
-        except Exception as e:
-            logger.warning(f"Error calculating critical properties: {str(e)}")
-            Tc = Pc = Dc = None
+        # Get critical properties (cached per composition)
+        Tc, Pc, Dc = self._get_critical_properties(z)
             
         # Get thermodynamic derivatives
         try:
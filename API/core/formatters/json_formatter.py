@@ -4,30 +4,161 @@ JSON response formatter for REFPROP API.
 This module provides functions to format calculation results as JSON responses.
 """
 
-from flask import jsonify
-from typing import Dict, List, Any, Optional
+from flask import Response, stream_with_context
+from typing import Dict, List, Any, Optional, Iterator, Iterable, AbstractSet
+import json
 import logging
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-def format_json_response(results: List[Dict[str, Any]], 
-                        grid_info: Optional[Dict[str, Any]] = None) -> Any:
+# Basic attributes always included in results, even if not explicitly requested
+CORE_ATTRIBUTES = frozenset(["index", "p_idx", "t_idx", "temperature", "pressure", "phase"])
+
+# Number of results encoded per chunk of a JSON response body
+STREAM_BATCH_SIZE = 256
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy values that the JSON encoder does not handle natively."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, default=_json_default).encode("utf-8")
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize an object as a single NDJSON line."""
+    return _dumps(obj) + b"\n"
+
+
+def _encode_json_chunks(results: Iterable[Dict[str, Any]], extra: Dict[str, Any],
+                        props_to_keep: Optional[AbstractSet[str]] = None) -> Iterator[bytes]:
+    """
+    Encode {"results": [...], **extra} piece by piece.
+    
+    Results are encoded in batches of STREAM_BATCH_SIZE, so no intermediate
+    list of per-result strings is built.
+    """
+    yield b'{"results":['
+    batch = []
+    separator = b''
+    for result in results:
+        if props_to_keep is not None:
+            result = {prop: value for prop, value in result.items() if prop in props_to_keep}
+        batch.append(_dumps(result))
+        if len(batch) == STREAM_BATCH_SIZE:
+            yield separator + b','.join(batch)
+            separator = b','
+            batch = []
+    if batch:
+        yield separator + b','.join(batch)
+    yield b']'
+    for key, value in extra.items():
+        yield b',' + _dumps(key) + b':' + _dumps(value)
+    yield b'}'
+
+
+def format_json_response(results: Iterable[Dict[str, Any]], 
+                        grid_info: Optional[Dict[str, Any]] = None,
+                        requested_properties: Optional[List[str]] = None,
+                        **extra: Any) -> Response:
     """
     Format calculation results as a JSON response.
     
+    The body is fully serialized before the response is created, so an error
+    while encoding (or while producing lazily calculated results) is raised in
+    the endpoint and reported as its error response instead of a 200 response
+    with truncated JSON.
+    
     Args:
-        results: List of calculated property points
+        results: Calculated property points (list or iterator)
         grid_info: Optional dictionary with grid information
+        requested_properties: Optional list of properties to keep in each result
+        **extra: Additional top-level fields to add after the results
             
     Returns:
         Flask response with JSON data
     """
-    response = {'results': results}
+    props_to_keep = None
+    if requested_properties is not None:
+        props_to_keep = CORE_ATTRIBUTES.union(requested_properties)
     
     if grid_info:
-        response['grid_info'] = grid_info
+        extra['grid_info'] = grid_info
         
-    return jsonify(response)
+    body = b''.join(_encode_json_chunks(results, extra, props_to_keep))
+    return Response(body, mimetype='application/json')
+
+
+def format_json_document(payload: Any, status: int = 200) -> Response:
+    """
+    Serialize a complete JSON document in one call.
+    
+    Used in place of flask.jsonify for numeric payloads such as phase curves;
+    NumPy scalars and arrays are encoded natively when orjson is installed.
+    
+    Args:
+        payload: JSON-serializable object
+        status: HTTP status code
+            
+    Returns:
+        Flask response with JSON data
+    """
+    return Response(_dumps(payload), status=status, mimetype='application/json')
+
+
+def format_ndjson_response(results: List[Dict[str, Any]], 
+                          grid_info: Optional[Dict[str, Any]] = None,
+                          requested_properties: Optional[List[str]] = None) -> Response:
+    """
+    Format calculation results as a streamed NDJSON response.
+    
+    The first line holds the grid information (if any), followed by one line
+    per result. Lines are encoded as they are sent, so the full JSON document
+    is never built in memory. The status and headers are sent before the
+    first line, so an error while encoding ends the stream early: a missing
+    or partial last line is the error signal for NDJSON clients.
+    
+    Args:
+        results: List of calculated property points
+        grid_info: Optional dictionary with grid information
+        requested_properties: Optional list of properties to keep in each result
+            
+    Returns:
+        Flask streaming response with NDJSON data
+    """
+    props_to_keep = None
+    if requested_properties is not None:
+        props_to_keep = CORE_ATTRIBUTES.union(requested_properties)
+    
+    def generate() -> Iterator[bytes]:
+        if grid_info:
+            yield _dumps_line({'grid_info': grid_info})
+        for result in results:
+            if props_to_keep is not None:
+                result = {prop: value for prop, value in result.items() if prop in props_to_keep}
+            yield _dumps_line(result)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 
 def filter_properties(results: List[Dict[str, Any]], 
@@ -42,19 +173,11 @@ def filter_properties(results: List[Dict[str, Any]],
     Returns:
         Filtered results
     """
-    # Always include basic attributes even if not explicitly requested
-    core_attributes = ["index", "p_idx", "t_idx", "temperature", "pressure", "phase"]
-    
-    # Build the final property list
-    props_to_keep = list(set(requested_properties).union(set(core_attributes)))
+    # Build the final property set once, outside the per-result loop
+    props_to_keep = CORE_ATTRIBUTES.union(requested_properties)
     
     # Filter each result
-    filtered_results = []
-    for result in results:
-        filtered_result = {
-            prop: value for prop, value in result.items()
-            if prop in props_to_keep
-        }
-        filtered_results.append(filtered_result)
-        
-    return filtered_results
\ No newline at end of file
+    return [
+        {prop: value for prop, value in result.items() if prop in props_to_keep}
+        for result in results
+    ]
\ No newline at end of file
@@ -35,6 +35,7 @@ def format_olga_response(results: List[Dict[str, Any]],
     from API.utils.olga_formatter import format_olga_tab
     from API.utils.olga_config import OLGA_REQUIRED_PROPERTIES, DEFAULT_OLGA_OPTIONS
     from API.refprop_setup import RP
+    from API.utils.helpers import composition_array
     
     # Merge options with defaults
     if options is None:
@@ -43,7 +44,7 @@ def format_olga_response(results: List[Dict[str, Any]],
     merged_options.update(options)
     
     # Get molecular weight
-    z = [comp['fraction'] for comp in composition] + [0] * (20 - len(composition))
+    z = composition_array([comp['fraction'] for comp in composition])
     molar_mass = RP.WMOLdll(z)
     
     # Configure default file name based on endpoint type
@@ -5,15 +5,24 @@ This module defines a central registry for all properties available in the API,
 including their metadata, dependencies, and calculation methods.
 """
 
-from typing import Dict, List, Any, Callable, Optional, Union, Tuple
+from typing import Dict, List, Any, Callable, Optional, Union, Tuple, Final
 import numpy as np
 import logging
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Molar gas constant [J/(mol·K)]
+R_GAS: Final[float] = 8.31446261815324
+
 # Define property calculation function type
 PropertyCalculator = Callable[[Dict[str, Any], Any, List[float]], Any]
 
+# Entries kept in the registry's pressure-independent REFPROP caches
+VIRIAL_CACHE_SIZE = 4096
+REFERENCE_STATE_CACHE_SIZE = 64
+
+
 class PropertyRegistry:
     """
     Central registry for all REFPROP properties with metadata.
@@ -28,6 +37,12 @@ class PropertyRegistry:
     def __init__(self):
         """Initialize the property registry and register all available properties."""
         self.properties = {}
+        # Fluids of the current mixture, set by the flash calculator; part of
+        # the cache keys since registries may be reused across mixtures
+        self.mixture_key: Optional[Tuple[Any, ...]] = None
+        # REFPROP results that do not depend on pressure, reused across grid points
+        self._virial_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._reference_state_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
         self.register_all_properties()
     
     def register(self, name: str, metadata: Dict[str, Any]) -> None:
@@ -896,8 +911,8 @@ class PropertyRegistry:
         T_K = base_props["temperature"] + 273.15  # °C to K
         D = base_props["density"]
         
-        # Z = P/(ρRT) with R = 8.31446 J/(mol·K)
-        return P_kpa / (D * 8.31446261815324 * T_K)
+        # Z = P/(ρRT)
+        return P_kpa / (D * R_GAS * T_K)
     
     # ========================================================
     # ENERGY PROPERTY CALCULATIONS
@@ -962,6 +977,9 @@ class PropertyRegistry:
     
     def _calculate_molar_mass(self, base_props: Dict[str, Any], rp: Any, z: List[float]) -> float:
         """Calculate the molar mass (molecular weight) of the mixture."""
+        if "molar_mass" in base_props:
+            # Already calculated once for the composition
+            return base_props["molar_mass"]
         return rp.WMOLdll(z)  # g/mol
     
     def _calculate_chemical_potential(self, base_props: Dict[str, Any], rp: Any, z: List[float]) -> List[float]:
@@ -1124,17 +1142,21 @@ class PropertyRegistry:
         """Calculate isothermal compressibility κT = -1/V(∂V/∂P)T = -1/ρ(∂ρ/∂P)T."""
         D = base_props["density"]      # mol/L
         dDdP = base_props["dDdP"]      # (mol/L)/kPa
+        if not D or dDdP is None:
+            return None
         
         # κT = -1/ρ(∂ρ/∂P)T = -1/D * dDdP in 1/kPa
-        return -1 / D * dDdP
+        return -dDdP / D
     
     def _calculate_volume_expansivity(self, base_props: Dict[str, Any], rp: Any, z: List[float]) -> float:
         """Calculate volume expansivity αV = 1/V(∂V/∂T)P = -1/ρ(∂ρ/∂T)P."""
         D = base_props["density"]      # mol/L
         dDdT = base_props["dDdT"]      # (mol/L)/K
+        if not D or dDdT is None:
+            return None
         
         # αV = -1/ρ(∂ρ/∂T)P = -1/D * dDdT in 1/K
-        return -1 / D * dDdT
+        return -dDdT / D
     
     def _calculate_isentropic_coefficient(self, base_props: Dict[str, Any], rp: Any, z: List[float]) -> float:
         """Calculate isentropic coefficient (ratio of specific heats) γ = Cp/Cv."""
@@ -1163,6 +1185,9 @@ class PropertyRegistry:
         Cp = base_props["cp"]
         dDdT = base_props["dDdT"]
         dDdP = base_props["dDdP"]
+        # dDdP vanishes at the critical point, leaving μ_JT undefined
+        if not dDdP or not Cp or dDdT is None:
+            return None
         
         # μ_JT = T * [(∂V/∂T)_P] / Cp
         # But we have dDdT = (∂ρ/∂T)_P and (∂V/∂T)_P = -1/ρ² * (∂ρ/∂T)_P
@@ -1176,6 +1201,8 @@ class PropertyRegistry:
         T_K = base_props["temperature"] + 273.15  # °C to K
         alpha_V = base_props["volume_expansivity"]  # 1/K
         kappa_T = base_props["isothermal_compressibility"]  # 1/kPa
+        if not kappa_T:
+            return None
         
         # Unit conversion factor for kappa_T (1/kPa to 1/bar): 100
         return Cp - T_K * alpha_V**2 / (kappa_T * 100)  # J/(mol·K)
@@ -1186,6 +1213,8 @@ class PropertyRegistry:
         D = base_props["density"]  # mol/L
         Cp = base_props["cp"]  # J/(mol·K)
         kappa_T = base_props["isothermal_compressibility"]  # 1/kPa
+        if not (D and Cp and kappa_T):
+            return None
         
         # Unit conversion factor for kappa_T (1/kPa to 1/bar): 100
         return alpha_V / (D * Cp * kappa_T * 100)  # dimensionless
@@ -1202,17 +1231,42 @@ class PropertyRegistry:
     # VIRIAL COEFFICIENT CALCULATIONS
     # ========================================================
     
+    def _get_virial_coefficients(self, rp: Any, T_K: float, z: List[float]) -> Any:
+        """
+        Get the VIRdll result at a temperature, cached per (mixture, T, composition).
+        
+        Virial coefficients do not depend on pressure, so on a PT grid every
+        pressure at the same temperature reuses one VIRdll call.
+        
+        Args:
+            rp: REFPROP instance
+            T_K: Temperature [K]
+            z: Composition array
+            
+        Returns:
+            VIRdll result tuple, or None if the call failed
+        """
+        key = (self.mixture_key, T_K, tuple(z))
+        if key in self._virial_cache:
+            self._virial_cache.move_to_end(key)
+        else:
+            try:
+                result = rp.VIRdll(T_K, z)
+                self._virial_cache[key] = result if result.ierr == 0 else None
+            except Exception:
+                self._virial_cache[key] = None
+            if len(self._virial_cache) > VIRIAL_CACHE_SIZE:
+                self._virial_cache.popitem(last=False)
+        return self._virial_cache[key]
+    
     def _calculate_second_virial(self, base_props: Dict[str, Any], rp: Any, z: List[float]) -> float:
         """Calculate second virial coefficient B."""
         T_K = base_props["temperature"] + 273.15  # °C to K
         
-        try:
-            # Use VIRdll for second virial coefficient
-            result = rp.VIRdll(T_K, z)
-            if result.ierr == 0:
-                return result.b  # m³/mol
-        except Exception:
-            pass
+        # Use VIRdll for second virial coefficient
+        result = self._get_virial_coefficients(rp, T_K, z)
+        if result is not None:
+            return result.b  # m³/mol
             
         # Fallback: Try to estimate from equation of state
         try:
@@ -1224,8 +1278,8 @@ class PropertyRegistry:
             P1_kpa, e1, h1, s1, cv1, cp1, w1, hjt1 = rp.THERMdll(T_K, D1, z)
             P2_kpa, e2, h2, s2, cv2, cp2, w2, hjt2 = rp.THERMdll(T_K, D2, z)
             
-            Z1 = P1_kpa / (D1 * 8.31446261815324 * T_K)
-            Z2 = P2_kpa / (D2 * 8.31446261815324 * T_K)
+            Z1 = P1_kpa / (D1 * R_GAS * T_K)
+            Z2 = P2_kpa / (D2 * R_GAS * T_K)
             
             # B = (Z - 1)/ρ ≈ (Z1 - 1)/D1 ≈ (Z2 - 1)/D2
             B1 = (Z1 - 1) / D1 * 0.001  # Convert to m³/mol
@@ -1244,13 +1298,10 @@ class PropertyRegistry:
         """Calculate third virial coefficient C."""
         T_K = base_props["temperature"] + 273.15  # °C to K
         
-        try:
-            # Use VIRdll for third virial coefficient
-            result = rp.VIRdll(T_K, z)
-            if result.ierr == 0:
-                return result.c  # (m³/mol)²
-        except Exception:
-            pass
+        # Use VIRdll for third virial coefficient
+        result = self._get_virial_coefficients(rp, T_K, z)
+        if result is not None:
+            return result.c  # (m³/mol)²
             
         # Default fallback - very rough estimate
         # For most gases, C is positive and much smaller than B²
@@ -1409,7 +1460,7 @@ class PropertyRegistry:
         Dc = base_props["critical_density"]  # mol/L
         
         # Zc = Pc/(ρc*R*Tc)
-        return Pc / (Dc * 8.31446261815324 * Tc)
+        return Pc / (Dc * R_GAS * Tc)
     
     # ========================================================
     # MISCELLANEOUS PROPERTY CALCULATIONS
@@ -1441,17 +1492,25 @@ class PropertyRegistry:
             return T0 * base_props["entropy_generation"]  # J/mol
         
         # Estimate entropy generation from current state vs. reference
-        try:
-            # Try to compute reference state properties
-            P0 = 101.325  # kPa
-            D0, Dl0, Dv0, x0, y0, q0, e0, h0, s0, Cv0, Cp0, w0, ierr, herr = rp.TPFLSHdll(T0, P0, z)
-            
-            if ierr == 0:
-                # Entropy generation is increase from reference state
-                s_generation = base_props["entropy"] - s0
-                return T0 * max(0, s_generation)  # J/mol
-        except Exception:
-            pass
+        # (the reference state depends only on the mixture, so it is cached)
+        key = (self.mixture_key, tuple(z))
+        if key in self._reference_state_cache:
+            self._reference_state_cache.move_to_end(key)
+        else:
+            try:
+                P0 = 101.325  # kPa
+                D0, Dl0, Dv0, x0, y0, q0, e0, h0, s0, Cv0, Cp0, w0, ierr, herr = rp.TPFLSHdll(T0, P0, z)
+                self._reference_state_cache[key] = s0 if ierr == 0 else None
+            except Exception:
+                self._reference_state_cache[key] = None
+            if len(self._reference_state_cache) > REFERENCE_STATE_CACHE_SIZE:
+                self._reference_state_cache.popitem(last=False)
+        
+        s0 = self._reference_state_cache[key]
+        if s0 is not None:
+            # Entropy generation is increase from reference state
+            s_generation = base_props["entropy"] - s0
+            return T0 * max(0, s_generation)  # J/mol
             
         # Without sufficient data, return zero
         return 0.0  # J/mol
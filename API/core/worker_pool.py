@@ -0,0 +1,127 @@
+"""
+Persistent worker process pool for parallel grid calculations.
+
+Worker processes load REFPROP once, when the pool starts, and stay alive for
+the lifetime of the API process. A request then only pays for sending its
+grid points to the workers: mixtures are set up per job inside the workers,
+and SETUPdll is skipped when a worker already has the same fluids loaded
+(see API.utils.helpers.setup_fluids).
+"""
+
+import atexit
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.pool
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared pool, created on first use
+_pool: Optional[multiprocessing.pool.Pool] = None
+_pool_lock = threading.Lock()
+
+# Job ids let workers tell the grids of successive requests apart
+_job_ids = itertools.count()
+
+# REFPROP instance owned by this worker process (set by _init_pool_worker)
+_worker_rp: Any = None
+
+# Job whose mixture is loaded in _worker_rp. Shared by every kind of grid
+# job, since they all drive the same REFPROP instance.
+_current_job: Optional[int] = None
+
+
+def _init_pool_worker() -> None:
+    """Load REFPROP once in a new worker process."""
+    global _worker_rp
+    from API.refprop_setup import initialize_refprop
+
+    _worker_rp = initialize_refprop()
+
+
+def worker_refprop() -> Any:
+    """Return the REFPROP instance of the current worker process."""
+    return _worker_rp
+
+
+def current_job() -> Optional[int]:
+    """Return the id of the job whose mixture is loaded in this worker process."""
+    return _current_job
+
+
+def set_current_job(job_id: Optional[int]) -> None:
+    """
+    Record which job's mixture is loaded in this worker process.
+
+    Call with None before setting up a mixture, so a failed setup does not
+    leave an earlier job marked as loaded.
+
+    Args:
+        job_id: Id from next_job_id(), or None if no job is loaded
+    """
+    global _current_job
+    _current_job = job_id
+
+
+def next_job_id() -> int:
+    """Return a new id for a batch of grid points sent to the workers."""
+    return next(_job_ids)
+
+
+def default_processes() -> int:
+    """Return the size of the shared pool."""
+    from API.refprop_setup import DEFAULT_MAX_PROCESSES
+
+    return min(multiprocessing.cpu_count(), DEFAULT_MAX_PROCESSES)
+
+
+def shared_pool() -> multiprocessing.pool.Pool:
+    """
+    Return the shared worker pool, starting it on first use.
+
+    Returns:
+        Pool of default_processes() REFPROP worker processes
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            processes = default_processes()
+            logger.info(f"Starting shared REFPROP worker pool with {processes} processes")
+            _pool = multiprocessing.Pool(processes=processes, initializer=_init_pool_worker)
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the shared worker pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+            _pool.join()
+            _pool = None
+
+
+@contextmanager
+def worker_pool(processes: Optional[int] = None) -> Iterator[multiprocessing.pool.Pool]:
+    """
+    Provide a pool of REFPROP worker processes for one calculation.
+
+    The shared pool is used unless a different number of processes is
+    requested; in that case a dedicated pool is started and closed afterwards.
+
+    Args:
+        processes: Number of processes (None = size of the shared pool)
+
+    Yields:
+        Pool whose workers have REFPROP loaded (see worker_refprop)
+    """
+    if processes is None or processes == default_processes():
+        yield shared_pool()
+        return
+
+    with multiprocessing.Pool(processes=processes, initializer=_init_pool_worker) as pool:
+        yield pool
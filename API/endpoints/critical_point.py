@@ -1,26 +1,30 @@
 from flask import request, jsonify
-import sys
-import traceback
+import numpy as np
+import logging
 from typing import List, Dict, Any, Tuple
 
 from API.endpoints import critical_point_bp
 from API.refprop_setup import RP
-from API.unit_converter import UnitConverter
+from API.unit_converter import converter
+from API.utils.helpers import parse_composition, setup_fluids
+from API.core.formatters.json_formatter import format_json_document
+from API.core.property_system import R_GAS
 
-def validate_composition(composition: List[Dict[str, Any]]) -> bool:
-    """Validate composition data"""
-    total = sum(comp['fraction'] for comp in composition)
-    return abs(total - 1.0) < 1e-6
+logger = logging.getLogger(__name__)
 
-def setup_mixture(composition: List[Dict[str, Any]]) -> List[float]:
-    """Setup REFPROP mixture"""
-    fluid_string = '|'.join(f"{comp['fluid']}.FLD" for comp in composition)
-    z = [comp['fraction'] for comp in composition] + [0] * (20 - len(composition))
+def setup_mixture(fluids: List[str], z: np.ndarray) -> None:
+    """
+    Setup REFPROP mixture.
     
-    ierr, herr = RP.SETUPdll(len(composition), fluid_string, 'HMX.BNC', 'DEF')
+    Args:
+        fluids: Fluid names, as returned by parse_composition()
+        z: Composition array, as returned by parse_composition()
+    """
+    fluid_string = '|'.join(f"{fluid}.FLD" for fluid in fluids)
+    
+    ierr, herr = setup_fluids(RP, len(fluids), fluid_string)
     if ierr > 0:
         raise ValueError(f"Error setting up mixture: {herr}")
-    return z
 
 def find_critical_point(z: List[float], units_system: str = 'SI') -> Dict[str, Any]:
     """
@@ -33,9 +37,6 @@ def find_critical_point(z: List[float], units_system: str = 'SI') -> Dict[str, A
     Returns:
         Dictionary of critical properties with values and units
     """
-    # Initialize unit converter
-    converter = UnitConverter()
-    
     # Get molecular weight for unit conversions
     wmm = RP.WMOLdll(z)
     
@@ -53,7 +54,7 @@ def find_critical_point(z: List[float], units_system: str = 'SI') -> Dict[str, A
         wmm, Ttrp, Tnbpt, Tc, Pc_info, Dc_info, Zc, acf, dip, Rgas = RP.INFOdll(icomp)
     
     # Calculate compressibility factor at critical point
-    Zc = Pc * 100 / (Dc * 8.31446261815324 * Tc)
+    Zc = Pc * 100 / (Dc * R_GAS * Tc)
     
     # Get additional properties at critical point if possible
     try:
@@ -84,23 +85,20 @@ def find_critical_point(z: List[float], units_system: str = 'SI') -> Dict[str, A
         'critical_sound_speed': w
     }
     
-    # Convert properties to requested unit system
+    # Convert properties to requested unit system with one table lookup each
+    table = converter.conversion_table(wmm, 'SI', units_system)
     properties = {}
     for prop_id, value in raw_properties.items():
-        if value is not None:  # Skip undefined properties
-            try:
-                # Special handling for properties that aren't in the converter
-                if prop_id == 'critical_compressibility':
-                    properties[prop_id] = {'value': float(value), 'unit': 'dimensionless'}
-                else:
-                    # Try to derive the standard property name by removing 'critical_' prefix
-                    std_prop_id = prop_id.replace('critical_', '')
-                    properties[prop_id] = converter.convert_property(
-                        std_prop_id, float(value), wmm, 'SI', units_system
-                    )
-            except Exception as e:
-                print(f"Warning: Could not convert property {prop_id}: {str(e)}")
-                properties[prop_id] = {'value': float(value) if value is not None else None, 'unit': 'unknown'}
+        if value is None:  # Skip undefined properties
+            continue
+        # Special handling for properties that aren't in the converter
+        if prop_id == 'critical_compressibility':
+            properties[prop_id] = {'value': float(value), 'unit': 'dimensionless'}
+            continue
+        # Derive the standard property name by removing 'critical_' prefix
+        std_prop_id = prop_id.replace('critical_', '')
+        factor, unit = table.get(std_prop_id) or (1.0, converter.get_unit(std_prop_id, units_system))
+        properties[prop_id] = {'value': float(value) * factor, 'unit': unit}
     
     return properties
 
@@ -116,23 +114,24 @@ def critical_point():
         # Extract calculation settings
         units_system = data.get('units_system', 'SI')  # Default to SI
         
-        # Validate composition
-        if not validate_composition(data['composition']):
-            return jsonify({'error': 'Invalid composition - fractions must sum to 1'}), 400
+        # Validate and parse composition
+        try:
+            fluids, z = parse_composition(data['composition'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Setup mixture
-        z = setup_mixture(data['composition'])
+        setup_mixture(fluids, z)
         
-        # Debug log
-        print(f"Calculating critical point for composition: {data['composition']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Calculating critical point for composition: {data['composition']}")
         
         # Calculate critical point
         critical_props = find_critical_point(z, units_system)
             
         # Return results
-        return jsonify({'critical_point': critical_props})
+        return format_json_document({'critical_point': critical_props})
         
     except Exception as e:
-        print("Error processing request:", file=sys.stderr)
-        traceback.print_exc()
+        logger.exception("Error processing request")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
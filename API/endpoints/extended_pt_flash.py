@@ -1,23 +1,115 @@
 from flask import request, jsonify, Response
 import numpy as np
-import sys
-import traceback
-from typing import List, Dict, Any, Tuple
+import logging
+import math
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Optional, AbstractSet, FrozenSet, Iterable
 
 from API.endpoints import extended_pt_flash_bp
 from API.refprop_setup import RP
-from API.unit_converter import UnitConverter
-from API.utils.helpers import get_phase, validate_composition
+from API.unit_converter import converter
+from API.utils.helpers import get_phase, parse_composition, composition_array, setup_fluids, refprop_lock
+from API.utils.grid_generator import equidistant_grid
+from API.core.property_system import R_GAS
+from API.core.formatters.json_formatter import format_json_response
+from API.core.worker_pool import (
+    worker_pool, worker_refprop, next_job_id, default_processes, current_job, set_current_job
+)
 
-def setup_mixture(composition: List[Dict[str, Any]]) -> List[float]:
-    """Setup REFPROP mixture"""
-    fluid_string = '|'.join(f"{comp['fluid']}.FLD" for comp in composition)
-    z = [comp['fraction'] for comp in composition] + [0] * (20 - len(composition))
+logger = logging.getLogger(__name__)
+
+# SI units of the raw properties, used directly when no conversion is needed
+SI_UNITS = converter.UNITS['SI']
+
+# Decimals kept in T [K] and P [kPa] when looking up cached state points
+STATE_DECIMALS = 6
+
+# Requested properties that need TRNPRPdll and DERVPVTdll results
+TRANSPORT_PROPERTIES = frozenset([
+    'viscosity', 'thermal_conductivity', 'kinematic_viscosity',
+    'thermal_diffusivity', 'prandtl_number'
+])
+DERIVATIVE_PROPERTIES = frozenset([
+    'isothermal_compressibility', 'volume_expansivity', 'joule_thomson_coefficient',
+    'dp_dt_saturation', 'dDdP', 'dDdT'
+])
+# Properties taken from the composition-wide CRITPdll result
+CRITICAL_PROPERTIES = frozenset(['critical_temperature', 'critical_pressure', 'critical_density'])
+
+# Grids up to this many points are calculated in the request process
+PARALLEL_MIN_POINTS = 100
+
+# Per-process state for parallel grid workers (set per job by _prepare_grid_worker)
+_worker_state: Dict[str, Any] = {}
+
+def setup_mixture(fluids: List[str], z: np.ndarray) -> None:
+    """
+    Setup REFPROP mixture.
     
-    ierr, herr = RP.SETUPdll(len(composition), fluid_string, 'HMX.BNC', 'DEF')
+    Args:
+        fluids: Fluid names, as returned by parse_composition()
+        z: Composition array, as returned by parse_composition()
+    """
+    fluid_string = '|'.join(f"{fluid}.FLD" for fluid in fluids)
+    
+    ierr, herr = setup_fluids(RP, len(fluids), fluid_string)
     if ierr > 0:
         raise ValueError(f"Error setting up mixture: {herr}")
-    return z
+
+@lru_cache(maxsize=32)
+def get_composition_constants(
+    composition_key: Tuple[Tuple[str, float], ...]
+) -> Tuple[float, Tuple[Optional[float], Optional[float], Optional[float]]]:
+    """
+    Get REFPROP results that depend only on composition.
+    
+    The fluids are loaded again under refprop_lock(), so the cached result
+    always belongs to composition_key.
+    
+    Args:
+        composition_key: Tuple of (fluid, fraction) pairs
+        
+    Returns:
+        Tuple with (molar mass, (Tc, Pc, Dc))
+    """
+    fluids = [fluid for fluid, _ in composition_key]
+    z = composition_array([fraction for _, fraction in composition_key])
+    with refprop_lock(RP):
+        # Another request thread may have loaded other fluids since the
+        # request called setup_mixture()
+        setup_mixture(fluids, z)
+        wmm = RP.WMOLdll(z)
+        
+        try:
+            Tc, Pc, Dc, ierr_crit, herr_crit = RP.CRITPdll(z)
+            if ierr_crit > 0:
+                Tc = Pc = Dc = None
+        except Exception:
+            Tc = Pc = Dc = None
+    
+    return wmm, (Tc, Pc, Dc)
+
+@lru_cache(maxsize=64)
+def optional_calls(requested: Optional[FrozenSet[str]]) -> Tuple[bool, bool, bool, bool]:
+    """
+    Resolve which optional REFPROP results a set of requested properties needs.
+    
+    Evaluated once per distinct request set instead of at every grid point.
+    
+    Args:
+        requested: Set of requested properties (None = all properties)
+        
+    Returns:
+        Tuple with (transport, derivatives, surface tension, critical) flags
+    """
+    if requested is None:
+        return True, True, True, True
+    return (
+        not TRANSPORT_PROPERTIES.isdisjoint(requested),
+        not DERIVATIVE_PROPERTIES.isdisjoint(requested),
+        'surface_tension' in requested,
+        not CRITICAL_PROPERTIES.isdisjoint(requested)
+    )
 
 def is_below_triple_point(T: float, P: float, z: List[float], pure_component_idx: int) -> bool:
     """
@@ -81,31 +173,44 @@ def is_in_solid_phase(T: float, P: float, z: List[float], pure_component_idx: in
     except Exception:
         return False
 
-def calculate_properties_extended(
+def calculate_raw_properties_extended(
     z: List[float], T: float, P: float, 
-    units_system: str = 'SI', 
     is_pure: bool = False, 
-    pure_component_idx: int = 0
+    pure_component_idx: int = 0,
+    critical_props: Optional[Tuple[Optional[float], Optional[float], Optional[float]]] = None,
+    requested: Optional[FrozenSet[str]] = None
 ) -> Dict[str, Any]:
     """
-    Calculate fluid properties at given temperature and pressure with solid phase support.
+    Calculate raw fluid properties (SI units) at given temperature and pressure with solid phase support.
+    
+    Properties derived from these values (compressibility factor, Joule-Thomson
+    coefficient, etc.) are added by add_derived_properties().
     
     Args:
         z: Composition array
         T: Temperature in K
         P: Pressure in kPa
-        units_system: Unit system to use ('SI' or 'CGS')
         is_pure: Whether this is a pure fluid
         pure_component_idx: Index of the pure component
+        critical_props: Tuple with (Tc, Pc, Dc) (calculated if not given)
+        requested: Optional set of requested properties; transport properties,
+                   derivatives and surface tension are skipped when not needed
         
     Returns:
-        Dictionary of calculated properties with values and units
+        Dictionary of raw property values, with a 'calculation_error' entry
+        if the flash calculation failed
     """
-    # Initialize unit converter
-    converter = UnitConverter()
+    # Get critical properties
+    if critical_props is None:
+        try:
+            Tc, Pc, Dc, ierr_crit, herr_crit = RP.CRITPdll(z)
+            if ierr_crit > 0:
+                Tc = Pc = Dc = None
+        except Exception:
+            Tc = Pc = Dc = None
+        critical_props = (Tc, Pc, Dc)
     
-    # Get molecular weight for unit conversions
-    wmm = RP.WMOLdll(z)
+    need_transport, need_derivatives, need_surface_tension, need_critical = optional_calls(requested)
     
     # Special handling for solid phase (pure fluids only)
     is_solid = False
@@ -124,7 +229,8 @@ def calculate_properties_extended(
         try:
             # Try to use liquid density as an approximation (slightly higher)
             # Get triple point temperature
-            wmm, Ttrp, Tnbpt, Tc, Pc, Dc, Zc, acf, dip, Rgas = RP.INFOdll(pure_component_idx)
+            _, Ttrp, Tnbpt, _, _, _, Zc, acf, dip, Rgas = RP.INFOdll(pure_component_idx)
+            Dc = critical_props[2]
             
             # Get density near triple point as reference
             P_triple, ierr, herr = RP.SUBLTdll(Ttrp, z)
@@ -136,11 +242,9 @@ def calculate_properties_extended(
                     solid_D = Dl * 1.1  # Solid typically 5-15% denser than liquid
                 else:
                     # Fallback - use critical density as reference
-                    Tc, Pc, Dc, ierr3, herr3 = RP.CRITPdll(z)
                     solid_D = Dc * 3.0  # Rough estimate
             else:
                 # Fallback - use critical density as reference
-                Tc, Pc, Dc, ierr3, herr3 = RP.CRITPdll(z)
                 solid_D = Dc * 3.0  # Rough estimate
         except Exception:
             # Another fallback method
@@ -189,8 +293,8 @@ def calculate_properties_extended(
                     'surface_tension': None,
                     'temperature': T - 273.15,  # Convert to Celsius
                     'pressure': P / 100,  # Convert kPa to bar
-                    'x': list(x[:len(z)]),  # Liquid composition at triple point
-                    'y': list(y[:len(z)]),  # Vapor composition at triple point
+                    'x': x[:len(z)],  # Liquid composition at triple point
+                    'y': y[:len(z)],  # Vapor composition at triple point
                 }
             else:
                 # Fallback with minimal properties
@@ -217,16 +321,9 @@ def calculate_properties_extended(
             if ierr > 0:
                 # Error in calculation, return minimal set with error
                 return {
-                    'temperature': converter.convert_property(
-                        'temperature', float(T - 273.15), wmm, 'SI', units_system
-                    ),
-                    'pressure': converter.convert_property(
-                        'pressure', float(P / 100), wmm, 'SI', units_system
-                    ),
-                    'calculation_error': {
-                        'value': herr,
-                        'unit': None
-                    }
+                    'temperature': T - 273.15,
+                    'pressure': P / 100,
+                    'calculation_error': herr
                 }
             
             # Check if we're at a phase boundary
@@ -254,40 +351,33 @@ def calculate_properties_extended(
                     q = 996  # Special flag for triple point
             
             # Get transport properties
-            try:
-                eta, tcx, ierr_trn, herr_trn = RP.TRNPRPdll(T, D, z)
-                if ierr_trn > 0:
+            eta = tcx = None
+            if need_transport:
+                try:
+                    eta, tcx, ierr_trn, herr_trn = RP.TRNPRPdll(T, D, z)
+                    if ierr_trn > 0:
+                        eta = tcx = None
+                except Exception:
                     eta = tcx = None
-            except Exception:
-                eta = tcx = None
                 
             # Get surface tension if in two-phase region
             surface_tension = None
-            if 0 < q < 1:
+            if need_surface_tension and 0 < q < 1:
                 try:
                     sigma, ierr_st, herr_st = RP.SURTENdll(T, Dl, Dv, x, y)
                     if ierr_st == 0:
                         surface_tension = float(sigma)
                 except Exception:
                     pass
-                    
-            # Get critical properties
-            try:
-                Tc, Pc, Dc, ierr_crit, herr_crit = RP.CRITPdll(z)
-                if ierr_crit > 0:
-                    Tc = Pc = Dc = None
-            except Exception:
-                Tc = Pc = Dc = None
                 
             # Get additional thermodynamic derivatives
-            try:
-                dPdD, dPdT, d2PdD2, d2PdT2, d2PdTD, dDdP, dDdT, d2DdP2, d2DdT2, d2DdPT, \
-                dTdP, dTdD, d2TdP2, d2TdD2, d2TdPD = RP.DERVPVTdll(T, D, z)
-            except Exception:
-                dPdD = dPdT = dDdP = dDdT = None
-            
-            # Calculate compressibility factor
-            Z = P / (D * 8.31446261815324 * T)
+            dPdD = dPdT = dDdP = dDdT = None
+            if need_derivatives:
+                try:
+                    dPdD, dPdT, d2PdD2, d2PdT2, d2PdTD, dDdP, dDdT, d2DdP2, d2DdT2, d2DdPT, \
+                    dTdP, dTdD, d2TdP2, d2TdD2, d2TdPD = RP.DERVPVTdll(T, D, z)
+                except Exception:
+                    dPdD = dPdT = dDdP = dDdT = None
             
             # Build raw properties dictionary
             raw_properties = {
@@ -304,59 +394,362 @@ def calculate_properties_extended(
                 'viscosity': eta,
                 'thermal_conductivity': tcx,
                 'surface_tension': surface_tension,
-                'critical_temperature': Tc,
-                'critical_pressure': Pc / 100 if Pc is not None else None,  # Convert from kPa to bar
-                'critical_density': Dc,
-                'compressibility_factor': Z,
-                'isothermal_compressibility': -1/D * dDdP if dDdP is not None else None,
-                'volume_expansivity': 1/D * dDdT if dDdT is not None else None,
                 'dp_dt_saturation': dPdT,
-                'joule_thomson_coefficient': (T*dDdT/dDdP - 1)/(Cp * 100) if (dDdT is not None and dDdP is not None and Cp is not None) else None,
                 'temperature': T - 273.15,  # Convert to Celsius
                 'pressure': P / 100,  # Convert kPa to bar
-                'x': list(x[:len(z)]),  # Liquid composition
-                'y': list(y[:len(z)]),  # Vapor composition
+                'x': x[:len(z)],  # Liquid composition
+                'y': y[:len(z)],  # Vapor composition
                 'dDdP': dDdP,          # Add pressure derivative of density
                 'dDdT': dDdT           # Add temperature derivative of density
             }
+            
+            # Critical properties are the same at every point, and are
+            # left out entirely when CRITPdll failed for this composition
+            Tc, Pc, Dc = critical_props
+            if need_critical and Tc is not None:
+                raw_properties['critical_temperature'] = Tc
+                raw_properties['critical_pressure'] = Pc / 100  # Convert from kPa to bar
+                raw_properties['critical_density'] = Dc
         except Exception as e:
             # If calculation fails completely, return error with minimal set
             return {
-                'temperature': converter.convert_property(
-                    'temperature', float(T - 273.15), wmm, 'SI', units_system
-                ),
-                'pressure': converter.convert_property(
-                    'pressure', float(P / 100), wmm, 'SI', units_system
-                ),
-                'calculation_error': {
-                    'value': str(e),
-                    'unit': None
-                }
+                'temperature': T - 273.15,
+                'pressure': P / 100,
+                'calculation_error': str(e)
             }
     
-    # Convert properties to requested unit system
-    properties = {}
-    for prop_id, value in raw_properties.items():
-        if value is not None:  # Skip undefined properties
-            try:
-                if prop_id in ['x', 'y']:
-                    # Composition vectors
-                    properties[prop_id] = {'value': value, 'unit': 'mole fraction'}
-                else:
-                    properties[prop_id] = converter.convert_property(
-                        prop_id, float(value), wmm, 'SI', units_system
-                    )
-            except Exception as e:
-                print(f"Warning: Could not convert property {prop_id}: {str(e)}")
-                properties[prop_id] = {'value': float(value) if value is not None else None, 'unit': 'unknown'}
+    return raw_properties
+
+@lru_cache(maxsize=100_000)
+def calculate_raw_properties_cached(
+    composition_key: Tuple[Tuple[str, float], ...], T: float, P: float,
+    is_pure: bool = False,
+    pure_component_idx: int = 0,
+    critical_props: Optional[Tuple[Optional[float], Optional[float], Optional[float]]] = None,
+    requested: Optional[FrozenSet[str]] = None
+) -> Dict[str, Any]:
+    """
+    Cached version of calculate_raw_properties_extended().
     
-    # Add phase information
-    properties['phase'] = {
-        'value': get_phase(raw_properties.get('vapor_fraction')),
-        'unit': None
-    }
+    Raw properties are in SI units, so one entry serves every unit system.
+    The fluids are loaded again under refprop_lock(), so the cached result
+    always belongs to composition_key. Callers should
+    round T and P (see STATE_DECIMALS) so floating-point jitter still hits,
+    and must not modify the returned dictionary.
     
-    return properties
+    Args:
+        composition_key: Tuple of (fluid, fraction) pairs
+        T: Temperature in K
+        P: Pressure in kPa
+        is_pure: Whether this is a pure fluid
+        pure_component_idx: Index of the pure component
+        critical_props: Tuple with (Tc, Pc, Dc)
+        requested: Optional set of requested properties
+        
+    Returns:
+        Dictionary of raw property values
+    """
+    fluids = [fluid for fluid, _ in composition_key]
+    z = composition_array([fraction for _, fraction in composition_key])
+    with refprop_lock(RP):
+        # Another request thread may have loaded other fluids since the
+        # request called setup_mixture()
+        setup_mixture(fluids, z)
+        return calculate_raw_properties_extended(
+            z, T, P, is_pure, pure_component_idx, critical_props, requested
+        )
+
+def _calculate_grid_point(
+    task: Tuple[int, int, float, float], point_args: Tuple[Any, ...]
+) -> Tuple[int, int, Optional[Dict[str, Any]]]:
+    """
+    Calculate the raw properties at one grid point.
+    
+    Args:
+        task: Tuple with (p_idx, t_idx, T [K], P [kPa])
+        point_args: Tuple with (composition_key, is_pure, pure_component_idx,
+                    critical_props, requested, use_cache)
+        
+    Returns:
+        Tuple with (p_idx, t_idx, raw properties), raw properties is None if
+        the calculation raised an exception
+    """
+    p_idx, t_idx, T, P = task
+    composition_key, is_pure, pure_component_idx, critical_props, requested, use_cache = point_args
+    # calculation.cache=false bypasses the cache for fresh results
+    calculate = calculate_raw_properties_cached if use_cache else calculate_raw_properties_cached.__wrapped__
+    try:
+        return p_idx, t_idx, calculate(
+            composition_key, T, P, is_pure, pure_component_idx, critical_props, requested
+        )
+    except Exception as e:
+        logger.debug("Error processing T=%s°C, P=%s bar: %s", T - 273.15, P / 100, e)
+        return p_idx, t_idx, None
+
+def _prepare_grid_worker(job: Tuple[Any, ...]) -> None:
+    """
+    Make a job current in this worker process.
+    
+    Switches the module to the worker's own REFPROP instance and sets up the
+    mixture, again whenever another job used that instance since (see
+    API.core.worker_pool.current_job).
+    
+    Args:
+        job: Tuple with (job id, fluid names, composition array, point_args),
+             see _calculate_grid_point for point_args
+    """
+    global RP
+    job_id, fluids, z, point_args = job
+    if current_job() == job_id:
+        return
+    
+    set_current_job(None)
+    RP = worker_refprop()
+    setup_mixture(fluids, z)
+    _worker_state['point_args'] = point_args
+    set_current_job(job_id)
+
+def _eval_grid_chunk(
+    args: Tuple[Tuple[Any, ...], List[Tuple[int, int, float, float]]]
+) -> List[Tuple[int, int, Optional[Dict[str, Any]]]]:
+    """Calculate a chunk of grid points inside a worker process."""
+    job, tasks = args
+    _prepare_grid_worker(job)
+    point_args = _worker_state['point_args']
+    return [_calculate_grid_point(task, point_args) for task in tasks]
+
+def add_derived_properties(columns: Dict[str, np.ndarray], wmm: float,
+                           keep: Optional[AbstractSet[str]] = None) -> None:
+    """
+    Add properties derived from raw REFPROP output, evaluated over all points at once.
+    
+    Args:
+        columns: Dictionary of raw property arrays (SI units, NaN where undefined),
+                 updated in place
+        wmm: Molecular weight [g/mol]
+        keep: Optional set of properties to derive (all properties if None)
+    """
+    def wanted(prop_id: str) -> bool:
+        return keep is None or prop_id in keep
+    
+    n = len(columns['temperature'])
+    nan = np.full(n, np.nan)
+    T = columns['temperature'] + 273.15   # °C to K
+    D = columns.get('density', nan)
+    Cp = columns.get('cp', nan)
+    dDdP = columns.get('dDdP', nan)
+    dDdT = columns.get('dDdT', nan)
+    eta_si = columns.get('viscosity', nan) * 1e-6   # μPa·s to Pa·s
+    tcx = columns.get('thermal_conductivity', nan)
+    wmm_kg = wmm / 1000                               # g/mol to kg/mol
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_D = 1 / D
+        if wanted('compressibility_factor'):
+            P = columns['pressure'] * 100  # bar to kPa
+            is_solid = columns.get('vapor_fraction', nan) == -999
+            columns['compressibility_factor'] = np.where(is_solid, np.nan, P * inv_D / (R_GAS * T))
+        if wanted('isothermal_compressibility'):
+            columns['isothermal_compressibility'] = -inv_D * dDdP
+        if wanted('volume_expansivity'):
+            columns['volume_expansivity'] = inv_D * dDdT
+        if wanted('joule_thomson_coefficient'):
+            columns['joule_thomson_coefficient'] = (T*dDdT/dDdP - 1)/(Cp * 100)
+        # Transport-derived properties, same conventions as PropertyRegistry
+        if wanted('kinematic_viscosity'):
+            columns['kinematic_viscosity'] = eta_si * inv_D / wmm_kg * 10000  # cm²/s
+        if wanted('thermal_diffusivity'):
+            columns['thermal_diffusivity'] = tcx * inv_D / Cp * 10000         # cm²/s
+        if wanted('prandtl_number'):
+            columns['prandtl_number'] = Cp / wmm_kg * eta_si / tcx
+
+# Per-point composition vectors, kept outside the scalar property columns
+VECTOR_PROPERTIES = ('x', 'y')
+
+def collect_property_columns(
+    raw_points: Iterable[Optional[Dict[str, Any]]], n: int
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], np.ndarray]:
+    """
+    Write raw property dictionaries into one preallocated array per property.
+    
+    Composition vectors are copied row by row into (n, components) arrays
+    straight from the REFPROP double arrays, without boxing each element.
+    
+    Args:
+        raw_points: Raw property dictionaries (SI units) in grid order,
+                    None for points that could not be calculated
+        n: Number of points
+        
+    Returns:
+        Tuple with (scalar property arrays with NaN where undefined,
+        composition vector arrays with NaN rows where undefined, mask of calculated points)
+    """
+    columns: Dict[str, np.ndarray] = {}
+    vectors: Dict[str, np.ndarray] = {}
+    valid = np.zeros(n, dtype=bool)
+    for i, point in enumerate(raw_points):
+        if point is None or 'calculation_error' in point:
+            continue
+        valid[i] = True
+        for prop_id, value in point.items():
+            if prop_id in VECTOR_PROPERTIES:
+                if value is not None:
+                    vector = vectors.get(prop_id)
+                    if vector is None:
+                        vector = vectors[prop_id] = np.full((n, len(value)), np.nan)
+                    vector[i, :len(value)] = value
+                continue
+            column = columns.get(prop_id)
+            if column is None:
+                column = columns[prop_id] = np.full(n, np.nan)
+            if value is not None:
+                column[i] = value
+    return columns, vectors, valid
+
+def convert_property_columns(
+    columns: Dict[str, np.ndarray], vectors: Dict[str, np.ndarray], wmm: float,
+    units_system: str = 'SI', keep: Optional[AbstractSet[str]] = None,
+    rows: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convert property columns to per-point dictionaries in the requested unit system.
+    
+    Derived properties and unit conversions are evaluated once per property
+    instead of once per point; dictionaries are only built for the output.
+    
+    Args:
+        columns: Dictionary of raw property arrays (SI units, NaN where undefined),
+                 updated in place with the derived properties
+        vectors: Dictionary of composition vector arrays (NaN rows where undefined)
+        wmm: Molecular weight [g/mol]
+        units_system: Unit system to use ('SI' or 'CGS')
+        keep: Optional set of properties to return (all properties if None)
+        rows: Optional per-point dictionaries to add the properties to
+              (new dictionaries are created if None)
+        
+    Returns:
+        List of property dictionaries with values and units
+    """
+    n = len(columns['temperature']) if 'temperature' in columns else 0
+    if rows is None:
+        rows = [{} for _ in range(n)]
+    if n == 0:
+        return rows
+    
+    vapor_fraction = columns['vapor_fraction'].tolist() if 'vapor_fraction' in columns else [None] * n
+    add_derived_properties(columns, wmm, keep)
+    
+    if keep is not None:
+        columns = {k: v for k, v in columns.items() if k in keep}
+        vectors = {k: v for k, v in vectors.items() if k in keep}
+    
+    # Stack the properties into one table and convert it in a single operation
+    prop_ids = list(columns)
+    table = np.array([columns[prop_id] for prop_id in prop_ids], dtype=float).reshape(len(prop_ids), n)
+    if units_system.upper() == 'SI':
+        # Raw values are already in SI units, only attach the unit strings
+        units = [SI_UNITS.get(prop_id, 'dimensionless') for prop_id in prop_ids]
+    else:
+        factors, units = converter.conversion_factors(prop_ids, wmm, 'SI', units_system)
+        table = table * factors[:, np.newaxis]
+    
+    # Fill the output one property at a time. NumPy finds the undefined
+    # values, and fully defined columns skip the per-point check entirely.
+    for prop_id, unit, column in zip(prop_ids, units, table):
+        values = column.tolist()
+        defined = np.isfinite(column)
+        if defined.all():
+            for properties, value in zip(rows, values):
+                properties[prop_id] = {'value': value, 'unit': unit}
+        else:
+            for i in np.flatnonzero(defined).tolist():  # Skip undefined properties
+                rows[i][prop_id] = {'value': values[i], 'unit': unit}
+    
+    # Composition vectors
+    for prop_id, vector in vectors.items():
+        values = vector.tolist()
+        for i in np.flatnonzero(~np.isnan(vector[:, 0])).tolist():
+            rows[i][prop_id] = {'value': values[i], 'unit': 'mole fraction'}
+    
+    # Add phase information, resolving each distinct vapor fraction once
+    if keep is None or 'phase' in keep:
+        phases: Dict[Any, Any] = {}
+        for properties, q in zip(rows, vapor_fraction):
+            phase = phases.get(q)
+            if phase is None:
+                phase = phases[q] = get_phase(q if q is None or math.isfinite(q) else None)
+            properties['phase'] = {'value': phase, 'unit': None}
+    
+    return rows
+
+def convert_properties_table(
+    raw_points: List[Dict[str, Any]], wmm: float, units_system: str = 'SI',
+    keep: Optional[AbstractSet[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convert raw property dictionaries to the requested unit system.
+    
+    Args:
+        raw_points: List of raw property dictionaries (SI units)
+        wmm: Molecular weight [g/mol]
+        units_system: Unit system to use ('SI' or 'CGS')
+        keep: Optional set of properties to return (all properties if None)
+        
+    Returns:
+        List of property dictionaries with values and units
+    """
+    if not raw_points:
+        return []
+    columns, vectors, _ = collect_property_columns(raw_points, len(raw_points))
+    return convert_property_columns(columns, vectors, wmm, units_system, keep)
+
+def calculate_properties_extended(
+    z: List[float], T: float, P: float, 
+    units_system: str = 'SI', 
+    is_pure: bool = False, 
+    pure_component_idx: int = 0,
+    wmm: Optional[float] = None,
+    critical_props: Optional[Tuple[Optional[float], Optional[float], Optional[float]]] = None
+) -> Dict[str, Any]:
+    """
+    Calculate fluid properties at given temperature and pressure with solid phase support.
+    
+    Args:
+        z: Composition array
+        T: Temperature in K
+        P: Pressure in kPa
+        units_system: Unit system to use ('SI' or 'CGS')
+        is_pure: Whether this is a pure fluid
+        pure_component_idx: Index of the pure component
+        wmm: Molecular weight (calculated if not given)
+        critical_props: Tuple with (Tc, Pc, Dc) (calculated if not given)
+        
+    Returns:
+        Dictionary of calculated properties with values and units
+    """
+    # Get molecular weight for unit conversions
+    if wmm is None:
+        wmm = RP.WMOLdll(z)
+    
+    raw_properties = calculate_raw_properties_extended(
+        z, T, P, is_pure, pure_component_idx, critical_props
+    )
+    
+    if 'calculation_error' in raw_properties:
+        return {
+            'temperature': converter.convert_property(
+                'temperature', float(raw_properties['temperature']), wmm, 'SI', units_system
+            ),
+            'pressure': converter.convert_property(
+                'pressure', float(raw_properties['pressure']), wmm, 'SI', units_system
+            ),
+            'calculation_error': {
+                'value': raw_properties['calculation_error'],
+                'unit': None
+            }
+        }
+    
+    return convert_properties_table([raw_properties], wmm, units_system)[0]
 
 @extended_pt_flash_bp.route('/extended_pt_flash', methods=['POST'])
 def extended_pt_flash():
@@ -384,15 +777,18 @@ def extended_pt_flash():
         if not properties:
             return jsonify({'error': 'No properties specified for calculation'}), 400
 
-        # Validate composition
-        if not validate_composition(data['composition']):
-            return jsonify({'error': 'Invalid composition - fractions must sum to 1'}), 400
+        # Validate and parse composition
+        try:
+            fluids, z = parse_composition(data['composition'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Setup mixture
-        z = setup_mixture(data['composition'])
+        setup_mixture(fluids, z)
         
-        # Get molecular weight for unit conversions
-        wmm = RP.WMOLdll(z)
+        # Get molecular weight and critical properties (cached per composition)
+        composition_key = tuple((comp['fluid'], comp['fraction']) for comp in data['composition'])
+        wmm, critical_props = get_composition_constants(composition_key)
 
         # Determine if it's a pure fluid
         is_pure = sum(1 for component in z if component > 0) == 1
@@ -410,51 +806,73 @@ def extended_pt_flash():
                    pressure_resolution, temperature_resolution]):
             return jsonify({'error': 'Missing range or resolution parameters'}), 400
 
-        # Debug log
-        print(f"Calculating extended PT flash for temperature range: {temperature_range['from']} to {temperature_range['to']} °C, "
+        logger.info(f"Calculating extended PT flash for temperature range: {temperature_range['from']} to {temperature_range['to']} °C, "
               f"pressure range: {pressure_range['from']} to {pressure_range['to']} bar")
 
         # Create arrays for calculations
-        T_range = np.arange(
+        T_range = equidistant_grid(
             float(temperature_range['from']) + 273.15,
-            float(temperature_range['to']) + 273.15 + float(temperature_resolution),
+            float(temperature_range['to']) + 273.15,
             float(temperature_resolution)
         )
-        P_range = np.arange(
+        P_range = equidistant_grid(
             float(pressure_range['from']) * 100,  # Convert bar to kPa
-            float(pressure_range['to']) * 100 + float(pressure_resolution) * 100,
+            float(pressure_range['to']) * 100,
             float(pressure_resolution) * 100
         )
 
-        # Calculate properties
-        results = []
-        idx = 0
-        for p_idx, P in enumerate(P_range):
-            for t_idx, T in enumerate(T_range):
-                try:
-                    props = calculate_properties_extended(
-                        z, float(T), float(P), units_system, is_pure, pure_component_idx
-                    )
-                    
-                    # Filter properties
-                    filtered_props = {k: v for k, v in props.items() 
-                                   if k in properties or k in ['temperature', 'pressure', 'phase']}
-                    
-                    # Skip points with calculation errors
-                    if 'calculation_error' in props and len(filtered_props) <= 3:  # Only T, P, and error
-                        continue
-                        
-                    # Add result with indices
-                    results.append({
-                        'index': idx,
-                        'p_idx': p_idx,
-                        't_idx': t_idx,
-                        **filtered_props
-                    })
-                    idx += 1
-                except Exception as fe:
-                    print(f"Error processing T={T-273.15}°C, P={P/100} bar: {fe}", file=sys.stderr)
-                    continue
+        # Flatten the rounded grid (pressure-major) into plain-float tasks in one pass
+        P_grid, T_grid = np.meshgrid(
+            np.round(P_range, STATE_DECIMALS), np.round(T_range, STATE_DECIMALS), indexing='ij'
+        )
+        p_indices, t_indices = np.indices(P_grid.shape)
+        tasks = list(zip(
+            p_indices.ravel().tolist(), t_indices.ravel().tolist(),
+            T_grid.ravel().tolist(), P_grid.ravel().tolist()
+        ))
+
+        # Calculate raw properties at every grid point
+        # Only the requested properties are calculated, derived and converted
+        keep = frozenset(properties) | {'temperature', 'pressure', 'phase'}
+        if critical_props[0] is None and not CRITICAL_PROPERTIES.isdisjoint(keep):
+            # Report the CRITPdll failure once instead of omitting the values point by point
+            logger.warning("Critical point could not be calculated for this composition; "
+                           "critical properties are left out of the results")
+            keep -= CRITICAL_PROPERTIES
+        point_args = (composition_key, is_pure, pure_component_idx, critical_props, keep,
+                      calculation.get('cache', True))
+        
+        parallel_options = calculation.get('parallel_options', {})
+        if parallel_options.get('use_parallel', True) and len(tasks) > PARALLEL_MIN_POINTS:
+            # Each worker process holds its own REFPROP instance
+            num_processes = parallel_options.get('num_processes') or default_processes()
+            chunk_size = (parallel_options.get('chunk_size')
+                          or max(1, len(tasks) // (8 * num_processes)))
+            logger.info(f"Running parallel calculation with {num_processes} processes, "
+                        f"chunks of ~{chunk_size} points")
+            job = (next_job_id(), fluids, z, point_args)
+            chunks = [(job, tasks[i:i + chunk_size]) for i in range(0, len(tasks), chunk_size)]
+            outcomes = []
+            with worker_pool(num_processes) as pool:
+                for chunk_outcomes in pool.imap(_eval_grid_chunk, chunks):
+                    outcomes.extend(chunk_outcomes)
+        else:
+            outcomes = [_calculate_grid_point(task, point_args) for task in tasks]
+        
+        # Fill one column per property in grid order, skipping failed points
+        columns, vectors, valid = collect_property_columns((raw for _, _, raw in outcomes), len(outcomes))
+        failed_points = int(len(outcomes) - valid.sum())
+        if not valid.all():
+            columns = {k: v[valid] for k, v in columns.items()}
+            vectors = {k: v[valid] for k, v in vectors.items()}
+        
+        # Derive and convert the properties for the whole grid at once,
+        # writing them straight into the result dictionaries
+        results = [
+            {'index': idx, 'p_idx': p_idx, 't_idx': t_idx}
+            for idx, (p_idx, t_idx, _) in enumerate(o for o, ok in zip(outcomes, valid.tolist()) if ok)
+        ]
+        convert_property_columns(columns, vectors, wmm, units_system, keep, rows=results)
 
         # Return response in the requested format
         if response_format.lower() == 'olga_tab':
@@ -467,9 +885,8 @@ def extended_pt_flash():
                 wmm
             )
         else:
-            return jsonify({'results': results})
+            return format_json_response(results, failed_points=failed_points)
         
     except Exception as e:
-        print("Error processing request:", file=sys.stderr)
-        traceback.print_exc()
+        logger.exception("Error processing request")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
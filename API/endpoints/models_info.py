@@ -1,12 +1,13 @@
 # API/endpoints/models_info.py
 from flask import request, jsonify
-import traceback
-import sys
+import logging
 from typing import Dict, Any, List
 
 from API.endpoints import models_info_bp  # You'll need to create this blueprint in __init__.py
 from API.refprop_setup import RP
-from API.utils.helpers import validate_composition
+from API.utils.helpers import parse_composition, setup_fluids
+
+logger = logging.getLogger(__name__)
 
 def get_model_info(z: List[float]) -> Dict[str, Any]:
     """
@@ -133,15 +134,16 @@ def models_info():
         if 'composition' not in data:
             return jsonify({'error': 'Missing composition field'}), 400
                 
-        # Validate composition
-        if not validate_composition(data['composition']):
-            return jsonify({'error': 'Invalid composition - fractions must sum to 1'}), 400
+        # Validate and parse composition
+        try:
+            fluids, z = parse_composition(data['composition'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Setup the mixture in REFPROP
-        fluid_string = '|'.join(f"{comp['fluid']}.FLD" for comp in data['composition'])
-        z = [comp['fraction'] for comp in data['composition']] + [0] * (20 - len(data['composition']))
+        fluid_string = '|'.join(f"{fluid}.FLD" for fluid in fluids)
         
-        ierr, herr = RP.SETUPdll(len(data['composition']), fluid_string, 'HMX.BNC', 'DEF')
+        ierr, herr = setup_fluids(RP, len(fluids), fluid_string)
         if ierr > 0:
             return jsonify({'error': f"Error setting up mixture: {herr}"}), 400
         
@@ -155,6 +157,5 @@ def models_info():
         })
         
     except Exception as e:
-        print("Error processing request:", file=sys.stderr)
-        traceback.print_exc()
+        logger.exception("Error processing request")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -75,7 +75,7 @@ def ph_flash_olga():
         
         # Get requested properties, ensuring we include all OLGA required properties
         requested_properties = calculation.get('properties', [])
-        all_properties = list(set(requested_properties).union(set(OLGA_REQUIRED_PROPERTIES)))
+        all_properties = tuple(dict.fromkeys([*requested_properties, *OLGA_REQUIRED_PROPERTIES]))
         
         # Get grid options
         grid_options = {
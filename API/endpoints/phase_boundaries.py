@@ -1,23 +1,33 @@
 from flask import request, jsonify
 import numpy as np
-import sys
-import traceback
+import logging
 from typing import List, Dict, Any, Tuple
 
 from API.endpoints import phase_boundaries_bp
 from API.refprop_setup import RP
-from API.unit_converter import UnitConverter
-from API.utils.helpers import validate_composition
+from API.unit_converter import converter
+from API.utils.helpers import parse_composition, setup_fluids
+from API.core.formatters.json_formatter import format_json_document
+from API.utils.grid_generator import equidistant_grid
 
-def setup_mixture(composition: List[Dict[str, Any]]) -> List[float]:
-    """Setup REFPROP mixture"""
-    fluid_string = '|'.join(f"{comp['fluid']}.FLD" for comp in composition)
-    z = [comp['fraction'] for comp in composition] + [0] * (20 - len(composition))
+logger = logging.getLogger(__name__)
+
+# Properties reported along the phase boundaries
+BOUNDARY_PROPERTIES = ['temperature', 'pressure', 'enthalpy', 'density']
+
+def setup_mixture(fluids: List[str], z: np.ndarray) -> None:
+    """
+    Setup REFPROP mixture.
+    
+    Args:
+        fluids: Fluid names, as returned by parse_composition()
+        z: Composition array, as returned by parse_composition()
+    """
+    fluid_string = '|'.join(f"{fluid}.FLD" for fluid in fluids)
     
-    ierr, herr = RP.SETUPdll(len(composition), fluid_string, 'HMX.BNC', 'DEF')
+    ierr, herr = setup_fluids(RP, len(fluids), fluid_string)
     if ierr > 0:
         raise ValueError(f"Error setting up mixture: {herr}")
-    return z
 
 def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float], 
                               temp_resolution: float, boundary_types: List[str],
@@ -35,16 +45,21 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
     Returns:
         Dictionary with phase boundary data
     """
-    # Initialize unit converter
-    converter = UnitConverter()
-    
     # Get molecular weight for unit conversions
     wmm = RP.WMOLdll(z)
     
+    # Resolve each unit conversion once instead of once per boundary point
+    factors, units = converter.conversion_factors(BOUNDARY_PROPERTIES, wmm, 'SI', units_system)
+    scales = dict(zip(BOUNDARY_PROPERTIES, zip(factors.tolist(), units)))
+    
+    def convert(prop_id: str, value: float) -> Dict[str, Any]:
+        factor, unit = scales[prop_id]
+        return {'value': float(value) * factor, 'unit': unit}
+    
     # Generate temperature range in K
-    temps = np.arange(
+    temps = equidistant_grid(
         float(temp_range['from']) + 273.15,
-        float(temp_range['to']) + 273.15 + float(temp_resolution),
+        float(temp_range['to']) + 273.15,
         float(temp_resolution)
     )
     
@@ -62,11 +77,11 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
             critical_temp = Tc - 273.15  # Convert to Celsius
             critical_press = Pc / 100    # Convert kPa to bar
             critical_point = {
-                "temperature": converter.convert_property("temperature", float(critical_temp), wmm, 'SI', units_system),
-                "pressure": converter.convert_property("pressure", float(critical_press), wmm, 'SI', units_system)
+                "temperature": convert("temperature", critical_temp),
+                "pressure": convert("pressure", critical_press)
             }
     except Exception as e:
-        print(f"Error getting critical point: {str(e)}")
+        logger.warning(f"Error getting critical point: {str(e)}")
     
     # Check for supported substances for solid calculations
     # For pure fluids only
@@ -77,7 +92,7 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
     comp_info = RP.NAMEdll(pure_component_idx) if is_pure else None
     comp_name = comp_info[0] if comp_info else "Mixture"
     
-    print(f"Calculating phase boundaries for {comp_name}")
+    logger.info(f"Calculating phase boundaries for {comp_name}")
     
     # Calculate melting curve if requested
     if 'melting' in boundary_types and is_pure:
@@ -91,15 +106,15 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                         continue
                         
                     # Convert units as needed
-                    T_unit = converter.convert_property("temperature", float(T - 273.15), wmm, 'SI', units_system)
-                    P_unit = converter.convert_property("pressure", float(P / 100), wmm, 'SI', units_system)
+                    T_unit = convert("temperature", T - 273.15)
+                    P_unit = convert("pressure", P / 100)
                     
                     # Get enthalpy at the melting point using TPFLSHdll
                     try:
                         D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr2, herr2 = RP.TPFLSHdll(T, P, z)
                         if ierr2 == 0:
                             # Convert enthalpy
-                            h_unit = converter.convert_property("enthalpy", float(h), wmm, 'SI', units_system)
+                            h_unit = convert("enthalpy", h)
                             
                             # Add to melting curve
                             melting_curve.append({
@@ -117,7 +132,7 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                 # Skip if MELTTdll fails for this temperature
                 continue
         
-        print(f"Generated {len(melting_curve)} points for melting curve")
+        logger.info(f"Generated {len(melting_curve)} points for melting curve")
     
     # Calculate sublimation curve if requested
     if 'sublimation' in boundary_types and is_pure:
@@ -131,15 +146,15 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                         continue
                         
                     # Convert units as needed
-                    T_unit = converter.convert_property("temperature", float(T - 273.15), wmm, 'SI', units_system)
-                    P_unit = converter.convert_property("pressure", float(P / 100), wmm, 'SI', units_system)
+                    T_unit = convert("temperature", T - 273.15)
+                    P_unit = convert("pressure", P / 100)
                     
                     # Get enthalpy at the sublimation point using TPFLSHdll
                     try:
                         D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr2, herr2 = RP.TPFLSHdll(T, P, z)
                         if ierr2 == 0:
                             # Convert enthalpy
-                            h_unit = converter.convert_property("enthalpy", float(h), wmm, 'SI', units_system)
+                            h_unit = convert("enthalpy", h)
                             
                             # Add to sublimation curve
                             sublimation_curve.append({
@@ -157,7 +172,7 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                 # Skip if SUBLTdll fails for this temperature
                 continue
         
-        print(f"Generated {len(sublimation_curve)} points for sublimation curve")
+        logger.info(f"Generated {len(sublimation_curve)} points for sublimation curve")
     
     # Calculate vapor-liquid (saturation) curve if requested
     if 'vaporization' in boundary_types:
@@ -169,21 +184,21 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                 
                 if ierr == 0:
                     # Convert units
-                    T_unit = converter.convert_property("temperature", float(T - 273.15), wmm, 'SI', units_system)
-                    P_unit = converter.convert_property("pressure", float(P / 100), wmm, 'SI', units_system)
+                    T_unit = convert("temperature", T - 273.15)
+                    P_unit = convert("pressure", P / 100)
                     
                     # Get enthalpy at bubble point
                     try:
                         D, Dl, Dv, x_vle, y_vle, q, e, h, s, Cv, Cp, w, ierr2, herr2 = RP.TPFLSHdll(T, P, z)
                         if ierr2 == 0:
-                            h_unit = converter.convert_property("enthalpy", float(h), wmm, 'SI', units_system)
+                            h_unit = convert("enthalpy", h)
                             
                             vaporization_curve.append({
                                 "temperature": T_unit,
                                 "pressure": P_unit,
                                 "enthalpy": h_unit,
-                                "density_liquid": converter.convert_property("density", float(Dl), wmm, 'SI', units_system),
-                                "density_vapor": converter.convert_property("density", float(Dv), wmm, 'SI', units_system),
+                                "density_liquid": convert("density", Dl),
+                                "density_vapor": convert("density", Dv),
                                 "type": "bubble"  # Indicate this is a bubble point
                             })
                     except Exception as e:
@@ -197,7 +212,7 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                 # Skip if SATTdll fails for this temperature
                 continue
         
-        print(f"Generated {len(vaporization_curve)} points for vapor-liquid curve")
+        logger.info(f"Generated {len(vaporization_curve)} points for vapor-liquid curve")
     
     # Try to find the triple point if we're dealing with a pure fluid
     if is_pure and ('sublimation' in boundary_types or 'melting' in boundary_types):
@@ -211,14 +226,14 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                 
                 if ierr == 0:
                     # Convert units
-                    Ttrp_unit = converter.convert_property("temperature", float(Ttrp - 273.15), wmm, 'SI', units_system)
-                    P_triple_unit = converter.convert_property("pressure", float(P_triple / 100), wmm, 'SI', units_system)
+                    Ttrp_unit = convert("temperature", Ttrp - 273.15)
+                    P_triple_unit = convert("pressure", P_triple / 100)
                     
                     # Get enthalpy at triple point
                     try:
                         D, Dl, Dv, x, y, q, e, h, s, Cv, Cp, w, ierr2, herr2 = RP.TPFLSHdll(Ttrp, P_triple, z)
                         if ierr2 == 0:
-                            h_unit = converter.convert_property("enthalpy", float(h), wmm, 'SI', units_system)
+                            h_unit = convert("enthalpy", h)
                             
                             triple_point = {
                                 "temperature": Ttrp_unit,
@@ -232,7 +247,7 @@ def calculate_phase_boundaries(z: List[float], temp_range: Dict[str, float],
                             "pressure": P_triple_unit
                         }
         except Exception as e:
-            print(f"Error finding triple point: {str(e)}")
+            logger.warning(f"Error finding triple point: {str(e)}")
     
     # Build final response
     result = {}
@@ -283,15 +298,17 @@ def phase_boundaries():
         boundary_types = calculation.get('boundary_types', ['melting', 'sublimation', 'vaporization'])
         units_system = calculation.get('units_system', 'SI')  # Default to SI
         
-        # Validate composition
-        if not validate_composition(data['composition']):
-            return jsonify({'error': 'Invalid composition - fractions must sum to 1'}), 400
+        # Validate and parse composition
+        try:
+            fluids, z = parse_composition(data['composition'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Setup mixture
-        z = setup_mixture(data['composition'])
+        setup_mixture(fluids, z)
         
         # Debug log
-        print(f"Calculating phase boundaries for temperature range: {temp_range['from']} to {temp_range['to']} °C")
+        logger.info(f"Calculating phase boundaries for temperature range: {temp_range['from']} to {temp_range['to']} °C")
         
         # Calculate phase boundaries
         boundaries = calculate_phase_boundaries(
@@ -299,9 +316,8 @@ def phase_boundaries():
         )
         
         # Return results
-        return jsonify(boundaries)
+        return format_json_document(boundaries)
         
     except Exception as e:
-        print("Error processing request:", file=sys.stderr)
-        traceback.print_exc()
+        logger.exception("Error processing request")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
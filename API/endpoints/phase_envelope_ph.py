@@ -2,12 +2,16 @@
 from flask import request, jsonify
 import numpy as np
 import sys
-import traceback
+import logging
 from ctypes import c_double, c_int, byref
 
 from API.endpoints import phase_envelope_ph_bp
 from API.refprop_setup import RP
-from API.utils.helpers import validate_composition, get_phase, convert_for_json
+from API.utils.helpers import parse_composition, get_phase, convert_for_json, setup_fluids
+from API.core.formatters.json_formatter import format_json_document
+from API.utils.grid_generator import equidistant_grid
+
+logger = logging.getLogger(__name__)
 
 @phase_envelope_ph_bp.route('/phase_envelope_ph', methods=['POST'])
 def phase_envelope_ph():
@@ -29,9 +33,11 @@ def phase_envelope_ph():
         calculation = data.get('calculation', {})
         desired_curve = calculation.get('curve_type', 'both')  # Default to both curves
         
-        # Validate composition
-        if not validate_composition(data['composition']):
-            return jsonify({'error': 'Invalid composition - fractions must sum to 1'}), 400
+        # Validate and parse composition
+        try:
+            fluids, z = parse_composition(data['composition'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Extract range and resolution parameters
         pressure_range = variables['pressure'].get('range', {})
@@ -43,16 +49,12 @@ def phase_envelope_ph():
             return jsonify({'error': 'Missing pressure range or resolution parameters'}), 400
 
         # Setup mixture:
-        fluid_string = '|'.join(f"{c['fluid']}.FLD" for c in data['composition'])
-        z = [c['fraction'] for c in data['composition']] + [0]*(20-len(data['composition']))
+        fluid_string = '|'.join(f"{fluid}.FLD" for fluid in fluids)
         
         # Convert z to c_double array for REFPROP
-        z_array = (len(z)*c_double)(*z)
+        z_array = np.ctypeslib.as_ctypes(z)
 
-        ierr, herr = RP.SETUPdll(len(data['composition']),
-                                 fluid_string,
-                                 'HMX.BNC',
-                                 'DEF')
+        ierr, herr = setup_fluids(RP, len(fluids), fluid_string)
         if ierr > 0:
             return jsonify({"error": f"REFPROP SETUPdll error: {herr}"}), 400
         
@@ -60,9 +62,9 @@ def phase_envelope_ph():
         results_dew = []
 
         # Convert pressures from bar to kPa for REFPROP
-        pressures = np.arange(
+        pressures = equidistant_grid(
             float(pressure_range['from'])*100, 
-            (float(pressure_range['to']) + float(pressure_resolution))*100, 
+            float(pressure_range['to'])*100, 
             float(pressure_resolution)*100
         )
         
@@ -83,7 +85,7 @@ def phase_envelope_ph():
                             "vapor_fraction": 0.0  # By definition, bubble point has q=0
                         })
                 except Exception as e:
-                    print(f"Bubble point error at P={p_kpa/100} bar: {str(e)}")
+                    logger.debug(f"Bubble point error at P={p_kpa/100} bar: {str(e)}")
             
             # Calculate dew point (q=1)
             if desired_curve in ["both", "dew"]:
@@ -100,14 +102,14 @@ def phase_envelope_ph():
                             "vapor_fraction": 1.0  # By definition, dew point has q=1
                         })
                 except Exception as e:
-                    print(f"Dew point error at P={p_kpa/100} bar: {str(e)}")
+                    logger.debug(f"Dew point error at P={p_kpa/100} bar: {str(e)}")
 
         response = {
             "bubble_curve": results_bubble,
             "dew_curve": results_dew
         }
-        return jsonify(response)
+        return format_json_document(response)
 
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("Error processing request")
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -2,13 +2,17 @@
 from flask import request, jsonify
 import numpy as np
 import sys
-import traceback
+import logging
 from ctypes import c_double, c_int, byref, create_string_buffer
 
 from API.endpoints import phase_envelope_pt_bp  # <-- Define this blueprint in __init__.py
 from API.refprop_setup import RP
-from API.unit_converter import UnitConverter   # or wherever you handle your unit conversions
-from API.utils.helpers import validate_composition, get_phase, convert_for_json
+from API.unit_converter import converter
+from API.utils.helpers import parse_composition, get_phase, convert_for_json, setup_fluids
+from API.core.formatters.json_formatter import format_json_document
+from API.utils.grid_generator import equidistant_grid
+
+logger = logging.getLogger(__name__)
 
 @phase_envelope_pt_bp.route('/phase_envelope_pt', methods=['POST'])
 def phase_envelope_pt():
@@ -30,9 +34,11 @@ def phase_envelope_pt():
         calculation = data.get('calculation', {})
         desired_curve = calculation.get('curve_type', 'both')  # Default to both curves
         
-        # Validate composition
-        if not validate_composition(data['composition']):
-            return jsonify({'error': 'Invalid composition - fractions must sum to 1'}), 400
+        # Validate and parse composition
+        try:
+            fluids, z = parse_composition(data['composition'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Extract range and resolution parameters
         temperature_range = variables['temperature'].get('range', {})
@@ -44,24 +50,20 @@ def phase_envelope_pt():
             return jsonify({'error': 'Missing temperature range or resolution parameters'}), 400
 
         # Setup mixture:
-        fluid_string = '|'.join(f"{c['fluid']}.FLD" for c in data['composition'])
-        z = [c['fraction'] for c in data['composition']] + [0]*(20-len(data['composition']))
+        fluid_string = '|'.join(f"{fluid}.FLD" for fluid in fluids)
         
         # Convert z to c_double array for REFPROP
-        z_array = (len(z)*c_double)(*z)
+        z_array = np.ctypeslib.as_ctypes(z)
 
-        ierr, herr = RP.SETUPdll(len(data['composition']),
-                                 fluid_string,
-                                 'HMX.BNC',
-                                 'DEF')
+        ierr, herr = setup_fluids(RP, len(fluids), fluid_string)
         if ierr > 0:
             return jsonify({"error": f"REFPROP SETUPdll error: {herr}"}), 400
 
         results_bubble = []
         results_dew = []
         
-        # Loop over temperature range:
-        Ts = np.arange(
+        # Loop over temperature range (both endpoints included, as in the PH envelope):
+        Ts = equidistant_grid(
             float(temperature_range['from']) + 273.15, 
             float(temperature_range['to']) + 273.15, 
             float(temperature_resolution)
@@ -85,7 +87,7 @@ def phase_envelope_pt():
                             "vapor_composition": list(result.y[:len(data['composition'])])
                         })
                 except Exception as e:
-                    print(f"Bubble point error at T={T-273.15}°C: {str(e)}")
+                    logger.debug(f"Bubble point error at T={T-273.15}°C: {str(e)}")
             
             # Dew point calculation (kph=2)
             if desired_curve in ["both", "dew"]:
@@ -102,15 +104,15 @@ def phase_envelope_pt():
                             "vapor_composition": list(result.y[:len(data['composition'])])
                         })
                 except Exception as e:
-                    print(f"Dew point error at T={T-273.15}°C: {str(e)}")
+                    logger.debug(f"Dew point error at T={T-273.15}°C: {str(e)}")
 
         # Return final results in JSON
         response = {
             "bubble_curve": results_bubble,
             "dew_curve": results_dew
         }
-        return jsonify(response)
+        return format_json_document(response)
 
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("Error processing request")
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
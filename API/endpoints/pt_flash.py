@@ -17,7 +17,7 @@ from API.endpoints import pt_flash_bp
 # Import from the new core modules
 from API.core.property_system import PropertyRegistry
 from API.core.flash_calculators import PTFlashCalculator
-from API.core.formatters.json_formatter import format_json_response, filter_properties
+from API.core.formatters.json_formatter import format_json_response, format_ndjson_response
 from API.core.formatters.olga_formatter import format_olga_response
 
 # Import REFPROP instance
@@ -54,7 +54,7 @@ def pt_flash() -> Union[Response, Any]:
         "calculation": {
             "properties": ["property1", "property2", ...],
             "units_system": "SI" or "CGS",
-            "response_format": "json" or "olga_tab",  # For backward compatibility
+            "response_format": "json", "ndjson" or "olga_tab",  # For backward compatibility
             "grid_type": "equidistant" or "adaptive" or "logarithmic" or "exponential",
             "enhancement_factor": 5.0,
             "boundary_zone_width": null
@@ -88,7 +88,7 @@ def pt_flash() -> Union[Response, Any]:
                           "Use the /pt_flash_olga endpoint instead.")
             
             # Ensure we have all required OLGA properties
-            all_properties = list(set(requested_properties).union(set(OLGA_REQUIRED_PROPERTIES)))
+            all_properties = tuple(dict.fromkeys([*requested_properties, *OLGA_REQUIRED_PROPERTIES]))
             calculation['properties'] = all_properties
         else:
             all_properties = requested_properties
@@ -105,7 +105,8 @@ def pt_flash() -> Union[Response, Any]:
         grid_options.update({
             'use_parallel': parallel_options.get('use_parallel', True),
             'num_processes': parallel_options.get('num_processes'),
-            'chunk_size': parallel_options.get('chunk_size')
+            'chunk_size': parallel_options.get('chunk_size'),
+            'use_cache': calculation.get('cache', True)
         })
         
         # Initialize the property registry and calculator
@@ -127,12 +128,12 @@ def pt_flash() -> Union[Response, Any]:
                 endpoint_type='pt_flash',
                 requested_properties=requested_properties
             )
+        elif response_format == 'ndjson':
+            # Stream one JSON object per line, filtering each result as it is sent
+            return format_ndjson_response(results, grid_info, requested_properties)
         else:
-            # Filter to include only originally requested properties
-            filtered_results = filter_properties(results, requested_properties)
-            
-            # Return JSON response
-            return format_json_response(filtered_results, grid_info)
+            # Serialize the JSON response, filtering each result as it is encoded
+            return format_json_response(results, grid_info, requested_properties)
         
     except ValueError as ve:
         # Handle validation errors
@@ -4,9 +4,16 @@ Handles conversions between different unit systems with proper handling of molec
 and compound units. Supports both forward and reverse conversions.
 """
 
-from typing import Dict, Any, Union, List, Optional
+from typing import Dict, Any, Union, List, Optional, Tuple
+from functools import lru_cache
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# Number of (molecular weight, unit systems) conversion tables kept in memory
+CONVERSION_TABLE_CACHE_SIZE = 256
+
 class UnitConverter:
     def __init__(self):
         # Basic conversion factors
@@ -308,10 +315,87 @@ class UnitConverter:
             return {'value': converted, 'unit': to_unit}
         except Exception as e:
             # If conversion fails, return with original value and unit
-            print(f"Conversion error for {property_id}: {str(e)}")
+            logger.debug("Conversion error for %s: %s", property_id, e)
             return {'value': value, 'unit': from_unit}
 
-    def convert_property_reverse(self, 
+    def convert_array(self,
+                      property_id: str,
+                      values: Union[List[float], np.ndarray],
+                      wmm: float,
+                      from_system: str = 'SI',
+                      to_system: str = 'SI') -> Tuple[np.ndarray, str]:
+        """
+        Convert an array of property values between unit systems
+
+        All supported conversions are pure scale factors, so the factor is
+        resolved once and applied to the whole array.
+
+        Args:
+            property_id: Property identifier (e.g., 'density', 'pressure')
+            values: Property values
+            wmm: Molecular weight [g/mol]
+            from_system: Original unit system ('SI' or 'CGS')
+            to_system: Target unit system ('SI' or 'CGS')
+
+        Returns:
+            Tuple with converted values array and unit
+        """
+        values = np.asarray(values, dtype=float)
+        converted = self.convert_property(property_id, 1.0, wmm, from_system, to_system)
+        return values * converted['value'], converted['unit']
+
+    def conversion_table(self,
+                         wmm: float,
+                         from_system: str = 'SI',
+                         to_system: str = 'SI') -> Dict[str, Tuple[float, str]]:
+        """
+        Get the scale factor and target unit of every known property
+
+        All supported conversions are pure scale factors, so a table built once
+        per molecular weight and pair of unit systems replaces per-value calls
+        to convert_property. Tables are cached at module level (see
+        _conversion_table) and must not be modified.
+
+        Args:
+            wmm: Molecular weight [g/mol]
+            from_system: Original unit system ('SI' or 'CGS')
+            to_system: Target unit system ('SI' or 'CGS')
+
+        Returns:
+            Dictionary of property -> (factor, unit)
+        """
+        return _conversion_table(wmm, from_system.upper(), to_system.upper())
+
+    def conversion_factors(self,
+                           property_ids: List[str],
+                           wmm: float,
+                           from_system: str = 'SI',
+                           to_system: str = 'SI') -> Tuple[np.ndarray, List[str]]:
+        """
+        Get the scale factors and target units for a list of properties
+
+        Lets a table of values with one row per property be converted with a
+        single multiplication.
+
+        Args:
+            property_ids: Property identifiers, one per table row
+            wmm: Molecular weight [g/mol]
+            from_system: Original unit system ('SI' or 'CGS')
+            to_system: Target unit system ('SI' or 'CGS')
+
+        Returns:
+            Tuple with factors array and list of units, in property_ids order
+        """
+        table = self.conversion_table(wmm, from_system, to_system)
+        # Properties without a defined conversion keep their values
+        entries = [
+            table.get(property_id) or (1.0, self.get_unit(property_id, to_system))
+            for property_id in property_ids
+        ]
+        factors = np.array([factor for factor, _ in entries], dtype=float)
+        return factors, [unit for _, unit in entries]
+
+    def convert_property_reverse(self,
                                  property_id: str, 
                                  value: float, 
                                  wmm: float, 
@@ -331,4 +415,31 @@ class UnitConverter:
             Dictionary with converted value and unit
         """
         # This is just calling convert_property with reversed from/to systems
-        return self.convert_property(property_id, value, wmm, from_system, to_system)
\ No newline at end of file
+        return self.convert_property(property_id, value, wmm, from_system, to_system)
+
+# UnitConverter only holds constant conversion tables, so a single instance
+# is shared by every module in the process
+converter = UnitConverter()
+
+
+@lru_cache(maxsize=CONVERSION_TABLE_CACHE_SIZE)
+def _conversion_table(wmm: float, from_system: str, to_system: str) -> Dict[str, Tuple[float, str]]:
+    """
+    Build the conversion table of UnitConverter.conversion_table.
+
+    Kept at module level, so the cache lives outside the shared converter and
+    evicts the least recently used table once it is full.
+
+    Args:
+        wmm: Molecular weight [g/mol]
+        from_system: Original unit system, upper case
+        to_system: Target unit system, upper case
+
+    Returns:
+        Dictionary of property -> (factor, unit)
+    """
+    table = {}
+    for property_id in converter.UNITS['SI']:
+        converted = converter.convert_property(property_id, 1.0, wmm, from_system, to_system)
+        table[property_id] = (converted['value'], converted['unit'])
+    return table
@@ -2,9 +2,31 @@
 Utility functions for generating calculation grids with different distribution strategies.
 """
 
+import logging
 import numpy as np
 from typing import List, Dict, Tuple, Union, Optional, Any
 
+logger = logging.getLogger(__name__)
+
+def equidistant_grid(range_min: float, range_max: float, resolution: float) -> np.ndarray:
+    """
+    Generate an evenly spaced grid including both range endpoints.
+    
+    The number of points is round((range_max - range_min) / resolution) + 1,
+    so the grid size does not depend on floating-point drift at the endpoint
+    the way np.arange(range_min, range_max + resolution, resolution) does.
+    
+    Args:
+        range_min: Minimum value of the range
+        range_max: Maximum value of the range
+        resolution: Target spacing between points
+        
+    Returns:
+        numpy array of grid points
+    """
+    num_points = int(round((range_max - range_min) / resolution)) + 1
+    return np.linspace(range_min, range_max, max(num_points, 1))
+
 def generate_grid(
     range_min: float, 
     range_max: float, 
@@ -36,12 +58,12 @@ def generate_grid(
         numpy array of grid points
     """
     if grid_type.lower() == "equidistant":
-        return np.arange(range_min, range_max + resolution, resolution)
+        return equidistant_grid(range_min, range_max, resolution)
     
     elif grid_type.lower() == "adaptive":
         if not boundaries:
             # If no boundaries provided, fall back to equidistant
-            return np.arange(range_min, range_max + resolution, resolution)
+            return equidistant_grid(range_min, range_max, resolution)
         
         return generate_adaptive_grid(
             range_min, range_max, resolution, boundaries, 
@@ -85,7 +107,7 @@ def generate_grid(
     
     else:
         # Default to equidistant grid for unknown grid_type
-        return np.arange(range_min, range_max + resolution, resolution)
+        return equidistant_grid(range_min, range_max, resolution)
 
 def generate_adaptive_grid(
     range_min: float, 
@@ -115,7 +137,7 @@ def generate_adaptive_grid(
         boundary_zone_width = 0.1 * (range_max - range_min)
     
     # Start with basic grid
-    basic_grid = np.arange(range_min, range_max + base_resolution, base_resolution)
+    basic_grid = equidistant_grid(range_min, range_max, base_resolution)
     
     # For each phase boundary, add more points in its vicinity
     enhanced_points = []
@@ -126,7 +148,7 @@ def generate_adaptive_grid(
             
             # Create higher resolution grid in this zone
             fine_resolution = base_resolution / enhancement_factor
-            zone_grid = np.arange(zone_min, zone_max + fine_resolution, fine_resolution)
+            zone_grid = equidistant_grid(zone_min, zone_max, fine_resolution)
             
             enhanced_points.extend(zone_grid)
     
@@ -205,7 +227,7 @@ def get_phase_boundaries_pt(rp, z: List[float], t_range: Dict[str, float], p_ran
                 pass
         
     except Exception as e:
-        print(f"Error determining PT phase boundaries: {str(e)}")
+        logger.warning(f"Error determining PT phase boundaries: {str(e)}")
     
     return t_boundaries, p_boundaries
 
@@ -300,7 +322,7 @@ def get_phase_boundaries_ph(rp, z: List[float], p_range: Dict[str, float], h_ran
                 pass
         
     except Exception as e:
-        print(f"Error determining PH phase boundaries: {str(e)}")
+        logger.warning(f"Error determining PH phase boundaries: {str(e)}")
     
     return p_boundaries, h_boundaries
 
@@ -391,7 +413,7 @@ def get_phase_boundaries_ts(rp, z: List[float], t_range: Dict[str, float], s_ran
                 pass
         
     except Exception as e:
-        print(f"Error determining TS phase boundaries: {str(e)}")
+        logger.warning(f"Error determining TS phase boundaries: {str(e)}")
     
     return t_boundaries, s_boundaries
 
@@ -463,7 +485,7 @@ def get_phase_boundaries_tv(rp, z: List[float], t_range: Dict[str, float], v_ran
                 pass
         
     except Exception as e:
-        print(f"Error determining TV phase boundaries: {str(e)}")
+        logger.warning(f"Error determining TV phase boundaries: {str(e)}")
     
     return t_boundaries, v_boundaries
 
@@ -558,6 +580,6 @@ def get_phase_boundaries_uv(rp, z: List[float], u_range: Dict[str, float], v_ran
                 pass
         
     except Exception as e:
-        print(f"Error determining UV phase boundaries: {str(e)}")
+        logger.warning(f"Error determining UV phase boundaries: {str(e)}")
     
     return u_boundaries, v_boundaries
\ No newline at end of file
@@ -1,5 +1,22 @@
 import numpy as np
-from typing import Any
+import threading
+import weakref
+from math import fsum
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Number of components in the REFPROP composition arrays
+MAX_COMPONENTS = 20
+
+# Allowed deviation of the summed mole fractions from 1
+COMPOSITION_TOLERANCE = 1e-6
+
+# Last successful SETUPdll arguments and result per REFPROP instance
+_loaded_fluids: "weakref.WeakKeyDictionary[Any, Tuple[Tuple[Any, ...], Tuple[int, str]]]" = \
+    weakref.WeakKeyDictionary()
+
+# Lock per REFPROP instance, see refprop_lock()
+_refprop_locks: "weakref.WeakKeyDictionary[Any, threading.RLock]" = weakref.WeakKeyDictionary()
+_refprop_locks_lock = threading.Lock()
 
 def get_phase(q):
     """Determine the phase of the fluid based on quality value."""
@@ -32,8 +49,105 @@ def validate_composition(composition):
     """Validate composition data"""
     if not composition:
         return False
-    total = sum(comp.get('fraction', 0) for comp in composition)
-    return abs(total - 1.0) < 1e-6
+    # fsum is exactly rounded, so only the inputs' own rounding counts
+    total = fsum(comp.get('fraction', 0) for comp in composition)
+    return abs(total - 1.0) < COMPOSITION_TOLERANCE
+
+def composition_array(fractions: Sequence[float]) -> np.ndarray:
+    """
+    Build the REFPROP composition array from a list of mole fractions.
+    
+    Args:
+        fractions: Mole fractions of the components in the mixture
+        
+    Returns:
+        float64 array of length MAX_COMPONENTS, zero-padded
+    """
+    z = np.zeros(MAX_COMPONENTS, dtype=np.float64)
+    z[:len(fractions)] = fractions
+    return z
+
+def parse_composition(composition: Sequence[Dict[str, Any]]) -> Tuple[List[str], np.ndarray]:
+    """
+    Validate a composition and extract fluids and mole fractions in one pass.
+    
+    Args:
+        composition: List of fluid components and fractions
+        
+    Returns:
+        Tuple with (fluid names, REFPROP composition array)
+        
+    Raises:
+        ValueError: If the composition is empty, has too many components,
+            or the fractions do not sum to 1
+    """
+    if not composition:
+        raise ValueError('Invalid composition - no components given')
+    if len(composition) > MAX_COMPONENTS:
+        raise ValueError(f'Invalid composition - at most {MAX_COMPONENTS} components are supported')
+    
+    fluids = []
+    z = np.zeros(MAX_COMPONENTS, dtype=np.float64)
+    for i, comp in enumerate(composition):
+        fluids.append(comp['fluid'])
+        z[i] = comp.get('fraction', 0)
+    
+    if abs(fsum(z) - 1.0) >= COMPOSITION_TOLERANCE:
+        raise ValueError('Invalid composition - fractions must sum to 1')
+    return fluids, z
+
+def setup_fluids(rp: Any, ncomp: int, fluid_string: str,
+                 hmx: str = 'HMX.BNC', hrf: str = 'DEF') -> Tuple[int, str]:
+    """
+    Load fluids into REFPROP, skipping SETUPdll if they are already loaded.
+    
+    SETUPdll reads the fluid and mixing-rule files from disk, so repeated
+    requests for the same fluids reuse the loaded setup. Mole fractions are
+    not part of the setup and do not affect this check. All SETUPdll calls
+    must go through this function so the loaded state stays in sync.
+    
+    Args:
+        rp: REFPROP instance
+        ncomp: Number of components
+        fluid_string: Fluid files separated by '|'
+        hmx: Mixing rules file
+        hrf: Reference state
+        
+    Returns:
+        Tuple with (ierr, herr) from SETUPdll
+    """
+    key = (ncomp, fluid_string, hmx, hrf)
+    loaded = _loaded_fluids.get(rp)
+    if loaded is not None and loaded[0] == key:
+        return loaded[1]
+    
+    ierr, herr = rp.SETUPdll(ncomp, fluid_string, hmx, hrf)
+    if ierr > 0:
+        _loaded_fluids.pop(rp, None)
+    else:
+        _loaded_fluids[rp] = (key, (ierr, herr))
+    return ierr, herr
+
+def refprop_lock(rp: Any) -> threading.RLock:
+    """
+    Get the lock serializing calls to a REFPROP instance.
+    
+    REFPROP keeps the loaded fluids in global state, so a result is only
+    valid for the fluids loaded when it was calculated. Hold this lock
+    across setup_fluids() and the calls that depend on it whenever the
+    result is cached under the fluids' key. The lock is reentrant.
+    
+    Args:
+        rp: REFPROP instance
+        
+    Returns:
+        Lock shared by all users of rp
+    """
+    with _refprop_locks_lock:
+        lock = _refprop_locks.get(rp)
+        if lock is None:
+            lock = _refprop_locks[rp] = threading.RLock()
+        return lock
 
 def trim(s: bytes) -> str:
     """Trim NULL characters and decode."""
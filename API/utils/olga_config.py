@@ -2,6 +2,9 @@
 Configuration for OLGA TAB format property mappings and behavior.
 This file defines how REFPROP properties map to OLGA TAB properties,
 including unit conversions and fallback strategies.
+
+Each property is converted from REFPROP units by multiplying with one of the
+UNIT_FACTORS, evaluated once per table for the mixture molar mass.
 """
 
 # Define the minimum set of properties required for OLGA TAB format
@@ -12,6 +15,17 @@ OLGA_REQUIRED_PROPERTIES = [
     "phase", "x", "y"
 ]
 
+# Frozen view of the required properties for membership tests
+OLGA_REQUIRED_FROZEN = frozenset(OLGA_REQUIRED_PROPERTIES)
+
+# Conversion factors from REFPROP units, as functions of the molar mass (g/mol)
+UNIT_FACTORS = {
+    'none': lambda wmm: 1.0,
+    'molar_mass': lambda wmm: wmm,          # per mol/L -> per kg/m³
+    'milli': lambda wmm: 1e-3,              # μPa·s -> mPa·s = N·s/m²
+    'per_mass': lambda wmm: 1000.0 / wmm,   # per mol -> per kg
+}
+
 # Define standard OLGA TAB properties and their mappings to REFPROP properties
 OLGA_PROPERTY_MAPPINGS = [
     {
@@ -19,7 +33,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_density',
         'fallbacks': ['density'],
         'condition': lambda phase: phase in ['vapor', 'two-phase', 'supercritical'],
-        'converter': lambda x, wmm: x * wmm if x is not None else 0.0,  # mol/L * g/mol = g/L = kg/m³
+        'unit': 'molar_mass',  # mol/L * g/mol = g/L = kg/m³
         'description': 'Density of the vapor phase'
     },
     {
@@ -27,7 +41,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'liquid_density',
         'fallbacks': ['density'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * wmm if x is not None else 0.0,  # mol/L * g/mol = g/L = kg/m³
+        'unit': 'molar_mass',  # mol/L * g/mol = g/L = kg/m³
         'description': 'Density of the liquid phase'
     },
     {
@@ -35,7 +49,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'water_density',
         'fallbacks': [],
         'condition': lambda phase: True,  # Always include, zero if not applicable
-        'converter': lambda x, wmm: x if x is not None else 0.0,
+        'unit': 'none',
         'description': 'Density of water component'
     },
     {
@@ -43,7 +57,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'dDdP_vapor',
         'fallbacks': ['dDdP'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x * wmm if x is not None else 0.0,  # (mol/L)/kPa * g/mol = (kg/m³)/kPa
+        'unit': 'molar_mass',  # (mol/L)/kPa * g/mol = (kg/m³)/kPa
         'description': 'Derivative of gas density with respect to pressure'
     },
     {
@@ -51,7 +65,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'dDdP_liquid',
         'fallbacks': ['dDdP'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * wmm if x is not None else 0.0,  # (mol/L)/kPa * g/mol = (kg/m³)/kPa
+        'unit': 'molar_mass',  # (mol/L)/kPa * g/mol = (kg/m³)/kPa
         'description': 'Derivative of liquid density with respect to pressure'
     },
     {
@@ -59,7 +73,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'dDdT_vapor',
         'fallbacks': ['dDdT'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x * wmm if x is not None else 0.0,  # (mol/L)/K * g/mol = (kg/m³)/K
+        'unit': 'molar_mass',  # (mol/L)/K * g/mol = (kg/m³)/K
         'description': 'Derivative of gas density with respect to temperature'
     },
     {
@@ -67,7 +81,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'dDdT_liquid',
         'fallbacks': ['dDdT'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * wmm if x is not None else 0.0,  # (mol/L)/K * g/mol = (kg/m³)/K
+        'unit': 'molar_mass',  # (mol/L)/K * g/mol = (kg/m³)/K
         'description': 'Derivative of liquid density with respect to temperature'
     },
     {
@@ -75,7 +89,8 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_fraction',
         'fallbacks': [],
         'condition': lambda phase: True,  # Always include
-        'converter': lambda x, wmm: x if x is not None and 0 <= x <= 1 else (1.0 if phase == 'vapor' else 0.0),
+        'unit': 'none',
+        'valid_range': (0.0, 1.0),  # Phase codes outside [0, 1] are written as 0
         'description': 'Gas mass fraction'
     },
     {
@@ -83,7 +98,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_viscosity',
         'fallbacks': ['viscosity'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x * 1e-3 if x is not None else 0.0,  # μPa·s * 1e-3 = mPa·s = N·s/m²
+        'unit': 'milli',  # μPa·s * 1e-3 = mPa·s = N·s/m²
         'description': 'Gas dynamic viscosity'
     },
     {
@@ -91,7 +106,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'liquid_viscosity',
         'fallbacks': ['viscosity'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * 1e-3 if x is not None else 0.0,  # μPa·s * 1e-3 = mPa·s = N·s/m²
+        'unit': 'milli',  # μPa·s * 1e-3 = mPa·s = N·s/m²
         'description': 'Liquid dynamic viscosity'
     },
     {
@@ -99,7 +114,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_cp',
         'fallbacks': ['cp'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x * 1000.0 / wmm if x is not None else 0.0,  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
+        'unit': 'per_mass',  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
         'description': 'Gas specific heat capacity at constant pressure'
     },
     {
@@ -107,7 +122,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'liquid_cp',
         'fallbacks': ['cp'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * 1000.0 / wmm if x is not None else 0.0,  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
+        'unit': 'per_mass',  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
         'description': 'Liquid specific heat capacity at constant pressure'
     },
     {
@@ -115,7 +130,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_enthalpy',
         'fallbacks': ['enthalpy'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x * 1000.0 / wmm if x is not None else 0.0,  # J/mol * 1000 / (g/mol) = J/kg
+        'unit': 'per_mass',  # J/mol * 1000 / (g/mol) = J/kg
         'description': 'Gas specific enthalpy'
     },
     {
@@ -123,7 +138,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'liquid_enthalpy',
         'fallbacks': ['enthalpy'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * 1000.0 / wmm if x is not None else 0.0,  # J/mol * 1000 / (g/mol) = J/kg
+        'unit': 'per_mass',  # J/mol * 1000 / (g/mol) = J/kg
         'description': 'Liquid specific enthalpy'
     },
     {
@@ -131,7 +146,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_thermal_conductivity',
         'fallbacks': ['thermal_conductivity'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x if x is not None else 0.0,
+        'unit': 'none',
         'description': 'Gas thermal conductivity'
     },
     {
@@ -139,7 +154,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'liquid_thermal_conductivity',
         'fallbacks': ['thermal_conductivity'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x if x is not None else 0.0,
+        'unit': 'none',
         'description': 'Liquid thermal conductivity'
     },
     {
@@ -147,7 +162,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'surface_tension',
         'fallbacks': [],
         'condition': lambda phase: phase == 'two-phase',
-        'converter': lambda x, wmm: x if x is not None else 0.0,
+        'unit': 'none',
         'description': 'Surface tension between liquid and vapor phases'
     },
     {
@@ -155,7 +170,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'vapor_entropy',
         'fallbacks': ['entropy'],
         'condition': lambda phase: phase in ['vapor', 'two-phase'],
-        'converter': lambda x, wmm: x * 1000.0 / wmm if x is not None else 0.0,  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
+        'unit': 'per_mass',  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
         'description': 'Gas specific entropy'
     },
     {
@@ -163,7 +178,7 @@ OLGA_PROPERTY_MAPPINGS = [
         'key': 'liquid_entropy',
         'fallbacks': ['entropy'],
         'condition': lambda phase: phase in ['liquid', 'two-phase'],
-        'converter': lambda x, wmm: x * 1000.0 / wmm if x is not None else 0.0,  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
+        'unit': 'per_mass',  # J/(mol·K) * 1000 / (g/mol) = J/(kg·K)
         'description': 'Liquid specific entropy'
     }
 ]
@@ -7,6 +7,7 @@ import numpy as np
 import sys
 import traceback
 import logging
+from collections import Counter
 from typing import Dict, List, Any, Optional, Tuple, Union
 
 # Import the configuration
@@ -15,8 +16,72 @@ from API.utils.olga_config import (
     OLGA_REQUIRED_PROPERTIES, 
     PHASE_MAPPING,
     SPECIAL_VALUES,
-    DEFAULT_OLGA_OPTIONS
+    DEFAULT_OLGA_OPTIONS,
+    UNIT_FACTORS
 )
+from API.utils.grid_generator import equidistant_grid
+
+logger = logging.getLogger('olga_formatter')
+
+# Phases in which phase-specific properties may use their fallback keys
+FALLBACK_PHASES = {
+    'liquid_': ('liquid', 'two-phase'),
+    'vapor_': ('vapor', 'two-phase'),
+}
+
+# Grid variables, headers and unit multipliers of each endpoint type
+GRID_CONFIGS = {
+    'pt_flash': {
+        'x_name': 'pressure',
+        'y_name': 'temperature',
+        'x_header': 'Pressure (Pa)',
+        'y_header': 'Temperature (C)',
+        'x_idx_name': 'p_idx',
+        'y_idx_name': 't_idx',
+        'x_multiplier': 1e5,  # bar to Pa
+        'y_multiplier': 1.0   # already in C
+    },
+    'ph_flash': {
+        'x_name': 'pressure',
+        'y_name': 'enthalpy',
+        'x_header': 'Pressure (Pa)',
+        'y_header': 'Enthalpy (J/mol)',
+        'x_idx_name': 'p_idx',
+        'y_idx_name': 'h_idx',
+        'x_multiplier': 1e5,  # bar to Pa
+        'y_multiplier': 1.0   # J/mol
+    },
+    'ts_flash': {
+        'x_name': 'temperature',
+        'y_name': 'entropy',
+        'x_header': 'Temperature (C)',
+        'y_header': 'Entropy (J/mol-K)',
+        'x_idx_name': 't_idx',
+        'y_idx_name': 's_idx',
+        'x_multiplier': 1.0,  # already in C
+        'y_multiplier': 1.0   # J/mol-K
+    },
+    'vt_flash': {
+        'x_name': 'temperature',
+        'y_name': 'specific_volume',
+        'x_header': 'Temperature (C)',
+        'y_header': 'Specific Volume (m3/mol)',
+        'x_idx_name': 't_idx',
+        'y_idx_name': 'v_idx',
+        'x_multiplier': 1.0,  # already in C
+        'y_multiplier': 1.0   # m3/mol
+    },
+    'uv_flash': {
+        'x_name': 'internal_energy',
+        'y_name': 'specific_volume',
+        'x_header': 'Internal Energy (J/mol)',
+        'y_header': 'Specific Volume (m3/mol)',
+        'x_idx_name': 'u_idx',
+        'y_idx_name': 'v_idx',
+        'x_multiplier': 1.0,  # J/mol
+        'y_multiplier': 1.0   # m3/mol
+    }
+}
 
 def format_olga_tab(
     x_vars: Dict, 
@@ -44,12 +109,11 @@ def format_olga_tab(
     Returns:
         Response: Flask response object with OLGA TAB formatted content
     """
-    # Initialize logging
-    logger = logging.getLogger('olga_formatter')
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter('%(levelname)s: %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # Initialize logging (the handler is attached once, not on every request)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        logger.addHandler(handler)
     
     # Merge options with defaults
     if options is None:
@@ -87,36 +151,35 @@ def format_olga_tab(
         # Compose fluid description
         fluid_desc = " ".join([f"{comp['fluid']}-{comp['fraction']:.4f}" for comp in composition])
         
-        # Create OLGA TAB header
-        olga_tab = f"'Span-Wagner EOS {fluid_desc}'\n"
+        # Create OLGA TAB header (the file is collected as bytes and joined once)
+        olga_tab = [f"'Span-Wagner EOS {fluid_desc}'\n".encode('utf-8')]
         # Use exactly 4 spaces before the dimensions, and include the constant
-        olga_tab += f"    {nx_grid}  {ny_grid}    .802294E-08\n"
+        olga_tab.append(f"    {nx_grid}  {ny_grid}    .802294E-08\n".encode('ascii'))
         
         # X-axis grid with appropriate multiplier
-        x_grid_formatted = [x * x_multiplier for x in x_grid]
-        olga_tab += format_grid_values(x_grid_formatted, options['values_per_line'], options['indent_spaces'])
+        x_grid_formatted = np.asarray(x_grid, dtype=float) * x_multiplier
+        olga_tab.append(format_grid_bytes(x_grid_formatted, options['values_per_line'], options['indent_spaces']))
         
         # Y-axis grid with appropriate multiplier
-        y_grid_formatted = [y * y_multiplier for y in y_grid]
-        olga_tab += format_grid_values(y_grid_formatted, options['values_per_line'], options['indent_spaces'])
+        y_grid_formatted = np.asarray(y_grid, dtype=float) * y_multiplier
+        olga_tab.append(format_grid_bytes(y_grid_formatted, options['values_per_line'], options['indent_spaces']))
         
         # Add phase envelope (bubble and dew curves) as special blocks
         # First the bubble point block (filled with special not_applicable values)
-        bubble_values = np.ones(ny_grid) * 1.0E+10
-        olga_tab += format_grid_values(bubble_values, options['values_per_line'], options['indent_spaces'])
+        bubble_values = np.full(ny_grid, 1.0E+10)
+        olga_tab.append(format_grid_bytes(bubble_values, options['values_per_line'], options['indent_spaces']))
         
         # Then the dew point block (filled with 0.0 values)
         dew_values = np.zeros(ny_grid)
-        olga_tab += format_grid_values(dew_values, options['values_per_line'], options['indent_spaces'])
+        olga_tab.append(format_grid_bytes(dew_values, options['values_per_line'], options['indent_spaces']))
         
         # Prioritize and filter property mappings
         olga_properties = prioritize_properties(OLGA_PROPERTY_MAPPINGS, requested_properties)
         
-        # Extract and format properties
-        property_arrays = {}
-        for prop in olga_properties:
-            # Initialize with zeros for all properties
-            property_arrays[prop['name']] = np.zeros((nx_grid, ny_grid))
+        # Extract and format properties: one contiguous (property, x, y) block,
+        # with a 2D view per property name
+        property_block = np.zeros((len(olga_properties), nx_grid, ny_grid))
+        property_arrays = {prop['name']: values for prop, values in zip(olga_properties, property_block)}
         
         # Create a 2D grid for phase detection
         phase_grid = np.zeros((nx_grid, ny_grid))
@@ -141,13 +204,13 @@ def format_olga_tab(
             )
         
         # Add property blocks to OLGA TAB
-        for prop in olga_properties:
-            olga_tab += f" {prop['name']}                \n"
-            olga_tab += format_grid_values(
-                property_arrays[prop['name']].flatten(), 
+        for prop, values in zip(olga_properties, property_block):
+            olga_tab.append(f" {prop['name']}                \n".encode('utf-8'))
+            olga_tab.append(format_grid_bytes(
+                values.ravel(), 
                 options['values_per_line'], 
                 options['indent_spaces']
-            )
+            ))
         
         # Log statistics if debug enabled
         if options['debug_level'] >= 1:
@@ -155,13 +218,12 @@ def format_olga_tab(
         
         # Return as a Response object with proper MIME type
         filename = f"{endpoint_type.replace('_', '-')}.tab"
-        return Response(olga_tab, mimetype='text/plain', headers={
+        return Response(b"".join(olga_tab), mimetype='text/plain', headers={
             'Content-Disposition': f'attachment; filename={filename}'
         })
         
     except Exception as e:
-        logger.error(f"Error in format_olga_tab: {str(e)}")
-        traceback.print_exc(file=sys.stderr)
+        logger.exception(f"Error in format_olga_tab: {str(e)}")
         
         # Return an error Response to prevent socket hang-up
         error_msg = f"Error generating OLGA TAB format: {str(e)}\n\n{traceback.format_exc()}"
@@ -171,69 +233,16 @@ def get_grid_config(endpoint_type: str) -> Dict[str, Any]:
     """
     Get the grid configuration for the specified endpoint type.
     """
-    configs = {
-        'pt_flash': {
-            'x_name': 'pressure',
-            'y_name': 'temperature',
-            'x_header': 'Pressure (Pa)',
-            'y_header': 'Temperature (C)',
-            'x_idx_name': 'p_idx',
-            'y_idx_name': 't_idx',
-            'x_multiplier': 1e5,  # bar to Pa
-            'y_multiplier': 1.0   # already in C
-        },
-        'ph_flash': {
-            'x_name': 'pressure',
-            'y_name': 'enthalpy',
-            'x_header': 'Pressure (Pa)',
-            'y_header': 'Enthalpy (J/mol)',
-            'x_idx_name': 'p_idx',
-            'y_idx_name': 'h_idx',
-            'x_multiplier': 1e5,  # bar to Pa
-            'y_multiplier': 1.0   # J/mol
-        },
-        'ts_flash': {
-            'x_name': 'temperature',
-            'y_name': 'entropy',
-            'x_header': 'Temperature (C)',
-            'y_header': 'Entropy (J/mol-K)',
-            'x_idx_name': 't_idx',
-            'y_idx_name': 's_idx',
-            'x_multiplier': 1.0,  # already in C
-            'y_multiplier': 1.0   # J/mol-K
-        },
-        'vt_flash': {
-            'x_name': 'temperature',
-            'y_name': 'specific_volume',
-            'x_header': 'Temperature (C)',
-            'y_header': 'Specific Volume (m3/mol)',
-            'x_idx_name': 't_idx',
-            'y_idx_name': 'v_idx',
-            'x_multiplier': 1.0,  # already in C
-            'y_multiplier': 1.0   # m3/mol
-        },
-        'uv_flash': {
-            'x_name': 'internal_energy',
-            'y_name': 'specific_volume',
-            'x_header': 'Internal Energy (J/mol)',
-            'y_header': 'Specific Volume (m3/mol)',
-            'x_idx_name': 'u_idx',
-            'y_idx_name': 'v_idx',
-            'x_multiplier': 1.0,  # J/mol
-            'y_multiplier': 1.0   # m3/mol
-        }
-    }
-    
     # Default to PT flash if endpoint type is not recognized
-    return configs.get(endpoint_type, configs['pt_flash'])
+    return GRID_CONFIGS.get(endpoint_type, GRID_CONFIGS['pt_flash'])
 
 def get_grid_values(vars_dict: Dict, logger: logging.Logger) -> Tuple[np.ndarray, int]:
     """
     Extract grid values from the variables dictionary.
     """
-    # Use provided grid values if available
+    # Use provided grid values if available, as float64 like generated grids
     if 'values' in vars_dict:
-        grid = vars_dict['values']
+        grid = np.asarray(vars_dict['values'], dtype=float)
         return grid, len(grid)
     
     # Extract range and resolution with robust error handling
@@ -257,9 +266,8 @@ def get_grid_values(vars_dict: Dict, logger: logging.Logger) -> Tuple[np.ndarray
             resolution = 10.0
             logger.warning(f"Invalid resolution (<=0), set to default {resolution}")
             
-        # Generate regular grid
-        num_points = int(round((range_to - range_from) / resolution)) + 1
-        grid = np.linspace(range_from, range_to, num_points)
+        # Generate regular grid (same point count as the calculation grid)
+        grid = equidistant_grid(range_from, range_to, resolution)
         
         return grid, len(grid)
     except (TypeError, ValueError) as e:
@@ -319,96 +327,176 @@ def map_results_to_grid(
 ) -> int:
     """
     Map calculation results to the 2D grid for OLGA TAB format.
+    
+    Raw property values are gathered per property in a single pass over the
+    results and turned into flat arrays afterwards. The raw values are
+    scattered onto the grid and each property array is then multiplied by its
+    unit factor.
     """
-    mapped_points = 0
+    # Mapped result rows with their grid indices and phase values (append-only)
+    mapped_rows = []
+    mapped_x = []
+    mapped_y = []
+    phase_values = []
+    
+    # Result rows and raw values found for each property (append-only)
+    gathered = {prop['name']: ([], []) for prop in olga_properties}
+    
+    # Properties applicable to each phase, resolved once per phase
+    phase_properties = {}
+    
+    # Results located by their coordinate values instead of grid indices
+    coordinate_rows = []
+    x_values = []
+    y_values = []
+    
+    # Field layout ({'value': ..., 'unit': ...} dicts or plain values), taken
+    # from the first result; other layouts still go through get_value_from_field
+    wrapped_fields = has_wrapped_fields(results)
+    
+    # Water component for the water density property
+    water_idx = find_water_index(composition)
+    
+    # Phase state of every result, classified up front
+    phases = get_phases_from_results(results)
+    
+    # Errors counted per result/property key and reported once at the end
+    error_counts = Counter()
     
     # Debug info about molar mass
     logger.info(f"Using molecular weight for conversion: {molar_mass} g/mol")
     
-    for result in results:
+    for i, result in enumerate(results):
         try:
             # Get grid indices from the result
             x_idx, y_idx = get_grid_indices(
                 result, x_idx_name, y_idx_name, 
                 x_name, y_name, x_grid, y_grid, 
-                nx_grid, ny_grid
+                nx_grid, ny_grid, match_coordinates=False
             )
             
-            # Skip if indices are out of bounds
-            if x_idx is None or y_idx is None or x_idx < 0 or x_idx >= nx_grid or y_idx < 0 or y_idx >= ny_grid:
+            if x_idx is None or y_idx is None:
+                # Map by coordinate values once all results are gathered
+                coordinates = get_grid_coordinates(result, x_name, y_name)
+                if coordinates is None:
+                    continue
+                coordinate_rows.append(i)
+                x_values.append(coordinates[0])
+                y_values.append(coordinates[1])
+            elif x_idx < 0 or x_idx >= nx_grid or y_idx < 0 or y_idx >= ny_grid:
+                # Skip if indices are out of bounds
                 continue
-                
-            mapped_points += 1
+            mapped_rows.append(i)
+            # Coordinate-mapped rows are filled in after the loop
+            mapped_x.append(0 if x_idx is None else x_idx)
+            mapped_y.append(0 if y_idx is None else y_idx)
+            phase_values.append(0.0)
             
-            # Extract phase information
-            phase = get_phase_from_result(result)
+            # Phase information (see get_phases_from_results)
+            phase = phases[i]
             
             # Store phase information for grid point
             if phase == 'liquid':
-                phase_grid[x_idx, y_idx] = 0.0
+                phase_value = 0.0
             elif phase == 'vapor':
-                phase_grid[x_idx, y_idx] = 1.0
+                phase_value = 1.0
             elif phase == 'two-phase':
                 # Use vapor fraction if available
                 vf = get_value_from_field(result.get('vapor_fraction', {'value': 0.5}))
-                phase_grid[x_idx, y_idx] = vf if 0.0 <= vf <= 1.0 else 0.5
+                phase_value = vf if 0.0 <= vf <= 1.0 else 0.5
             else:
                 # For other phases (supercritical, etc.), use standard mapping
-                phase_grid[x_idx, y_idx] = PHASE_MAPPING.get(phase, 0.5)
+                phase_value = PHASE_MAPPING.get(phase, 0.5)
+            phase_values[-1] = phase_value
                 
             # Log phase info for debugging
             if options['debug_level'] >= 2:
-                logger.info(f"Point ({x_idx}, {y_idx}): Phase = {phase}, Grid Value = {phase_grid[x_idx, y_idx]}")
+                logger.info(f"Point ({x_idx}, {y_idx}): Phase = {phase}, Grid Value = {phase_value}")
             
-            # Process each property
-            for prop in olga_properties:
-                try:
-                    # Check if property is applicable for this phase
-                    if prop['condition'](phase):
-                        # Extract the property value
-                        value = extract_property_value(
-                            result, prop['key'], prop['fallbacks'], 
-                            phase, composition, molar_mass
-                        )
-                        
-                        if value is not None:
-                            # Add special logging for gas density
-                            is_gas_density = prop['name'] == 'GAS DENSITY (KG/M3)'
-                            
-                            if is_gas_density and options['debug_level'] >= 1:
-                                logger.info(f"Gas density at ({x_idx}, {y_idx}): Original={value} mol/L")
-                            
-                            # Apply conversion function
-                            converted_value = prop['converter'](value, molar_mass)
-                            
-                            if is_gas_density and options['debug_level'] >= 1:
-                                logger.info(f"Gas density at ({x_idx}, {y_idx}): Converted={converted_value} kg/m³")
-                                logger.info(f"Conversion factor (molar_mass): {molar_mass}")
-                            
-                            # Debug: Check value before assignment
-                            if is_gas_density and options['debug_level'] >= 2:
-                                logger.info(f"Before assignment: array[{x_idx}, {y_idx}] = {property_arrays[prop['name']][x_idx, y_idx]}")
-                            
-                            # Store the value - using explicit float conversion to avoid any numpy type issues
-                            property_arrays[prop['name']][x_idx, y_idx] = float(converted_value)
-                            
-                            # Debug: Check value after assignment to ensure it was stored correctly
-                            if is_gas_density and options['debug_level'] >= 2:
-                                logger.info(f"After assignment: array[{x_idx}, {y_idx}] = {property_arrays[prop['name']][x_idx, y_idx]}")
-                            
-                        elif options['debug_level'] >= 2:
-                            logger.info(f"No value found for {prop['key']} at point ({x_idx}, {y_idx})")
-                            
-                except Exception as prop_error:
-                    if options['debug_level'] >= 1:
-                        logger.warning(f"Error processing property {prop['key']} for point ({x_idx}, {y_idx}): {prop_error}")
-                        logger.warning(f"Exception details: {str(prop_error)}")
+            applicable = phase_properties.get(phase)
+            if applicable is None:
+                applicable = [
+                    (prop, *gathered[prop['name']], result_keys(prop['key'], prop['fallbacks'], phase)) 
+                    for prop in olga_properties if prop['condition'](phase)
+                ]
+                phase_properties[phase] = applicable
+            
+            # Gather the raw value of each applicable property; values are
+            # validated when the gathered lists are converted to arrays
+            for prop, rows, values, keys in applicable:
+                key = prop['key']
+                value = None
+                for result_key in keys:
+                    if result_key not in result:
+                        continue
+                    field = result[result_key]
+                    if wrapped_fields:
+                        try:
+                            value = field['value']
+                        except (TypeError, KeyError, IndexError):
+                            value = get_value_from_field(field)
+                    else:
+                        value = field.get('value', field) if isinstance(field, dict) else field
+                    # The property key itself is final, even without a value
+                    if value is not None or result_key is key:
+                        break
+                else:
+                    # Derived values (two-phase, water, phase derivatives)
+                    value = extract_property_value(
+                        result, key, prop['fallbacks'], 
+                        phase, composition, molar_mass, water_idx
+                    )
+                
+                if value is not None:
+                    rows.append(i)
+                    values.append(value)
+                elif options['debug_level'] >= 2:
+                    logger.info(f"No value found for {key} at point ({x_idx}, {y_idx})")
                         
         except Exception as e:
-            if options['debug_level'] >= 1:
-                logger.warning(f"Error processing result: {e}")
-                logger.warning(f"Exception details: {str(e)}")
+            error_counts['result'] += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Error processing result %d: %s", i, e)
+            continue
+    
+    # Grid indices by result row
+    n_mapped = len(mapped_rows)
+    mapped_rows = np.fromiter(mapped_rows, dtype=np.intp, count=n_mapped)
+    x_idx_arr = np.zeros(len(results), dtype=np.intp)
+    y_idx_arr = np.zeros(len(results), dtype=np.intp)
+    x_idx_arr[mapped_rows] = np.fromiter(mapped_x, dtype=np.intp, count=n_mapped)
+    y_idx_arr[mapped_rows] = np.fromiter(mapped_y, dtype=np.intp, count=n_mapped)
+    if coordinate_rows:
+        x_idx_arr[coordinate_rows] = find_nearest_indices(x_grid, x_values)
+        y_idx_arr[coordinate_rows] = find_nearest_indices(y_grid, y_values)
+    
+    phase_grid[x_idx_arr[mapped_rows], y_idx_arr[mapped_rows]] = np.fromiter(
+        phase_values, dtype=float, count=n_mapped
+    )
+    
+    # Unit conversion factor of each property for this mixture
+    unit_factors = np.array([UNIT_FACTORS[prop['unit']](molar_mass) for prop in olga_properties])
+    
+    # Scatter raw values onto the grid, then convert each property array
+    for prop, factor in zip(olga_properties, unit_factors):
+        name = prop['name']
+        rows, values = gathered[name]
+        if not rows:
             continue
+        rows, raw = gathered_values_array(rows, values, prop['key'], error_counts, logger)
+        if 'valid_range' in prop:
+            low, high = prop['valid_range']
+            raw = np.where((raw >= low) & (raw <= high), raw, 0.0)
+        property_arrays[name][x_idx_arr[rows], y_idx_arr[rows]] = raw
+        property_arrays[name] *= factor
+    
+    if error_counts and options['debug_level'] >= 1:
+        logger.warning(f"Errors while mapping results to the grid: {dict(error_counts)}")
+    
+    if 'GAS DENSITY (KG/M3)' in property_arrays and options['debug_level'] >= 1:
+        logger.info(f"Gas density converted from mol/L to kg/m³ with factor (molar_mass): {molar_mass}")
+    
+    mapped_points = n_mapped
     
     # At the end, perform a check of the gas density array
     if 'GAS DENSITY (KG/M3)' in property_arrays and options['debug_level'] >= 1:
@@ -427,6 +515,49 @@ def map_results_to_grid(
             
     return mapped_points
 
+def has_wrapped_fields(results: List[Dict]) -> bool:
+    """
+    Tell whether result fields are {'value': ..., 'unit': ...} dictionaries.
+    
+    Only the first property field of the first result is inspected.
+    """
+    for result in results:
+        for key, field in result.items():
+            if key != 'index' and not key.endswith('_idx'):
+                return isinstance(field, dict)
+    return False
+
+def gathered_values_array(
+    rows: List[int],
+    values: List[Any],
+    key: str,
+    error_counts: Counter,
+    logger: logging.Logger
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the raw values gathered for one property to a float array.
+    
+    Values that are not numbers are dropped together with their result rows
+    and counted per property key in error_counts.
+    """
+    try:
+        raw = np.fromiter(values, dtype=float, count=len(values))
+        return np.fromiter(rows, dtype=np.intp, count=len(rows)), raw
+    except (TypeError, ValueError):
+        pass
+    
+    kept_rows = []
+    kept_values = []
+    for row, value in zip(rows, values):
+        try:
+            kept_values.append(float(value))
+            kept_rows.append(row)
+        except (TypeError, ValueError) as prop_error:
+            error_counts[key] += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Error processing property %s for result %d: %s", key, row, prop_error)
+    return np.array(kept_rows, dtype=np.intp), np.array(kept_values, dtype=float)
+
 def get_grid_indices(
     result: Dict,
     x_idx_name: str,
@@ -436,10 +567,14 @@ def get_grid_indices(
     x_grid: np.ndarray,
     y_grid: np.ndarray,
     nx_grid: int,
-    ny_grid: int
+    ny_grid: int,
+    match_coordinates: bool = True
 ) -> Tuple[Optional[int], Optional[int]]:
     """
     Get grid indices from result dictionary.
+    
+    With match_coordinates=False, results without grid indices are not
+    matched to the nearest grid values (see find_nearest_indices).
     """
     # First, try to get indices directly from the result
     x_idx = result.get(x_idx_name)
@@ -466,7 +601,7 @@ def get_grid_indices(
             pass
     
     # Final attempt: map by coordinate values
-    if x_name in result and y_name in result:
+    if match_coordinates and x_name in result and y_name in result:
         try:
             x_val = get_value_from_field(result[x_name])
             y_val = get_value_from_field(result[y_name])
@@ -481,16 +616,39 @@ def get_grid_indices(
     # Could not determine position
     return None, None
 
+def result_keys(key: str, fallbacks: List[str], phase: str) -> Tuple[str, ...]:
+    """
+    Get the result keys to try, in order, for a property in a given phase.
+    
+    Fallback keys of phase-specific properties (see FALLBACK_PHASES) are only
+    used in the phases where that phase is present.
+    """
+    for prefix, phases in FALLBACK_PHASES.items():
+        if key.startswith(prefix) and phase not in phases:
+            return (key,)
+    return (key, *fallbacks)
+
+def find_water_index(composition: List[Dict]) -> int:
+    """
+    Get the index of the water component in the composition, or -1.
+    """
+    return next((i for i, comp in enumerate(composition) 
+                 if "WATER" in comp['fluid'].upper()), -1)
+
 def extract_property_value(
     result: Dict,
     key: str,
     fallbacks: List[str],
     phase: str,
     composition: List[Dict],
-    molar_mass: float
+    molar_mass: float,
+    water_idx: Optional[int] = None
 ) -> Optional[float]:
     """
     Extract property value from result, with fallback mechanisms.
+    
+    water_idx is the composition index of water (see find_water_index); it
+    is looked up from the composition when not given.
     """
     try:
         # Direct property match
@@ -521,15 +679,11 @@ def extract_property_value(
                 if base_key in result and 'vapor_' + base_key in result:
                     base_val = get_value_from_field(result[base_key])
                     vapor_val = get_value_from_field(result['vapor_' + base_key])
-                    if base_val is not None and vapor_val is not None and q != 1.0:
+                    if base_val is not None and vapor_val is not None and q < 1.0:
                         # Calculate liquid value based on mixing equation
                         # base = q * vapor + (1-q) * liquid
                         # => liquid = (base - q * vapor) / (1-q)
-                        try:
-                            if q < 1.0:  # Avoid division by zero
-                                return (base_val - q * vapor_val) / (1-q)
-                        except Exception:
-                            pass
+                        return (base_val - q * vapor_val) / (1-q)
             
             # For vapor properties, try to derive from base and liquid properties
             if key.startswith('vapor_'):
@@ -537,21 +691,17 @@ def extract_property_value(
                 if base_key in result and 'liquid_' + base_key in result:
                     base_val = get_value_from_field(result[base_key])
                     liquid_val = get_value_from_field(result['liquid_' + base_key])
-                    if base_val is not None and liquid_val is not None and q != 0.0:
+                    if base_val is not None and liquid_val is not None and q > 0.0:
                         # Calculate vapor value based on mixing equation
                         # base = q * vapor + (1-q) * liquid
                         # => vapor = (base - (1-q) * liquid) / q
-                        try:
-                            if q > 0.0:  # Avoid division by zero
-                                return (base_val - (1-q) * liquid_val) / q
-                        except Exception:
-                            pass
+                        return (base_val - (1-q) * liquid_val) / q
         
         # Water component properties
         if key == 'water_density' or key.startswith('water_'):
             # Find water component by name
-            water_idx = next((i for i, comp in enumerate(composition) 
-                             if "WATER" in comp['fluid'].upper()), -1)
+            if water_idx is None:
+                water_idx = find_water_index(composition)
             
             if water_idx >= 0:
                 if phase == 'liquid' or phase == 'two-phase':
@@ -599,7 +749,8 @@ def extract_property_value(
         # Not found after all attempts
         return None
     except Exception as e:
-        print(f"Error extracting property {key}: {e}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Error extracting property %s: %s", key, e)
         return None
 
 def apply_fallback_calculations(
@@ -613,49 +764,66 @@ def apply_fallback_calculations(
 ) -> None:
     """
     Apply fallback calculations for missing or invalid property values.
+    
+    Zero density derivatives are replaced by central differences of the
+    phase densities between the neighbouring grid points, for all interior
+    points at once.
     """
-    # Identify zero values that need fallback calculations
-    for i in range(nx_grid):
-        for j in range(ny_grid):
-            # Current phase for this grid point
-            phase_value = phase_grid[i, j]
-            
-            # For density derivatives, use finite differences if direct values not available
-            if 'DRHOG/DP (S2/M2)' in property_arrays and property_arrays['DRHOG/DP (S2/M2)'][i, j] == 0.0:
-                if phase_value > 0.0:  # Has vapor component
-                    # Use finite differences with neighboring points if available
-                    if i > 0 and i < nx_grid - 1 and 'GAS DENSITY (KG/M3)' in property_arrays:
-                        try:
-                            dp = (x_grid[i+1] - x_grid[i-1]) / 2
-                            if dp > 0:
-                                drho_g = property_arrays['GAS DENSITY (KG/M3)'][i+1, j] - property_arrays['GAS DENSITY (KG/M3)'][i-1, j]
-                                property_arrays['DRHOG/DP (S2/M2)'][i, j] = drho_g / dp
-                        except Exception as e:
-                            logger.info(f"Finite difference fallback failed for DRHOG/DP at ({i},{j}): {e}")
-            
-            if 'DRHOL/DP (S2/M2)' in property_arrays and property_arrays['DRHOL/DP (S2/M2)'][i, j] == 0.0:
-                if phase_value < 1.0:  # Has liquid component
-                    # Similar approach for liquid density derivatives
-                    if i > 0 and i < nx_grid - 1 and 'LIQUID DENSITY (KG/M3)' in property_arrays:
-                        try:
-                            dp = (x_grid[i+1] - x_grid[i-1]) / 2
-                            if dp > 0:
-                                drho_l = property_arrays['LIQUID DENSITY (KG/M3)'][i+1, j] - property_arrays['LIQUID DENSITY (KG/M3)'][i-1, j]
-                                property_arrays['DRHOL/DP (S2/M2)'][i, j] = drho_l / dp
-                        except Exception as e:
-                            logger.info(f"Finite difference fallback failed for DRHOL/DP at ({i},{j}): {e}")
-                            
-            # Similar approach for temperature derivatives
-            if 'DRHOG/DT (KG/M3/K)' in property_arrays and property_arrays['DRHOG/DT (KG/M3/K)'][i, j] == 0.0:
-                if phase_value > 0.0:  # Has vapor component
-                    if j > 0 and j < ny_grid - 1 and 'GAS DENSITY (KG/M3)' in property_arrays:
-                        try:
-                            dt = (y_grid[j+1] - y_grid[j-1]) / 2
-                            if dt > 0:
-                                drho_g = property_arrays['GAS DENSITY (KG/M3)'][i, j+1] - property_arrays['GAS DENSITY (KG/M3)'][i, j-1]
-                                property_arrays['DRHOG/DT (KG/M3/K)'][i, j] = drho_g / dt
-                        except Exception as e:
-                            logger.info(f"Finite difference fallback failed for DRHOG/DT at ({i},{j}): {e}")
+    # Points with some vapor (gas properties) or some liquid (liquid properties)
+    has_vapor = phase_grid > 0.0
+    has_liquid = phase_grid < 1.0
+    
+    # For density derivatives, use finite differences if direct values not available
+    fallbacks = [
+        ('DRHOG/DP (S2/M2)', 'GAS DENSITY (KG/M3)', has_vapor, x_grid, 0),
+        ('DRHOL/DP (S2/M2)', 'LIQUID DENSITY (KG/M3)', has_liquid, x_grid, 0),
+        ('DRHOG/DT (KG/M3/K)', 'GAS DENSITY (KG/M3)', has_vapor, y_grid, 1),
+    ]
+    for derivative_name, density_name, has_phase, grid, axis in fallbacks:
+        if derivative_name not in property_arrays or density_name not in property_arrays:
+            continue
+        try:
+            fill_central_differences(
+                property_arrays[derivative_name], property_arrays[density_name],
+                has_phase, grid, axis
+            )
+        except Exception as e:
+            logger.info(f"Finite difference fallback failed for {derivative_name}: {e}")
+
+def fill_central_differences(
+    derivative: np.ndarray,
+    density: np.ndarray,
+    has_phase: np.ndarray,
+    grid: np.ndarray,
+    axis: int
+) -> None:
+    """
+    Replace zero derivative values by central differences of the density.
+    
+    Args:
+        derivative: 2D derivative array, updated in place
+        density: 2D density array on the same grid
+        has_phase: Mask of the points where the phase is present
+        grid: Grid values along the differentiation axis
+        axis: 0 to differentiate along x (rows), 1 along y (columns)
+    """
+    grid = np.asarray(grid, dtype=float)
+    if len(grid) < 3:
+        return
+    
+    # Half the distance between the neighbours of each interior point
+    spacing = (grid[2:] - grid[:-2]) / 2
+    valid = spacing > 0
+    spacing = np.where(valid, spacing, 1.0)
+    
+    # Work along the rows; transposed views write through to the inputs
+    if axis == 1:
+        derivative, density, has_phase = derivative.T, density.T, has_phase.T
+    
+    interior = derivative[1:-1]
+    fill = (interior == 0.0) & has_phase[1:-1] & valid[:, None]
+    difference = (density[2:] - density[:-2]) / spacing[:, None]
+    interior[fill] = difference[fill]
 
 def log_property_statistics(
     property_arrays: Dict[str, np.ndarray],
@@ -681,13 +849,73 @@ def get_value_from_field(field: Union[Dict, Any]) -> Any:
     """
     Extract value from field, handling both direct values and dictionaries with 'value' key.
     """
-    try:
-        if isinstance(field, dict) and 'value' in field:
-            return field['value']
-        return field
-    except Exception as e:
-        print(f"Error getting value from field: {e}")
+    if isinstance(field, dict) and 'value' in field:
+        return field['value']
+    return field
+
+def phase_from_name(phase_value: Any) -> Optional[str]:
+    """
+    Map a phase description (e.g. 'Two-phase', 'Supercritical') to a phase
+    state, or None if it is not recognized.
+    """
+    if not isinstance(phase_value, str):
         return None
+    phase_lower = phase_value.lower()
+    if 'liquid' in phase_lower:
+        return 'liquid'
+    elif 'vapor' in phase_lower or 'gas' in phase_lower:
+        return 'vapor'
+    elif 'two' in phase_lower or 'mixed' in phase_lower:
+        return 'two-phase'
+    elif 'super' in phase_lower and 'critic' in phase_lower:
+        return 'supercritical'
+    elif 'solid' in phase_lower:
+        return 'solid'
+    return None
+
+def phases_from_vapor_fractions(q: np.ndarray) -> List[str]:
+    """
+    Classify vapor fractions into phase states.
+    
+    Codes above 998 count as vapor and below -998 as liquid; NaN (missing or
+    non-numeric values) and other values outside [0, 1] are 'unknown'.
+    """
+    conditions = [q == 0, q == 1, (q > 0) & (q < 1), q > 998, q < -998]
+    choices = ['liquid', 'vapor', 'two-phase', 'vapor', 'liquid']
+    return np.select(conditions, choices, default='unknown').tolist()
+
+def get_phases_from_results(results: List[Dict]) -> List[str]:
+    """
+    Determine the phase state of every result, as get_phase_from_result does.
+    
+    Phase descriptions are read per result; the remaining results are
+    classified from their vapor fractions in one vectorized step.
+    """
+    phases = ['unknown'] * len(results)
+    q_rows = []
+    q_values = []
+    for i, result in enumerate(results):
+        if not isinstance(result, dict):
+            continue
+        if 'phase' in result:
+            phase = phase_from_name(get_value_from_field(result['phase']))
+            if phase is not None:
+                phases[i] = phase
+                continue
+        if 'q' in result:
+            q_value = get_value_from_field(result['q'])
+        elif 'vapor_fraction' in result:
+            q_value = get_value_from_field(result['vapor_fraction'])
+        else:
+            continue
+        q_rows.append(i)
+        q_values.append(q_value if isinstance(q_value, (int, float, np.number)) else np.nan)
+    
+    if q_rows:
+        q = np.array(q_values, dtype=float)
+        for row, phase in zip(q_rows, phases_from_vapor_fractions(q)):
+            phases[row] = phase
+    return phases
 
 def get_phase_from_result(result: Dict) -> str:
     """
@@ -696,19 +924,9 @@ def get_phase_from_result(result: Dict) -> str:
     try:
         # Try to get phase from 'phase' field
         if 'phase' in result:
-            phase_value = get_value_from_field(result['phase'])
-            if isinstance(phase_value, str):
-                phase_lower = phase_value.lower()
-                if 'liquid' in phase_lower:
-                    return 'liquid'
-                elif 'vapor' in phase_lower or 'gas' in phase_lower:
-                    return 'vapor'
-                elif 'two' in phase_lower or 'mixed' in phase_lower:
-                    return 'two-phase'
-                elif 'super' in phase_lower and 'critic' in phase_lower:
-                    return 'supercritical'
-                elif 'solid' in phase_lower:
-                    return 'solid'
+            phase = phase_from_name(get_value_from_field(result['phase']))
+            if phase is not None:
+                return phase
         
         # Try to determine from vapor fraction
         vapor_fraction_key = next((k for k in ['q', 'vapor_fraction'] if k in result), None)
@@ -724,15 +942,11 @@ def get_phase_from_result(result: Dict) -> str:
                 return 'vapor'
             elif q < -998:
                 return 'liquid'
-            elif q == 999:
-                return 'supercritical'
-            elif q == -999:
-                return 'solid'
         
         # Default to unknown
         return 'unknown'
     except Exception as e:
-        print(f"Error determining phase: {e}")
+        logger.debug(f"Error determining phase: {e}")
         return 'unknown'
 
 def find_nearest_index(array: np.ndarray, value: float) -> int:
@@ -744,9 +958,53 @@ def find_nearest_index(array: np.ndarray, value: float) -> int:
         idx = (np.abs(array - float(value))).argmin()
         return idx
     except Exception as e:
-        print(f"Error in find_nearest_index: {e}")
+        logger.debug(f"Error in find_nearest_index: {e}")
         return 0  # Return 0 as a fallback
 
+def get_grid_coordinates(result: Dict, x_name: str, y_name: str) -> Optional[Tuple[float, float]]:
+    """
+    Get the grid variable values of a result, or None if they are missing.
+    
+    Values that cannot be read as numbers are returned as NaN, which
+    find_nearest_indices maps to the first grid point.
+    """
+    if x_name not in result or y_name not in result:
+        return None
+    
+    coordinates = []
+    for name in (x_name, y_name):
+        value = get_value_from_field(result[name])
+        if value is None:
+            return None
+        try:
+            coordinates.append(float(value))
+        except (TypeError, ValueError):
+            coordinates.append(np.nan)
+    return coordinates[0], coordinates[1]
+
+def find_nearest_indices(array: np.ndarray, values: List[float]) -> np.ndarray:
+    """
+    Find the index of the closest grid value for each target value.
+    
+    Increasing grids are searched with a single np.searchsorted call; other
+    grids fall back to find_nearest_index per value. Ties go to the lower
+    index, as with argmin.
+    """
+    array = np.asarray(array, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if len(array) < 2:
+        return np.zeros(len(values), dtype=np.intp)
+    if not np.all(np.diff(array) > 0):
+        return np.array([find_nearest_index(array, value) for value in values], dtype=np.intp)
+    
+    right = np.clip(np.searchsorted(array, values), 1, len(array) - 1)
+    left = right - 1
+    indices = np.where(values - array[left] <= array[right] - values, left, right)
+    
+    # argmin over NaN or infinite distances returns the first grid point
+    indices[~np.isfinite(values)] = 0
+    return indices
+
 def parse_olga_scientific(value_str: str) -> float:
     """Parse OLGA scientific notation back to float."""
     if not value_str:
@@ -771,11 +1029,102 @@ def parse_olga_scientific(value_str: str) -> float:
         
         return sign * mantissa * (10 ** standard_exponent)
     except Exception as e:
-        print(f"Error parsing OLGA value '{value_str}': {e}")
+        logger.debug(f"Error parsing OLGA value '{value_str}': {e}")
         return 0.0
 
 
-# In olga_formatter.py, find the format_grid_values function and update it:
+def format_olga_value(value: float) -> str:
+    """
+    Format a single value in OLGA scientific notation.
+    """
+    if abs(value) < 1e-15:
+        return ".000000E+00"
+    
+    # Get standard scientific notation
+    sci_notation = f"{abs(value):.6E}"
+    
+    # Extract mantissa and exponent parts
+    mantissa_str, exponent_str = sci_notation.split('E')
+    
+    # OLGA requires the decimal point at start and exponent adjusted by +1
+    mantissa_digits = mantissa_str.replace('.', '')
+    olga_exponent = int(exponent_str) + 1
+    
+    prefix = "-." if value < 0 else "."
+    return f"{prefix}{mantissa_digits}E{olga_exponent:+03d}"
+
+
+def format_grid_values_per_value(values: np.ndarray, values_per_line: int = 5, indent_spaces: int = 5) -> str:
+    """
+    Format grid values one at a time with format_olga_value.
+    """
+    olga_values = [format_olga_value(value) for value in np.asarray(values, dtype=float).flatten().tolist()]
+    return "".join(
+        " " * indent_spaces + "    ".join(olga_values[i:i + values_per_line]) + "\n"
+        for i in range(0, len(olga_values), values_per_line)
+    )
+
+
+# Exact powers of ten for scaling mantissas (10**22 is the largest exact double)
+_POWERS_OF_TEN = np.array([float(10 ** k) for k in range(23)])
+
+# Place value of each of the 7 mantissa digits
+_MANTISSA_PLACES = 10 ** np.arange(6, -1, -1, dtype=np.int64)
+
+# Byte layout of one formatted value in format_grid_bytes: 4 separator
+# bytes, then sign, '.', 7 mantissa digits, 'E', exponent sign, 2 digits.
+# Unused positions hold a zero byte and are dropped from the output.
+_SEPARATOR_WIDTH = 4
+_VALUE_WIDTH = 13
+_CELL_WIDTH = _SEPARATOR_WIDTH + _VALUE_WIDTH
+
+
+def scientific_digits(abs_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split positive finite values into 7-digit mantissas and decimal exponents.
+    
+    The result matches the '%.6E' format: value ~ mantissa * 10**(exponent - 6),
+    rounded to nearest. Mantissas are computed with one exactly rounded
+    scaling by a power of ten; values whose scaled mantissa lies too close to
+    a rounding tie, or whose scaling factor is not exact, are formatted with
+    '%.6E' instead.
+    
+    Args:
+        abs_values: Positive finite values
+        
+    Returns:
+        Tuple of (mantissa, exponent) int64 arrays
+    """
+    def scale(exponent):
+        shift = 6 - exponent
+        power = _POWERS_OF_TEN[np.minimum(np.abs(shift), 22)]
+        with np.errstate(over='ignore'):
+            scaled = np.where(shift >= 0, abs_values * power, abs_values / power)
+        return scaled, np.abs(shift) <= 22
+    
+    # Correct log10 rounding near powers of ten, then scale once more
+    exponent = np.floor(np.log10(abs_values)).astype(np.int64)
+    scaled, _ = scale(exponent)
+    exponent += (scaled >= 1e7).astype(np.int64) - (scaled < 1e6)
+    scaled, exact = scale(exponent)
+    
+    # The scaling error is below 1e-9; leave near-ties to the formatter
+    fraction = scaled - np.floor(scaled)
+    inexact = ~exact | (scaled < 1e6) | (scaled >= 1e7) | (np.abs(fraction - 0.5) < 1e-6)
+    scaled[inexact] = 1e6
+    
+    mantissa = np.floor(scaled + 0.5).astype(np.int64)
+    carry = mantissa >= 10_000_000
+    mantissa[carry] //= 10
+    exponent[carry] += 1
+    
+    for row in np.flatnonzero(inexact).tolist():
+        digits, exponent_str = ("%.6E" % abs_values[row]).split('E')
+        mantissa[row] = int(digits.replace('.', ''))
+        exponent[row] = int(exponent_str)
+    
+    return mantissa, exponent
+
 
 def format_grid_values(values: np.ndarray, values_per_line: int = 5, indent_spaces: int = 5) -> str:
     """
@@ -784,44 +1133,63 @@ def format_grid_values(values: np.ndarray, values_per_line: int = 5, indent_spac
     OLGA uses a non-standard scientific notation where:
     - Standard: 1.23456E+02 (for 123.456)
     - OLGA:     .123456E+03 (exponent is incremented by 1)
+    
+    See format_grid_bytes, which produces the same text as ASCII bytes.
+    """
+    return format_grid_bytes(values, values_per_line, indent_spaces).decode('ascii')
+
+
+def format_grid_bytes(values: np.ndarray, values_per_line: int = 5, indent_spaces: int = 5) -> bytes:
+    """
+    Format grid values for OLGA TAB format as ASCII bytes.
+    
+    Mantissa digits and exponents are computed with NumPy (see
+    scientific_digits) and written into OLGA notation as a byte array.
+    Values with three-digit OLGA exponents fall back to format_olga_value.
     """
     try:
-        formatted = ""
-        values_array = np.asarray(values).flatten()
+        values_array = np.asarray(values, dtype=float).ravel()
+        n = len(values_array)
+        if n == 0:
+            return b""
         
-        for i in range(0, len(values_array), values_per_line):
-            line_values = values_array[i:i + values_per_line]
-            line_strings = []
-            
-            for value in line_values:
-                if abs(value) < 1e-15:
-                    line_strings.append(".000000E+00")
-                    continue
-                
-                # Get standard scientific notation
-                is_negative = value < 0
-                abs_value = abs(value)
-                sci_notation = f"{abs_value:.6E}"
-                
-                # Extract mantissa and exponent parts
-                mantissa_str, exponent_str = sci_notation.split('E')
-                exponent = int(exponent_str)
-                
-                # OLGA requires the decimal point at start and exponent adjusted by +1
-                # This is the OLGA standard format requirement
-                mantissa_digits = mantissa_str.replace('.', '')
-                olga_exponent = exponent + 1  # Increment for OLGA format
-                exponent_str = f"{olga_exponent:+03d}"
-                
-                # Format with sign if negative
-                prefix = "-." if is_negative else "."
-                olga_formatted = f"{prefix}{mantissa_digits}E{exponent_str}"
-                
-                line_strings.append(olga_formatted)
-            
-            formatted += " " * indent_spaces + "    ".join(line_strings) + "\n"
+        abs_values = np.abs(values_array)
+        if not np.isfinite(abs_values).all():
+            return format_grid_values_per_value(values_array, values_per_line, indent_spaces).encode('ascii')
+        
+        zero = abs_values < 1e-15
+        mantissa, exponent = scientific_digits(np.where(zero, 1.0, abs_values))
+        
+        # OLGA requires the decimal point at start and exponent adjusted by +1
+        exponent += 1
+        exponent[zero] = 0
+        if np.abs(exponent).max() > 99:
+            return format_grid_values_per_value(values_array, values_per_line, indent_spaces).encode('ascii')
+        
+        # Pad to whole lines; padding cells stay empty
+        n_lines = -(-n // values_per_line)
+        cells = np.zeros((n_lines * values_per_line, _CELL_WIDTH), dtype=np.uint8)
+        cells[:, :_SEPARATOR_WIDTH] = ord(' ')
+        cells[::values_per_line, :_SEPARATOR_WIDTH] = 0
+        cells[n:, :] = 0
+        
+        value_cells = cells[:n, _SEPARATOR_WIDTH:]
+        value_cells[:, 0] = np.where(values_array < 0, ord('-'), 0)
+        value_cells[:, 1] = ord('.')
+        value_cells[:, 2:9] = mantissa[:, None] // _MANTISSA_PLACES % 10 + 48
+        value_cells[:, 9] = ord('E')
+        value_cells[:, 10] = np.where(exponent < 0, ord('-'), ord('+'))
+        value_cells[:, 11] = np.abs(exponent) // 10 + 48
+        value_cells[:, 12] = np.abs(exponent) % 10 + 48
+        
+        value_cells[zero] = np.frombuffer(b"\0.000000\0E+00", dtype=np.uint8)
+        
+        lines = np.zeros((n_lines, indent_spaces + values_per_line * _CELL_WIDTH + 1), dtype=np.uint8)
+        lines[:, :indent_spaces] = ord(' ')
+        lines[:, indent_spaces:-1] = cells.reshape(n_lines, -1)
+        lines[:, -1] = ord('\n')
         
-        return formatted
+        return lines[lines != 0].tobytes()
     except Exception as e:
-        print(f"Error formatting grid values: {e}")
-        return " " * indent_spaces + ".000000E+00\n"
\ No newline at end of file
+        logger.debug(f"Error formatting grid values: {e}")
+        return b" " * indent_spaces + b".000000E+00\n"
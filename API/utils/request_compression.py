@@ -0,0 +1,44 @@
+"""
+WSGI middleware for gzip-compressed request bodies.
+
+Clients may send large JSON payloads with 'Content-Encoding: gzip'. The body
+is decompressed before Flask sees the request, so endpoints keep reading it
+with request.get_json().
+"""
+
+import io
+import logging
+import zlib
+from typing import Any, Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the size of a decompressed request body
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """Decompress request bodies sent with 'Content-Encoding: gzip'."""
+
+    def __init__(self, app: Callable[..., Iterable[bytes]]):
+        self.app = app
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if environ.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip':
+            try:
+                length = int(environ.get('CONTENT_LENGTH') or 0)
+                compressed = environ['wsgi.input'].read(length)
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                body = decompressor.decompress(compressed, MAX_DECOMPRESSED_SIZE)
+                if decompressor.unconsumed_tail:
+                    raise ValueError(f"Decompressed body exceeds {MAX_DECOMPRESSED_SIZE} bytes")
+            except (ValueError, zlib.error) as e:
+                logger.warning(f"Rejected gzip request body: {e}")
+                start_response('400 Bad Request', [('Content-Type', 'text/plain')])
+                return [b'Invalid gzip request body']
+
+            environ['wsgi.input'] = io.BytesIO(body)
+            environ['CONTENT_LENGTH'] = str(len(body))
+            del environ['HTTP_CONTENT_ENCODING']
+
+        return self.app(environ, start_response)
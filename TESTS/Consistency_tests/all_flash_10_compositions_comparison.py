@@ -1,12 +1,522 @@
+import gzip
+import io
+import json
+import sys
+import time
+from collections import namedtuple
+from functools import lru_cache
+from itertools import product
 import requests
+import requests.adapters
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import time
 from tabulate import tabulate
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 # API base URL - adjust if your API is hosted elsewhere
 BASE_URL = "http://localhost:5051"
 
+# Flash requests in flight at once. The API serves every request thread
+# from one REFPROP instance without a lock, so concurrent requests can
+# compute with another request's fluids loaded; only raise this against a
+# server that serializes REFPROP calls. Each request in flight keeps its
+# own pooled HTTP/1.1 connection.
+MAX_CONCURRENT_REQUESTS = 1
+
+# Request bodies above this size (bytes) are sent gzip-compressed
+GZIP_MIN_SIZE = 256
+
+# Properties requested from each flash endpoint
+PT_FLASH_PROPERTIES = (
+    "density",
+    "enthalpy",
+    "internal_energy",
+    "entropy",
+    "Cv",
+    "Cp",
+    "sound_speed",
+    "compressibility_factor",
+    "phase",
+    "vapor_fraction",
+    "viscosity",
+    "thermal_conductivity"
+)
+
+PH_FLASH_PROPERTIES = (
+    "temperature",
+    "density",
+    "internal_energy",
+    "entropy",
+    "Cv",
+    "Cp",
+    "sound_speed",
+    "compressibility_factor",
+    "phase",
+    "vapor_fraction",
+    "viscosity",
+    "thermal_conductivity"
+)
+
+TS_FLASH_PROPERTIES = (
+    "pressure",
+    "density",
+    "internal_energy",
+    "enthalpy",
+    "Cv",
+    "Cp",
+    "sound_speed",
+    "compressibility_factor",
+    "phase",
+    "vapor_fraction",
+    "viscosity",
+    "thermal_conductivity"
+)
+
+# Calculation settings sent to each flash endpoint
+FLASH_CALCULATIONS = {
+    "pt_flash": {"properties": PT_FLASH_PROPERTIES, "units_system": "SI"},
+    "ph_flash": {"properties": PH_FLASH_PROPERTIES, "units_system": "SI"},
+    "ts_flash": {"properties": TS_FLASH_PROPERTIES, "units_system": "SI"}
+}
+
+def parse_json_response(response):
+    """
+    Parse the JSON body of an API response, using orjson when it is installed.
+    
+    Bodies that orjson rejects (such as NaN literals) are parsed with the
+    standard library instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(response.content)
+
+# Properties compared in addition to the flash variables
+COMPARED_PROPERTIES = (
+    "internal_energy",
+    "Cv",
+    "Cp",
+    "sound_speed",
+    "compressibility_factor",
+    "viscosity",
+    "thermal_conductivity"
+)
+
+# Properties compared between PT-flash and the PH-flash or TS-flash results
+PropertySpec = namedtuple(
+    "PropertySpec", "name short original_key calculated_key abs_scale use_kelvin"
+)
+
+PT_PH_PROPERTIES = (
+    PropertySpec("temperature", "T", "original_temperature", "temperature", 1.0, True),
+    PropertySpec("density", "D", "original_density", "density", 1.0, False),
+    PropertySpec("entropy", "S", "original_entropy", "entropy", 0.001, False),
+    PropertySpec("internal_energy", "U", "original_internal_energy", "internal_energy", 0.001, False),
+    PropertySpec("Cv", "Cv", "original_Cv", "Cv", 0.001, False),
+    PropertySpec("Cp", "Cp", "original_Cp", "Cp", 0.001, False),
+    PropertySpec("sound_speed", "W", "original_sound_speed", "sound_speed", 0.1, False),
+    PropertySpec("compressibility_factor", "Z", "original_compressibility_factor", "compressibility_factor", 0.001, False),
+    PropertySpec("viscosity", "Visc", "original_viscosity", "viscosity", 0.01, False),
+    PropertySpec("thermal_conductivity", "TC", "original_thermal_conductivity", "thermal_conductivity", 0.001, False)
+)
+
+PT_TS_PROPERTIES = (
+    PropertySpec("pressure", "P", "original_pressure", "pressure", 1.0, False),
+    PropertySpec("density", "D", "original_density", "density", 1.0, False),
+    PropertySpec("enthalpy", "H", "original_enthalpy", "enthalpy", 0.001, False),
+    PropertySpec("internal_energy", "U", "original_internal_energy", "internal_energy", 0.001, False),
+    PropertySpec("Cv", "Cv", "original_Cv", "Cv", 0.001, False),
+    PropertySpec("Cp", "Cp", "original_Cp", "Cp", 0.001, False),
+    PropertySpec("sound_speed", "W", "original_sound_speed", "sound_speed", 0.1, False),
+    PropertySpec("compressibility_factor", "Z", "original_compressibility_factor", "compressibility_factor", 0.001, False),
+    PropertySpec("viscosity", "Visc", "original_viscosity", "viscosity", 0.01, False),
+    PropertySpec("thermal_conductivity", "TC", "original_thermal_conductivity", "thermal_conductivity", 0.001, False)
+)
+
+# Verdict codes of a single flash comparison
+VERDICT_PASSED, VERDICT_PARTIALLY_PASSED, VERDICT_FAILED, VERDICT_UNABLE = range(4)
+
+OVERALL_MESSAGES = {
+    "PASSED": "All three calculation methods (PT, PH, TS) are consistently producing the same thermodynamic properties.",
+    "PARTIALLY PASSED": "The three calculation methods show moderate consistency with acceptable discrepancies.",
+    "FAILED": "Significant discrepancies exist between the different calculation methods.",
+    "INCONCLUSIVE": "Could not properly evaluate consistency across all three calculation methods."
+}
+
+# (short name, display name, unit) of the properties in the summary statistics tables
+SUMMARY_PROPERTIES_PT_PH = (
+    ("T", "Temperature", "°C"), ("D", "Density", "mol/L"), ("S", "Entropy", "J/(mol·K)"),
+    ("U", "Internal Energy", "J/mol"), ("Cv", "Cv", "J/(mol·K)"), ("Cp", "Cp", "J/(mol·K)"),
+    ("W", "Sound Speed", "m/s"), ("Z", "Compressibility", "-"),
+    ("Visc", "Viscosity", "μPa·s"), ("TC", "Thermal Conductivity", "W/(m·K)")
+)
+
+SUMMARY_PROPERTIES_PT_TS = (
+    ("P", "Pressure", "bar"), ("D", "Density", "mol/L"), ("H", "Enthalpy", "J/mol"),
+    ("U", "Internal Energy", "J/mol"), ("Cv", "Cv", "J/(mol·K)"), ("Cp", "Cp", "J/(mol·K)"),
+    ("W", "Sound Speed", "m/s"), ("Z", "Compressibility", "-"),
+    ("Visc", "Viscosity", "μPa·s"), ("TC", "Thermal Conductivity", "W/(m·K)")
+)
+
+SUMMARY_HEADERS = ("Property", "Unit", "Mean Abs Diff", "Max Abs Diff", "Mean Rel Diff", "Max Rel Diff")
+
+# (column, header) pairs of the detailed comparison tables
+DETAIL_COLUMNS_PT_PH = (
+    ("pressure", "P (bar)"), ("original_T", "Original T (°C)"), ("calculated_T", "Calc T (°C)"),
+    ("T_diff_abs", "T diff"), ("T_diff_rel", "T diff %"),
+    ("original_D", "Original D (mol/L)"), ("calculated_D", "Calc D (mol/L)"),
+    ("D_diff_abs", "D diff"), ("D_diff_rel", "D diff %"), ("phase", "Phase")
+)
+
+DETAIL_COLUMNS_PT_TS = (
+    ("temperature", "T (°C)"), ("original_P", "Original P (bar)"), ("calculated_P", "Calc P (bar)"),
+    ("P_diff_abs", "P diff"), ("P_diff_rel", "P diff %"),
+    ("original_D", "Original D (mol/L)"), ("calculated_D", "Calc D (mol/L)"),
+    ("D_diff_abs", "D diff"), ("D_diff_rel", "D diff %"), ("phase", "Phase")
+)
+
+# (comparison, property) pairs shown in the composition test summary
+KEY_METRICS = (("PT-PH", "T"), ("PT-PH", "D"), ("PT-TS", "P"), ("PT-TS", "D"))
+
+def result_dtype(fields):
+    """
+    Build the record dtype of PT-flash, PH-flash or TS-flash results.
+    
+    Args:
+        fields: Names of the basic result fields
+    
+    Returns:
+        Structured dtype with the basic fields followed by the compared
+        properties
+    """
+    return np.dtype(
+        [(name, "U32" if name == "phase" else "f8") for name in fields]
+        + [(prop, "f8") for prop in COMPARED_PROPERTIES]
+    )
+
+PT_RESULT_DTYPE = result_dtype((
+    "pressure", "temperature", "density", "enthalpy", "entropy", "phase", "vapor_fraction"
+))
+
+# PH and TS records only hold calculated values; their inputs and the
+# original values are in the PT-flash record of the same row
+PH_RESULT_DTYPE = result_dtype(("temperature", "density", "entropy", "phase", "vapor_fraction"))
+
+TS_RESULT_DTYPE = result_dtype(("pressure", "density", "enthalpy", "phase", "vapor_fraction"))
+
+def empty_results(dtype, size):
+    """Allocate result records with NaN values and empty phases."""
+    records = np.empty(size, dtype=dtype)
+    for name in dtype.names:
+        records[name] = "" if name == "phase" else np.nan
+    return records
+
+def post_flash(session, endpoint, payload, timeout, max_retries=3):
+    """
+    Send a flash request and return the parsed response.
+    
+    Request bodies larger than GZIP_MIN_SIZE bytes are gzip-compressed. The
+    request is only delayed when the API signals that it is overloaded
+    (HTTP 429 or 503); it is then retried after the Retry-After delay.
+    
+    Args:
+        session: requests session used for the API call
+        endpoint: Flash endpoint name, e.g. "pt_flash"
+        payload: Request payload
+        timeout: Request timeout in seconds
+        max_retries: Number of retries for overloaded responses
+    
+    Returns:
+        Parsed JSON response
+    """
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if len(body) > GZIP_MIN_SIZE:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    
+    for attempt in range(max_retries + 1):
+        response = session.post(f"{BASE_URL}/{endpoint}", data=body, headers=headers, timeout=timeout)
+        if response.status_code in (429, 503) and attempt < max_retries:
+            time.sleep(float(response.headers.get("Retry-After", 1)))
+            continue
+        response.raise_for_status()
+        return parse_json_response(response)
+
+def create_session():
+    """
+    Create the requests session shared by all API calls.
+    
+    Returns:
+        Session with a connection pool sized for MAX_CONCURRENT_REQUESTS
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+    session.mount("http://", adapter)
+    return session
+
+# One session for all API calls of the run, so connections to the API are
+# reused; it is kept out of the flash_point cache key
+SESSION = create_session()
+
+@lru_cache(maxsize=4096)
+def flash_point(endpoint, composition_key, first, second):
+    """
+    Calculate a single flash point, caching the result per unique input.
+    
+    Args:
+        endpoint: Flash endpoint name, e.g. "ph_flash"
+        composition_key: Tuple of (fluid, fraction) pairs
+        first: (variable name, value) of the first flash variable
+        second: (variable name, value) of the second flash variable
+    
+    Returns:
+        Result dictionary of the calculated point
+    """
+    payload = {
+        "composition": [{"fluid": fluid, "fraction": fraction} for fluid, fraction in composition_key],
+        "variables": {
+            name: {"range": {"from": value, "to": value}, "resolution": 1}
+            for name, value in (first, second)
+        },
+        "calculation": FLASH_CALCULATIONS[endpoint]
+    }
+    return post_flash(SESSION, endpoint, payload, timeout=30)["results"][0]
+
+def compare_flash_results(results, originals, completed, basic_columns, properties_to_compare):
+    """
+    Compare recalculated flash results with the original PT-flash values.
+    
+    PH-flash or TS-flash records are paired row by row with the PT-flash
+    records they were calculated from. The differences are computed as
+    whole-array operations and the DataFrame is built once from the finished
+    columns.
+    
+    Args:
+        results: PH-flash or TS-flash result records
+        originals: PT-flash records, aligned with results
+        completed: Boolean mask of the rows whose flash succeeded
+        basic_columns: Mapping of comparison column name to paired field
+        properties_to_compare: PropertySpec tuples of the compared properties
+    
+    Returns:
+        DataFrame with original and calculated values and the absolute and
+        relative (%) difference of each property
+    """
+    # Calculated fields keep their names; PT-flash fields get an "original_" prefix
+    paired = {f"original_{name}": originals[name][completed] for name in originals.dtype.names}
+    paired.update({name: results[name][completed] for name in results.dtype.names})
+    
+    # Fields that no result provides are left out of the comparison
+    def provided(field):
+        values = paired.get(field)
+        if values is None or len(values) == 0:
+            return False
+        return values.dtype.kind == "U" or not np.isnan(values).all()
+    
+    columns = {column: paired[field] for column, field in basic_columns.items() if provided(field)}
+    
+    for prop in properties_to_compare:
+        if provided(prop.original_key) and provided(prop.calculated_key):
+            # Only rows that have both values are compared
+            both = ~np.isnan(paired[prop.original_key]) & ~np.isnan(paired[prop.calculated_key])
+            original = np.where(both, paired[prop.original_key], np.nan)
+            calculated = np.where(both, paired[prop.calculated_key], np.nan)
+            short = prop.short
+            
+            columns[f"original_{short}"] = original
+            columns[f"calculated_{short}"] = calculated
+            
+            # Absolute difference (scaled for better readability)
+            diff_abs = (calculated - original) * prop.abs_scale
+            columns[f"{short}_diff_abs"] = diff_abs
+            
+            # Relative difference; temperatures are compared in Kelvin
+            reference = original + 273.15 if prop.use_kelvin else original
+            with np.errstate(divide="ignore", invalid="ignore"):
+                columns[f"{short}_diff_rel"] = np.where(
+                    reference != 0, diff_abs / (reference * prop.abs_scale) * 100, np.nan
+                )
+    
+    # The columns are freshly built arrays, so the DataFrame takes them over
+    # instead of copying them into a consolidated block
+    return pd.DataFrame(columns, copy=False)
+
+def round_comparison(df):
+    """
+    Round a comparison DataFrame in place for display.
+    
+    Differences are rounded to 6 decimals and original/calculated values to
+    4 decimals, one call per group of columns.
+    """
+    diff_columns = [col for col in df.columns if col.endswith('_diff_abs') or col.endswith('_diff_rel')]
+    value_columns = [col for col in df.columns if col.startswith('original_') or col.startswith('calculated_')]
+    if diff_columns:
+        df[diff_columns] = df[diff_columns].round(6)
+    if value_columns:
+        df[value_columns] = df[value_columns].round(4)
+
+def abs_differences(df):
+    """
+    Take the magnitude of every difference column of a comparison DataFrame.
+    
+    The summary statistics and consistency scores only use the size of the
+    differences, so the absolute values are computed once and shared. The
+    signed differences stay in the comparison DataFrame for the detail tables.
+    
+    Args:
+        df: Comparison DataFrame from compare_flash_results
+    
+    Returns:
+        DataFrame with the absolute values of the *_diff_abs and *_diff_rel columns
+    """
+    diff_columns = [column for column in df.columns if column.endswith(("_diff_abs", "_diff_rel"))]
+    return df[diff_columns].abs()
+
+def summarize_differences(abs_diffs, shorts, names, units):
+    """
+    Summarize the absolute and relative differences of each compared property.
+    
+    The mean, maximum and count of all difference columns are computed with
+    one aggregation, and the table values are formatted per column.
+    
+    Args:
+        abs_diffs: Absolute differences from abs_differences
+        shorts: Short property names used in the column names
+        names: Display names of the properties
+        units: Display units of the properties
+    
+    Returns:
+        Tuple of (summary table rows, statistics dictionary keyed by short name)
+    """
+    compared = [short for short in shorts
+                if f"{short}_diff_abs" in abs_diffs.columns and f"{short}_diff_rel" in abs_diffs.columns]
+    if not compared:
+        return [], {}
+    
+    # One aggregation over all compared columns, split into abs and rel parts
+    abs_columns = [f"{short}_diff_abs" for short in compared]
+    rel_columns = [f"{short}_diff_rel" for short in compared]
+    reduced = abs_diffs[abs_columns + rel_columns].agg(["mean", "max", "count"])
+    abs_means, abs_maxima = reduced.loc[["mean", "max"], abs_columns].to_numpy()
+    rel_means, rel_maxima, rel_counts = reduced.loc[["mean", "max", "count"], rel_columns].to_numpy()
+    
+    # Store stats for return value
+    stats = {
+        short: {
+            'abs_mean': abs_mean,
+            'abs_max': abs_max,
+            'rel_mean': rel_mean,
+            'rel_max': rel_max,
+            'count': int(count)
+        }
+        for short, abs_mean, abs_max, rel_mean, rel_max, count
+        in zip(compared, abs_means, abs_maxima, rel_means, rel_maxima, rel_counts)
+    }
+    
+    # Format all table values at once, one array per column
+    labels = dict(zip(shorts, zip(names, units)))
+    summary_table = [
+        [*labels[short], *values]
+        for short, *values in zip(
+            compared,
+            np.char.mod("%.6f", abs_means).tolist(),
+            np.char.mod("%.6f", abs_maxima).tolist(),
+            np.char.mod("%.4f%%", rel_means).tolist(),
+            np.char.mod("%.4f%%", rel_maxima).tolist()
+        )
+    ]
+    
+    return summary_table, stats
+
+def consistency_scores(abs_diffs, shorts):
+    """
+    Score how consistently each compared property is reproduced.
+    
+    Args:
+        abs_diffs: Absolute differences from abs_differences
+        shorts: Short property names used in the column names
+    
+    Returns:
+        Dictionary keyed by short name of (good %, acceptable %) tuples, where
+        good is below 0.5% and acceptable between 0.5% and 2% difference
+    """
+    if len(abs_diffs) == 0:
+        return {}
+    
+    rel_columns = [f"{short}_diff_rel" for short in shorts if f"{short}_diff_rel" in abs_diffs.columns]
+    rel_diffs = abs_diffs[rel_columns]
+    good_percent = (rel_diffs < 0.5).sum() / len(abs_diffs) * 100
+    acceptable_percent = ((rel_diffs >= 0.5) & (rel_diffs < 2.0)).sum() / len(abs_diffs) * 100
+    
+    return {
+        short: (good_percent[f"{short}_diff_rel"], acceptable_percent[f"{short}_diff_rel"])
+        for short in shorts if f"{short}_diff_rel" in abs_diffs.columns
+    }
+
+def evaluate_comparison(scores, stats, shorts, flashes):
+    """
+    Decide whether one flash comparison passes the sanity check.
+    
+    The consistency scores of the primary properties are used when available,
+    otherwise their mean relative differences.
+    
+    Args:
+        scores: Consistency scores from consistency_scores
+        stats: Difference statistics from summarize_differences
+        shorts: Short names of the primary properties
+        flashes: Compared flashes as shown in the message, e.g. "PT-flash and PH-flash"
+    
+    Returns:
+        Tuple of (verdict code, verdict message)
+    """
+    if all(short in scores for short in shorts):
+        if all(scores[short][0] > 80 for short in shorts):
+            return VERDICT_PASSED, f"PASSED: {flashes} results are highly consistent."
+        if all(scores[short][0] + scores[short][1] > 80 for short in shorts):
+            return VERDICT_PARTIALLY_PASSED, "PARTIALLY PASSED: Some discrepancies exist but are within reasonable limits."
+        return VERDICT_FAILED, f"FAILED: Significant discrepancies between {flashes} results."
+    
+    # Fallback to simpler criteria if property scores can't be calculated
+    try:
+        rel_means = [stats[short]['rel_mean'] for short in shorts]
+    except KeyError:
+        return VERDICT_UNABLE, "UNABLE TO EVALUATE: Missing or invalid comparison data."
+    
+    if all(rel_mean < 0.5 for rel_mean in rel_means):
+        return VERDICT_PASSED, f"PASSED: {flashes} results are consistent."
+    if all(rel_mean < 2.0 for rel_mean in rel_means):
+        return VERDICT_PARTIALLY_PASSED, "PARTIALLY PASSED: Some discrepancies exist but are within reasonable limits."
+    return VERDICT_FAILED, f"FAILED: Significant discrepancies between {flashes} results."
+
+def detail_table(df, columns, rows=10):
+    """
+    Select the first rows of a comparison for a detail table.
+    
+    Columns that the comparison does not provide are skipped together with
+    their headers, and the rows are sliced before the columns are selected.
+    
+    Args:
+        df: Comparison DataFrame from compare_flash_results
+        columns: (column, header) pairs of the table
+        rows: Number of rows to show
+    
+    Returns:
+        Tuple of (table rows, headers)
+    """
+    shown = [(column, header) for column, header in columns if column in df.columns]
+    return (
+        df.head(rows)[[column for column, _ in shown]].to_numpy().tolist(),
+        [header for _, header in shown]
+    )
+
 def sanity_check_eos_with_composition(composition, description):
     """
     Comprehensive sanity check of the Span-Wagner EOS API by comparing PT-flash, PH-flash, and TS-flash results
@@ -26,20 +536,18 @@ def sanity_check_eos_with_composition(composition, description):
     # Display composition
     comp_table = [[c["fluid"], f"{c['fraction']*100:.1f}%"] for c in composition]
     print("\nTesting composition:")
-    print(tabulate(comp_table, headers=["Component", "Fraction"], tablefmt="grid"))
+    print(tabulate(comp_table, headers=["Component", "Fraction"], tablefmt="grid", disable_numparse=True))
     
     # Define test points - expanded to cover a wider range of conditions
     # Generate a grid of points from 1 to 300 bar and -50°C to 100°C
     pressures = np.linspace(1, 300, 10)  # 10 pressure points
     temperatures = np.linspace(-50, 100, 10)  # 10 temperature points
     
-    test_points = []
-    for pressure in pressures:
-        for temperature in temperatures:
-            test_points.append({
-                "pressure": round(pressure, 1),
-                "temperature": round(temperature, 1)
-            })
+    # Grid points in the order of the API's flattened result index. The grid
+    # request calculates the exact linspace values, so they are not rounded
+    # to 0.1 as the former single-point requests were; PH and TS flashes take
+    # these as inputs and must match the PT state that was calculated.
+    grid_points = list(product(pressures.tolist(), temperatures.tolist()))
     
     # Add a few specific points of interest
     additional_points = [
@@ -50,653 +558,282 @@ def sanity_check_eos_with_composition(composition, description):
         {"pressure": 250, "temperature": 80}      # Very high pressure, high temperature
     ]
     
-    test_points.extend(additional_points)
+    print(f"Testing {len(grid_points) + len(additional_points)} pressure-temperature points")
     
-    print(f"Testing {len(test_points)} pressure-temperature points")
+    # Hashable composition, the cache key of flash_point
+    composition_key = tuple((c["fluid"], c["fraction"]) for c in composition)
     
     # Part 1: PT-flash calculations
-    # Create batched PT-flash requests to optimize API calls
-    batch_size = 10  # Adjust based on API performance
-    pt_batches = [test_points[i:i + batch_size] for i in range(0, len(test_points), batch_size)]
+    # The whole pressure-temperature grid is calculated in one request; the
+    # additional points lie off the grid and are sent as single-point requests
+    def pt_flash_grid(pressure_from, pressure_to, pressure_step, temperature_from, temperature_to, temperature_step):
+        pt_payload = {
+            "composition": composition,
+            "variables": {
+                "pressure": {
+                    "range": {"from": pressure_from, "to": pressure_to},
+                    "resolution": pressure_step
+                },
+                "temperature": {
+                    "range": {"from": temperature_from, "to": temperature_to},
+                    "resolution": temperature_step
+                }
+            },
+            "calculation": FLASH_CALCULATIONS["pt_flash"]
+        }
+        return post_flash(SESSION, "pt_flash", pt_payload, timeout=300)["results"]
     
-    pt_results = []
+    # PT-flash results keyed by (pressure, temperature)
+    pt_results_by_point = {}
     print("Running PT-flash calculations...")
     
-    for batch_idx, batch in enumerate(pt_batches, 1):
-        print(f"Processing PT-flash batch {batch_idx}/{len(pt_batches)}...")
-        
-        # For each point in the batch, prepare a single PT-flash call with narrow ranges
-        for point in batch:
-            # Prepare the PT-flash request payload
-            pt_payload = {
-                "composition": composition,
-                "variables": {
-                    "pressure": {
-                        "range": {"from": point["pressure"], "to": point["pressure"]},
-                        "resolution": 1
-                    },
-                    "temperature": {
-                        "range": {"from": point["temperature"], "to": point["temperature"]},
-                        "resolution": 1
-                    }
-                },
-                "calculation": {
-                    "properties": [
-                        "density",
-                        "enthalpy",
-                        "internal_energy",
-                        "entropy",
-                        "Cv",
-                        "Cp",
-                        "sound_speed",
-                        "compressibility_factor",
-                        "phase",
-                        "vapor_fraction",
-                        "viscosity",
-                        "thermal_conductivity"
-                    ],
-                    "units_system": "SI"
-                }
-            }
-            
-            # Send the PT-flash request
-            try:
-                response = requests.post(f"{BASE_URL}/pt_flash", json=pt_payload, timeout=30)
-                response.raise_for_status()
-                
-                # Extract results
-                result = response.json()["results"][0]
-                
-                # Extract all available properties from PT-flash
-                pt_result = {
-                    "pressure": point["pressure"],
-                    "temperature": point["temperature"],
-                    "density": result["density"]["value"],
-                    "enthalpy": result["enthalpy"]["value"],
-                    "entropy": result["entropy"]["value"],
-                    "phase": result["phase"]["value"],
-                    "vapor_fraction": result["vapor_fraction"]["value"]
-                }
-                
-                # Add all additional properties that were requested
-                for prop in ["internal_energy", "Cv", "Cp", "sound_speed", 
-                            "compressibility_factor", "viscosity", "thermal_conductivity"]:
-                    if prop in result:
-                        pt_result[prop] = result[prop]["value"]
-                
-                pt_results.append(pt_result)
-                print(f"PT-flash completed for P={point['pressure']} bar, T={point['temperature']}°C, Phase={pt_result['phase']}")
-                
-            except Exception as e:
-                print(f"Error in PT-flash calculation for P={point['pressure']} bar, T={point['temperature']}°C: {str(e)}")
-                continue
-                
-        # Brief pause between batches to avoid overwhelming the API
-        if batch_idx < len(pt_batches):
-            time.sleep(0.5)
-    
-    # Pause to avoid overloading the API
-    time.sleep(1)
+    try:
+        grid_results = pt_flash_grid(
+            float(pressures[0]), float(pressures[-1]), float(pressures[1] - pressures[0]),
+            float(temperatures[0]), float(temperatures[-1]), float(temperatures[1] - temperatures[0])
+        )
+        for result in grid_results:
+            pt_results_by_point[grid_points[result["index"]]] = result
+        print(f"PT-flash completed for {len(grid_results)} grid points")
+    except Exception as e:
+        print(f"Error in PT-flash grid calculation: {str(e)}")
     
-    # Part 2: PH-flash calculations using the enthalpy from PT-flash
-    ph_results = []
-    print("\nRunning PH-flash calculations with enthalpy from PT-flash...")
+    for point in additional_points:
+        try:
+            result = flash_point("pt_flash", composition_key,
+                                 ("pressure", point["pressure"]), ("temperature", point["temperature"]))
+            pt_results_by_point[(point["pressure"], point["temperature"])] = result
+        except Exception as e:
+            print(f"Error in PT-flash calculation for P={point['pressure']} bar, T={point['temperature']}°C: {str(e)}")
     
-    # Create batches for PH-flash as well
-    ph_batches = [pt_results[i:i + batch_size] for i in range(0, len(pt_results), batch_size)]
+    # Per-point messages are collected and printed once per phase
+    pt_log = []
+    pt_records = empty_results(PT_RESULT_DTYPE, len(pt_results_by_point))
+    pt_completed = np.zeros(len(pt_records), dtype=bool)
+    for row, ((pressure, temperature), result) in enumerate(pt_results_by_point.items()):
+        try:
+            # Extract all available properties from PT-flash
+            record = pt_records[row]
+            record["pressure"] = pressure
+            record["temperature"] = temperature
+            record["density"] = result["density"]["value"]
+            record["enthalpy"] = result["enthalpy"]["value"]
+            record["entropy"] = result["entropy"]["value"]
+            record["phase"] = result["phase"]["value"]
+            record["vapor_fraction"] = result["vapor_fraction"]["value"]
+    
+            # Add all additional properties that were requested
+            for prop in COMPARED_PROPERTIES:
+                if prop in result:
+                    record[prop] = result[prop]["value"]
+    
+            pt_completed[row] = True
+            pt_log.append(f"PT-flash completed for P={pressure:.1f} bar, T={temperature:.1f}°C, Phase={record['phase']}")
     
-    for batch_idx, batch in enumerate(ph_batches, 1):
-        print(f"Processing PH-flash batch {batch_idx}/{len(ph_batches)}...")
-        
-        for pt_result in batch:
-            # Prepare the PH-flash request payload
-            ph_payload = {
-                "composition": composition,
-                "variables": {
-                    "pressure": {
-                        "range": {"from": pt_result["pressure"], "to": pt_result["pressure"]},
-                        "resolution": 1
-                    },
-                    "enthalpy": {
-                        "range": {"from": pt_result["enthalpy"], "to": pt_result["enthalpy"]},
-                        "resolution": 1
-                    }
-                },
-                "calculation": {
-                    "properties": [
-                        "temperature",
-                        "density",
-                        "internal_energy",
-                        "entropy",
-                        "Cv",
-                        "Cp",
-                        "sound_speed",
-                        "compressibility_factor",
-                        "phase",
-                        "vapor_fraction",
-                        "viscosity",
-                        "thermal_conductivity"
-                    ],
-                    "units_system": "SI"
-                }
-            }
-            
-            # Send the PH-flash request
-            try:
-                response = requests.post(f"{BASE_URL}/ph_flash", json=ph_payload, timeout=30)
-                response.raise_for_status()
-                
-                # Extract results
-                result = response.json()["results"][0]
-                
-                # Initialize with basic properties
-                ph_result = {
-                    "pressure": pt_result["pressure"],
-                    "enthalpy": pt_result["enthalpy"],
-                    "temperature": result["temperature"]["value"],
-                    "density": result["density"]["value"],
-                    "entropy": result["entropy"]["value"],
-                    "phase": result["phase"]["value"],
-                    "vapor_fraction": result["vapor_fraction"]["value"],
-                    "original_temperature": pt_result["temperature"],
-                    "original_density": pt_result["density"],
-                    "original_entropy": pt_result["entropy"]
-                }
-                
-                # Add all additional properties for comparison
-                for prop in ["internal_energy", "Cv", "Cp", "sound_speed", 
-                            "compressibility_factor", "viscosity", "thermal_conductivity"]:
-                    if prop in result and prop in pt_result:
-                        ph_result[prop] = result[prop]["value"]
-                        ph_result[f"original_{prop}"] = pt_result[prop]
-                
-                ph_results.append(ph_result)
-                print(f"PH-flash completed for P={pt_result['pressure']} bar, H={pt_result['enthalpy']:.2f} J/mol")
-                
-            except Exception as e:
-                print(f"Error in PH-flash calculation for P={pt_result['pressure']} bar, H={pt_result['enthalpy']:.2f} J/mol: {str(e)}")
-                continue
-        
-        # Brief pause between batches
-        if batch_idx < len(ph_batches):
-            time.sleep(0.5)
+        except Exception as e:
+            pt_log.append(f"Error in PT-flash result for P={pressure:.1f} bar, T={temperature:.1f}°C: {str(e)}")
+            continue
+    pt_results = pt_records[pt_completed]
+    print("\n".join(pt_log))
+    
+    # Part 2: PH-flash calculations using the enthalpy from PT-flash
+    # Results are written into preallocated records, one row per PT-flash result
+    ph_records = empty_results(PH_RESULT_DTYPE, len(pt_results))
+    ph_log = [""] * len(pt_results)
     
-    # Pause to avoid overloading the API
-    time.sleep(1)
+    def ph_flash(row, pt_result):
+        try:
+            # Send the PH-flash request (repeated inputs are served from the cache)
+            result = flash_point("ph_flash", composition_key,
+                                 ("pressure", float(pt_result["pressure"])), ("enthalpy", float(pt_result["enthalpy"])))
+    
+            # Store the calculated properties; the inputs and original
+            # values are taken from the PT-flash record of the same row
+            record = ph_records[row]
+            record["temperature"] = result["temperature"]["value"]
+            record["density"] = result["density"]["value"]
+            record["entropy"] = result["entropy"]["value"]
+            record["phase"] = result["phase"]["value"]
+            record["vapor_fraction"] = result["vapor_fraction"]["value"]
+    
+            # Add all additional properties for comparison
+            for prop in COMPARED_PROPERTIES:
+                if prop in result:
+                    record[prop] = result[prop]["value"]
+    
+            ph_log[row] = f"PH-flash completed for P={pt_result['pressure']:.1f} bar, H={pt_result['enthalpy']:.2f} J/mol"
+            return True
+    
+        except Exception as e:
+            ph_log[row] = f"Error in PH-flash calculation for P={pt_result['pressure']:.1f} bar, H={pt_result['enthalpy']:.2f} J/mol: {str(e)}"
+            return False
     
     # Part 3: TS-flash calculations using the entropy from PT-flash
-    ts_results = []
-    print("\nRunning TS-flash calculations with entropy from PT-flash...")
+    ts_records = empty_results(TS_RESULT_DTYPE, len(pt_results))
+    ts_log = [""] * len(pt_results)
     
-    # Create batches for TS-flash as well
-    ts_batches = [pt_results[i:i + batch_size] for i in range(0, len(pt_results), batch_size)]
+    def ts_flash(row, pt_result):
+        try:
+            # Send the TS-flash request (repeated inputs are served from the cache)
+            result = flash_point("ts_flash", composition_key,
+                                 ("temperature", float(pt_result["temperature"])), ("entropy", float(pt_result["entropy"])))
+    
+            # Store the calculated properties; the inputs and original
+            # values are taken from the PT-flash record of the same row
+            record = ts_records[row]
+            record["pressure"] = result["pressure"]["value"]
+            record["density"] = result["density"]["value"]
+            record["enthalpy"] = result["enthalpy"]["value"]
+            record["phase"] = result["phase"]["value"]
+            record["vapor_fraction"] = result["vapor_fraction"]["value"]
+    
+            # Add all additional properties for comparison
+            for prop in COMPARED_PROPERTIES:
+                if prop in result:
+                    record[prop] = result[prop]["value"]
+    
+            ts_log[row] = f"TS-flash completed for T={pt_result['temperature']:.1f}°C, S={pt_result['entropy']:.2f} J/(mol·K)"
+            return True
     
-    for batch_idx, batch in enumerate(ts_batches, 1):
-        print(f"Processing TS-flash batch {batch_idx}/{len(ts_batches)}...")
-        
-        for pt_result in batch:
-            # Prepare the TS-flash request payload
-            ts_payload = {
-                "composition": composition,
-                "variables": {
-                    "temperature": {
-                        "range": {"from": pt_result["temperature"], "to": pt_result["temperature"]},
-                        "resolution": 1
-                    },
-                    "entropy": {
-                        "range": {"from": pt_result["entropy"], "to": pt_result["entropy"]},
-                        "resolution": 1
-                    }
-                },
-                "calculation": {
-                    "properties": [
-                        "pressure",
-                        "density",
-                        "internal_energy",
-                        "enthalpy",
-                        "Cv",
-                        "Cp",
-                        "sound_speed",
-                        "compressibility_factor",
-                        "phase",
-                        "vapor_fraction",
-                        "viscosity",
-                        "thermal_conductivity"
-                    ],
-                    "units_system": "SI"
-                }
-            }
-            
-            # Send the TS-flash request
-            try:
-                response = requests.post(f"{BASE_URL}/ts_flash", json=ts_payload, timeout=30)
-                response.raise_for_status()
-                
-                # Extract results
-                result = response.json()["results"][0]
-                
-                # Initialize with basic properties
-                ts_result = {
-                    "temperature": pt_result["temperature"],
-                    "entropy": pt_result["entropy"],
-                    "pressure": result["pressure"]["value"],
-                    "density": result["density"]["value"],
-                    "enthalpy": result["enthalpy"]["value"],
-                    "phase": result["phase"]["value"],
-                    "vapor_fraction": result["vapor_fraction"]["value"],
-                    "original_pressure": pt_result["pressure"],
-                    "original_density": pt_result["density"],
-                    "original_enthalpy": pt_result["enthalpy"]
-                }
-                
-                # Add all additional properties for comparison
-                for prop in ["internal_energy", "Cv", "Cp", "sound_speed", 
-                            "compressibility_factor", "viscosity", "thermal_conductivity"]:
-                    if prop in result and prop in pt_result:
-                        ts_result[prop] = result[prop]["value"]
-                        ts_result[f"original_{prop}"] = pt_result[prop]
-                
-                ts_results.append(ts_result)
-                print(f"TS-flash completed for T={pt_result['temperature']}°C, S={pt_result['entropy']:.2f} J/(mol·K)")
-                
-            except Exception as e:
-                print(f"Error in TS-flash calculation for T={pt_result['temperature']}°C, S={pt_result['entropy']:.2f} J/(mol·K): {str(e)}")
-                continue
-        
-        # Brief pause between batches
-        if batch_idx < len(ts_batches):
-            time.sleep(0.5)
+        except Exception as e:
+            ts_log[row] = f"Error in TS-flash calculation for T={pt_result['temperature']:.1f}°C, S={pt_result['entropy']:.2f} J/(mol·K): {str(e)}"
+            return False
+    
+    # PH and TS flashes only depend on the PT-flash results, so points are
+    # sent up to MAX_CONCURRENT_REQUESTS at a time over the shared session
+    print("\nRunning PH-flash and TS-flash calculations with enthalpy and entropy from PT-flash...")
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        ph_futures = [executor.submit(ph_flash, row, pt_result) for row, pt_result in enumerate(pt_results)]
+        ts_futures = [executor.submit(ts_flash, row, pt_result) for row, pt_result in enumerate(pt_results)]
+        ph_completed = np.array([future.result() for future in ph_futures], dtype=bool)
+        ts_completed = np.array([future.result() for future in ts_futures], dtype=bool)
+    print("\n".join(ph_log))
+    print("\n".join(ts_log))
+    
+    # The comparison report is collected in memory and written out once
+    report = io.StringIO()
     
     # Part 4: Compare results and calculate differences
-    print("\nComparing PT-flash, PH-flash, and TS-flash results:")
-    print("=" * 80)
+    print("\nComparing PT-flash, PH-flash, and TS-flash results:", file=report)
+    print("=" * 80, file=report)
     
     # 4.1: First comparison - PT vs PH
-    print("\nComparison 1: PT-flash vs PH-flash")
-    pt_ph_comparison_results = []
-    
-    for ph_result in ph_results:
-        # Initialize comparison dictionary with basic properties
-        comparison = {
-            "pressure": ph_result["pressure"],
-            "original_T": ph_result["original_temperature"],
-            "calculated_T": ph_result["temperature"],
-            "phase": ph_result["phase"],
-            "vapor_fraction": ph_result["vapor_fraction"]
-        }
-        
-        # Process each property with proper error handling
-        properties_to_compare = [
-            {"name": "temperature", "short": "T", "original_key": "original_temperature", "calculated_key": "temperature", "abs_scale": 1.0, "use_kelvin": True},
-            {"name": "density", "short": "D", "original_key": "original_density", "calculated_key": "density", "abs_scale": 1.0, "use_kelvin": False},
-            {"name": "entropy", "short": "S", "original_key": "original_entropy", "calculated_key": "entropy", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "internal_energy", "short": "U", "original_key": "original_internal_energy", "calculated_key": "internal_energy", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "Cv", "short": "Cv", "original_key": "original_Cv", "calculated_key": "Cv", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "Cp", "short": "Cp", "original_key": "original_Cp", "calculated_key": "Cp", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "sound_speed", "short": "W", "original_key": "original_sound_speed", "calculated_key": "sound_speed", "abs_scale": 0.1, "use_kelvin": False},
-            {"name": "compressibility_factor", "short": "Z", "original_key": "original_compressibility_factor", "calculated_key": "compressibility_factor", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "viscosity", "short": "Visc", "original_key": "original_viscosity", "calculated_key": "viscosity", "abs_scale": 0.01, "use_kelvin": False},
-            {"name": "thermal_conductivity", "short": "TC", "original_key": "original_thermal_conductivity", "calculated_key": "thermal_conductivity", "abs_scale": 0.001, "use_kelvin": False}
-        ]
-        
-        # Calculate differences for each property
-        for prop in properties_to_compare:
-            if prop["original_key"] in ph_result and prop["calculated_key"] in ph_result:
-                original_val = ph_result[prop["original_key"]]
-                calculated_val = ph_result[prop["calculated_key"]]
-                
-                # Store original and calculated values
-                comparison[f"original_{prop['short']}"] = original_val
-                comparison[f"calculated_{prop['short']}"] = calculated_val
-                
-                # Calculate absolute difference (scaled for better readability)
-                diff_abs = (calculated_val - original_val) * prop["abs_scale"]
-                comparison[f"{prop['short']}_diff_abs"] = diff_abs
-                
-                # Calculate relative difference (special handling for temperature)
-                if prop["use_kelvin"]:
-                    # For temperature, convert to Kelvin for relative comparison
-                    diff_rel = diff_abs / ((original_val + 273.15) * prop["abs_scale"]) * 100
-                else:
-                    # Prevent division by zero
-                    if original_val != 0:
-                        diff_rel = diff_abs / (original_val * prop["abs_scale"]) * 100
-                    else:
-                        diff_rel = np.nan
-                        
-                comparison[f"{prop['short']}_diff_rel"] = diff_rel
-        
-        pt_ph_comparison_results.append(comparison)
+    print("\nComparison 1: PT-flash vs PH-flash", file=report)
+    df_pt_ph = compare_flash_results(
+        ph_records, pt_results, ph_completed,
+        {"pressure": "original_pressure", "original_T": "original_temperature", "calculated_T": "temperature",
+         "phase": "phase", "vapor_fraction": "vapor_fraction"},
+        PT_PH_PROPERTIES
+    )
     
     # 4.2: Second comparison - PT vs TS
-    print("\nComparison 2: PT-flash vs TS-flash")
-    pt_ts_comparison_results = []
-    
-    for ts_result in ts_results:
-        # Initialize comparison dictionary with basic properties
-        comparison = {
-            "temperature": ts_result["temperature"],
-            "original_P": ts_result["original_pressure"],
-            "calculated_P": ts_result["pressure"],
-            "phase": ts_result["phase"],
-            "vapor_fraction": ts_result["vapor_fraction"]
-        }
-        
-        # Process each property with proper error handling
-        properties_to_compare = [
-            {"name": "pressure", "short": "P", "original_key": "original_pressure", "calculated_key": "pressure", "abs_scale": 1.0, "use_kelvin": False},
-            {"name": "density", "short": "D", "original_key": "original_density", "calculated_key": "density", "abs_scale": 1.0, "use_kelvin": False},
-            {"name": "enthalpy", "short": "H", "original_key": "original_enthalpy", "calculated_key": "enthalpy", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "internal_energy", "short": "U", "original_key": "original_internal_energy", "calculated_key": "internal_energy", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "Cv", "short": "Cv", "original_key": "original_Cv", "calculated_key": "Cv", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "Cp", "short": "Cp", "original_key": "original_Cp", "calculated_key": "Cp", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "sound_speed", "short": "W", "original_key": "original_sound_speed", "calculated_key": "sound_speed", "abs_scale": 0.1, "use_kelvin": False},
-            {"name": "compressibility_factor", "short": "Z", "original_key": "original_compressibility_factor", "calculated_key": "compressibility_factor", "abs_scale": 0.001, "use_kelvin": False},
-            {"name": "viscosity", "short": "Visc", "original_key": "original_viscosity", "calculated_key": "viscosity", "abs_scale": 0.01, "use_kelvin": False},
-            {"name": "thermal_conductivity", "short": "TC", "original_key": "original_thermal_conductivity", "calculated_key": "thermal_conductivity", "abs_scale": 0.001, "use_kelvin": False}
-        ]
-        
-        # Calculate differences for each property
-        for prop in properties_to_compare:
-            if prop["original_key"] in ts_result and prop["calculated_key"] in ts_result:
-                original_val = ts_result[prop["original_key"]]
-                calculated_val = ts_result[prop["calculated_key"]]
-                
-                # Store original and calculated values
-                comparison[f"original_{prop['short']}"] = original_val
-                comparison[f"calculated_{prop['short']}"] = calculated_val
-                
-                # Calculate absolute difference (scaled for better readability)
-                diff_abs = (calculated_val - original_val) * prop["abs_scale"]
-                comparison[f"{prop['short']}_diff_abs"] = diff_abs
-                
-                # Calculate relative difference
-                if original_val != 0:
-                    diff_rel = diff_abs / (original_val * prop["abs_scale"]) * 100
-                else:
-                    diff_rel = np.nan
-                        
-                comparison[f"{prop['short']}_diff_rel"] = diff_rel
-        
-        pt_ts_comparison_results.append(comparison)
-    
-    # 4.3: Create DataFrames for better display
-    df_pt_ph = pd.DataFrame(pt_ph_comparison_results)
-    df_pt_ts = pd.DataFrame(pt_ts_comparison_results)
-    
-    # Identify all property columns for rounding and statistics
-    property_columns = {}
-    for col in df_pt_ph.columns:
-        if col.endswith('_diff_abs') or col.endswith('_diff_rel'):
-            property_columns[col] = 6
-        elif col.startswith('original_') or col.startswith('calculated_'):
-            property_columns[col] = 4
-    
-    # Round values for better readability
-    df_pt_ph = df_pt_ph.round(property_columns)
-    df_pt_ts = df_pt_ts.round(property_columns)
+    print("\nComparison 2: PT-flash vs TS-flash", file=report)
+    df_pt_ts = compare_flash_results(
+        ts_records, pt_results, ts_completed,
+        {"temperature": "original_temperature", "original_P": "original_pressure", "calculated_P": "pressure",
+         "phase": "phase", "vapor_fraction": "vapor_fraction"},
+        PT_TS_PROPERTIES
+    )
+    
+    # 4.3: Round values for better readability
+    round_comparison(df_pt_ph)
+    round_comparison(df_pt_ts)
+    
+    # Magnitudes of the differences, shared by the summaries and the scores
+    abs_diffs_pt_ph = abs_differences(df_pt_ph)
+    abs_diffs_pt_ts = abs_differences(df_pt_ts)
     
     # 5: Calculate summary statistics for each comparison
-    print("\nSummary Statistics for PT-flash vs PH-flash:")
-    property_shorts_pt_ph = ["T", "D", "S", "U", "Cv", "Cp", "W", "Z", "Visc", "TC"]
-    property_names_pt_ph = [
-        "Temperature", "Density", "Entropy", "Internal Energy", 
-        "Cv", "Cp", "Sound Speed", "Compressibility", 
-        "Viscosity", "Thermal Conductivity"
-    ]
-    property_units_pt_ph = [
-        "°C", "mol/L", "J/(mol·K)", "J/mol", 
-        "J/(mol·K)", "J/(mol·K)", "m/s", "-", 
-        "μPa·s", "W/(m·K)"
-    ]
+    print("\nSummary Statistics for PT-flash vs PH-flash:", file=report)
+    property_shorts_pt_ph, property_names_pt_ph, property_units_pt_ph = zip(*SUMMARY_PROPERTIES_PT_PH)
     
     # Table for PT vs PH summary statistics
-    summary_table_pt_ph = []
-    pt_ph_stats = {}
-    
-    for short, name, unit in zip(property_shorts_pt_ph, property_names_pt_ph, property_units_pt_ph):
-        abs_col = f"{short}_diff_abs"
-        rel_col = f"{short}_diff_rel"
-        
-        if abs_col in df_pt_ph.columns and rel_col in df_pt_ph.columns:
-            # Calculate statistics
-            abs_mean = df_pt_ph[abs_col].abs().mean()
-            abs_max = df_pt_ph[abs_col].abs().max()
-            rel_mean = df_pt_ph[rel_col].abs().mean()
-            rel_max = df_pt_ph[rel_col].abs().max()
-            
-            # Store stats for return value
-            pt_ph_stats[short] = {
-                'abs_mean': abs_mean,
-                'abs_max': abs_max,
-                'rel_mean': rel_mean,
-                'rel_max': rel_max
-            }
-            
-            # Add to summary table
-            summary_table_pt_ph.append([
-                name, unit, f"{abs_mean:.6f}", f"{abs_max:.6f}", 
-                f"{rel_mean:.4f}%", f"{rel_max:.4f}%"
-            ])
+    summary_table_pt_ph, pt_ph_stats = summarize_differences(abs_diffs_pt_ph, property_shorts_pt_ph, property_names_pt_ph, property_units_pt_ph)
     
     # Display the PT vs PH summary statistics table
-    summary_headers = ["Property", "Unit", "Mean Abs Diff", "Max Abs Diff", "Mean Rel Diff", "Max Rel Diff"]
-    print(tabulate(summary_table_pt_ph, headers=summary_headers, tablefmt="grid"))
-    
-    print("\nSummary Statistics for PT-flash vs TS-flash:")
-    property_shorts_pt_ts = ["P", "D", "H", "U", "Cv", "Cp", "W", "Z", "Visc", "TC"]
-    property_names_pt_ts = [
-        "Pressure", "Density", "Enthalpy", "Internal Energy", 
-        "Cv", "Cp", "Sound Speed", "Compressibility", 
-        "Viscosity", "Thermal Conductivity"
-    ]
-    property_units_pt_ts = [
-        "bar", "mol/L", "J/mol", "J/mol", 
-        "J/(mol·K)", "J/(mol·K)", "m/s", "-", 
-        "μPa·s", "W/(m·K)"
-    ]
+    print(tabulate(summary_table_pt_ph, headers=SUMMARY_HEADERS, tablefmt="grid", disable_numparse=True), file=report)
     
-    # Table for PT vs TS summary statistics
-    summary_table_pt_ts = []
-    pt_ts_stats = {}
+    print("\nSummary Statistics for PT-flash vs TS-flash:", file=report)
+    property_shorts_pt_ts, property_names_pt_ts, property_units_pt_ts = zip(*SUMMARY_PROPERTIES_PT_TS)
     
-    for short, name, unit in zip(property_shorts_pt_ts, property_names_pt_ts, property_units_pt_ts):
-        abs_col = f"{short}_diff_abs"
-        rel_col = f"{short}_diff_rel"
-        
-        if abs_col in df_pt_ts.columns and rel_col in df_pt_ts.columns:
-            # Calculate statistics
-            abs_mean = df_pt_ts[abs_col].abs().mean()
-            abs_max = df_pt_ts[abs_col].abs().max()
-            rel_mean = df_pt_ts[rel_col].abs().mean()
-            rel_max = df_pt_ts[rel_col].abs().max()
-            
-            # Store stats for return value
-            pt_ts_stats[short] = {
-                'abs_mean': abs_mean,
-                'abs_max': abs_max,
-                'rel_mean': rel_mean,
-                'rel_max': rel_max
-            }
-            
-            # Add to summary table
-            summary_table_pt_ts.append([
-                name, unit, f"{abs_mean:.6f}", f"{abs_max:.6f}", 
-                f"{rel_mean:.4f}%", f"{rel_max:.4f}%"
-            ])
+    # Table for PT vs TS summary statistics
+    summary_table_pt_ts, pt_ts_stats = summarize_differences(abs_diffs_pt_ts, property_shorts_pt_ts, property_names_pt_ts, property_units_pt_ts)
     
     # Display the PT vs TS summary statistics table
-    print(tabulate(summary_table_pt_ts, headers=summary_headers, tablefmt="grid"))
+    print(tabulate(summary_table_pt_ts, headers=SUMMARY_HEADERS, tablefmt="grid", disable_numparse=True), file=report)
     
     # 6: Display key comparison details
     # Display the temperature and pressure comparison as main tables (most important properties)
-    print("\nDetailed PT-flash vs PH-flash Comparison (Temperature and Density):")
-    headers_pt_ph = [
-        "P (bar)", "Original T (°C)", "Calc T (°C)", "T diff", "T diff %", 
-        "Original D (mol/L)", "Calc D (mol/L)", "D diff", "D diff %", "Phase"
-    ]
-    
-    # Use only columns that definitely exist
-    display_columns_pt_ph = ['pressure']
-    for col in ['original_T', 'calculated_T', 'T_diff_abs', 'T_diff_rel',
-               'original_D', 'calculated_D', 'D_diff_abs', 'D_diff_rel', 'phase']:
-        if col in df_pt_ph.columns:
-            display_columns_pt_ph.append(col)
-    
-    table_data_pt_ph = df_pt_ph[display_columns_pt_ph].head(10).values.tolist()  # Show first 10 rows
-    print(tabulate(table_data_pt_ph, headers=headers_pt_ph[:len(display_columns_pt_ph)], tablefmt="grid"))
-    
-    print("\nDetailed PT-flash vs TS-flash Comparison (Pressure and Density):")
-    headers_pt_ts = [
-        "T (°C)", "Original P (bar)", "Calc P (bar)", "P diff", "P diff %", 
-        "Original D (mol/L)", "Calc D (mol/L)", "D diff", "D diff %", "Phase"
-    ]
+    print("\nDetailed PT-flash vs PH-flash Comparison (Temperature and Density):", file=report)
+    table_data_pt_ph, headers_pt_ph = detail_table(df_pt_ph, DETAIL_COLUMNS_PT_PH)
+    print(tabulate(table_data_pt_ph, headers=headers_pt_ph, tablefmt="grid"), file=report)
     
-    # Use only columns that definitely exist
-    display_columns_pt_ts = ['temperature']
-    for col in ['original_P', 'calculated_P', 'P_diff_abs', 'P_diff_rel',
-               'original_D', 'calculated_D', 'D_diff_abs', 'D_diff_rel', 'phase']:
-        if col in df_pt_ts.columns:
-            display_columns_pt_ts.append(col)
-    
-    table_data_pt_ts = df_pt_ts[display_columns_pt_ts].head(10).values.tolist()  # Show first 10 rows
-    print(tabulate(table_data_pt_ts, headers=headers_pt_ts[:len(display_columns_pt_ts)], tablefmt="grid"))
+    print("\nDetailed PT-flash vs TS-flash Comparison (Pressure and Density):", file=report)
+    table_data_pt_ts, headers_pt_ts = detail_table(df_pt_ts, DETAIL_COLUMNS_PT_TS)
+    print(tabulate(table_data_pt_ts, headers=headers_pt_ts, tablefmt="grid"), file=report)
     
     # 7: Calculate overall consistency scores
-    property_scores_pt_ph = {}
-    for short in property_shorts_pt_ph:
-        rel_col = f"{short}_diff_rel"
-        if rel_col in df_pt_ph.columns:
-            # Calculate percentage of points with relative difference < 0.5%
-            good_points = (df_pt_ph[rel_col].abs() < 0.5).sum()
-            acceptable_points = ((df_pt_ph[rel_col].abs() >= 0.5) & (df_pt_ph[rel_col].abs() < 2.0)).sum()
-            
-            if len(df_pt_ph) > 0:
-                good_percent = good_points / len(df_pt_ph) * 100
-                acceptable_percent = acceptable_points / len(df_pt_ph) * 100
-                property_scores_pt_ph[short] = (good_percent, acceptable_percent)
-    
-    property_scores_pt_ts = {}
-    for short in property_shorts_pt_ts:
-        rel_col = f"{short}_diff_rel"
-        if rel_col in df_pt_ts.columns:
-            # Calculate percentage of points with relative difference < 0.5%
-            good_points = (df_pt_ts[rel_col].abs() < 0.5).sum()
-            acceptable_points = ((df_pt_ts[rel_col].abs() >= 0.5) & (df_pt_ts[rel_col].abs() < 2.0)).sum()
-            
-            if len(df_pt_ts) > 0:
-                good_percent = good_points / len(df_pt_ts) * 100
-                acceptable_percent = acceptable_points / len(df_pt_ts) * 100
-                property_scores_pt_ts[short] = (good_percent, acceptable_percent)
+    property_scores_pt_ph = consistency_scores(abs_diffs_pt_ph, property_shorts_pt_ph)
+    property_scores_pt_ts = consistency_scores(abs_diffs_pt_ts, property_shorts_pt_ts)
     
     # 8: Evaluate overall sanity check result
-    print("\nOverall Sanity Check Results:")
+    print("\nOverall Sanity Check Results:", file=report)
     
-    # PT vs PH evaluation
-    if 'T' in property_scores_pt_ph and 'D' in property_scores_pt_ph:
-        t_good, t_acceptable = property_scores_pt_ph['T']
-        d_good, d_acceptable = property_scores_pt_ph['D']
-        
-        if t_good > 80 and d_good > 80:
-            pt_ph_result = "PASSED: PT-flash and PH-flash results are highly consistent."
-        elif (t_good + t_acceptable) > 80 and (d_good + d_acceptable) > 80:
-            pt_ph_result = "PARTIALLY PASSED: Some discrepancies exist but are within reasonable limits."
-        else:
-            pt_ph_result = "FAILED: Significant discrepancies between PT-flash and PH-flash results."
-    else:
-        # Fallback to simpler criteria if property scores can't be calculated
-        try:
-            t_diff_rel_mean = df_pt_ph['T_diff_rel'].abs().mean()
-            d_diff_rel_mean = df_pt_ph['D_diff_rel'].abs().mean()
-            
-            if t_diff_rel_mean < 0.5 and d_diff_rel_mean < 0.5:
-                pt_ph_result = "PASSED: PT-flash and PH-flash results are consistent."
-            elif t_diff_rel_mean < 2.0 and d_diff_rel_mean < 2.0:
-                pt_ph_result = "PARTIALLY PASSED: Some discrepancies exist but are within reasonable limits."
-            else:
-                pt_ph_result = "FAILED: Significant discrepancies between PT-flash and PH-flash results."
-        except:
-            pt_ph_result = "UNABLE TO EVALUATE: Missing or invalid comparison data."
-    
-    # PT vs TS evaluation
-    if 'P' in property_scores_pt_ts and 'D' in property_scores_pt_ts:
-        p_good, p_acceptable = property_scores_pt_ts['P']
-        d_good, d_acceptable = property_scores_pt_ts['D']
-        
-        if p_good > 80 and d_good > 80:
-            pt_ts_result = "PASSED: PT-flash and TS-flash results are highly consistent."
-        elif (p_good + p_acceptable) > 80 and (d_good + d_acceptable) > 80:
-            pt_ts_result = "PARTIALLY PASSED: Some discrepancies exist but are within reasonable limits."
-        else:
-            pt_ts_result = "FAILED: Significant discrepancies between PT-flash and TS-flash results."
-    else:
-        # Fallback to simpler criteria if property scores can't be calculated
-        try:
-            p_diff_rel_mean = df_pt_ts['P_diff_rel'].abs().mean()
-            d_diff_rel_mean = df_pt_ts['D_diff_rel'].abs().mean()
-            
-            if p_diff_rel_mean < 0.5 and d_diff_rel_mean < 0.5:
-                pt_ts_result = "PASSED: PT-flash and TS-flash results are consistent."
-            elif p_diff_rel_mean < 2.0 and d_diff_rel_mean < 2.0:
-                pt_ts_result = "PARTIALLY PASSED: Some discrepancies exist but are within reasonable limits."
-            else:
-                pt_ts_result = "FAILED: Significant discrepancies between PT-flash and TS-flash results."
-        except:
-            pt_ts_result = "UNABLE TO EVALUATE: Missing or invalid comparison data."
+    pt_ph_code, pt_ph_result = evaluate_comparison(
+        property_scores_pt_ph, pt_ph_stats, ("T", "D"), "PT-flash and PH-flash"
+    )
+    pt_ts_code, pt_ts_result = evaluate_comparison(
+        property_scores_pt_ts, pt_ts_stats, ("P", "D"), "PT-flash and TS-flash"
+    )
     
     # Show overall results
-    print("\nPT-flash vs PH-flash: " + pt_ph_result)
-    print("PT-flash vs TS-flash: " + pt_ts_result)
+    print("\nPT-flash vs PH-flash: " + pt_ph_result, file=report)
+    print("PT-flash vs TS-flash: " + pt_ts_result, file=report)
     
     # Overall cross-consistency result
-    if pt_ph_result.startswith("PASSED") and pt_ts_result.startswith("PASSED"):
+    if pt_ph_code == pt_ts_code == VERDICT_PASSED:
         overall_result = "PASSED"
-        overall_message = "All three calculation methods (PT, PH, TS) are consistently producing the same thermodynamic properties."
-    elif pt_ph_result.startswith("PARTIALLY") and pt_ts_result.startswith("PARTIALLY"):
+    elif pt_ph_code == pt_ts_code == VERDICT_PARTIALLY_PASSED:
         overall_result = "PARTIALLY PASSED"
-        overall_message = "The three calculation methods show moderate consistency with acceptable discrepancies."
-    elif "FAILED" in pt_ph_result or "FAILED" in pt_ts_result:
+    elif VERDICT_FAILED in (pt_ph_code, pt_ts_code):
         overall_result = "FAILED"
-        overall_message = "Significant discrepancies exist between the different calculation methods."
     else:
         overall_result = "INCONCLUSIVE"
-        overall_message = "Could not properly evaluate consistency across all three calculation methods."
+    overall_message = OVERALL_MESSAGES[overall_result]
     
-    print(f"\nOVERALL SANITY CHECK: {overall_result}")
-    print(overall_message)
+    print(f"\nOVERALL SANITY CHECK: {overall_result}", file=report)
+    print(overall_message, file=report)
     
     # 9: Check for any specific property issues
-    print("\nProperty-specific observations:")
+    print("\nProperty-specific observations:", file=report)
     property_warnings = []
     
     # PT vs PH property issues
     for short, name in zip(property_shorts_pt_ph, property_names_pt_ph):
-        rel_col = f"{short}_diff_rel"
-        if rel_col in df_pt_ph.columns and not df_pt_ph[rel_col].isnull().all():
-            mean_diff = df_pt_ph[rel_col].abs().mean()
+        if short in pt_ph_stats and pt_ph_stats[short]['count'] > 0:
+            mean_diff = pt_ph_stats[short]['rel_mean']
             
             if mean_diff > 5.0:
                 issue = f"- Warning: PT vs PH {name} shows large discrepancies (mean {mean_diff:.2f}%)"
-                print(issue)
+                print(issue, file=report)
                 property_warnings.append(issue)
             elif mean_diff > 2.0:
                 issue = f"- Note: PT vs PH {name} shows moderate discrepancies (mean {mean_diff:.2f}%)"
-                print(issue)
+                print(issue, file=report)
                 property_warnings.append(issue)
     
     # PT vs TS property issues
     for short, name in zip(property_shorts_pt_ts, property_names_pt_ts):
-        rel_col = f"{short}_diff_rel"
-        if rel_col in df_pt_ts.columns and not df_pt_ts[rel_col].isnull().all():
-            mean_diff = df_pt_ts[rel_col].abs().mean()
+        if short in pt_ts_stats and pt_ts_stats[short]['count'] > 0:
+            mean_diff = pt_ts_stats[short]['rel_mean']
             
             if mean_diff > 5.0:
                 issue = f"- Warning: PT vs TS {name} shows large discrepancies (mean {mean_diff:.2f}%)"
-                print(issue)
+                print(issue, file=report)
                 property_warnings.append(issue)
             elif mean_diff > 2.0:
                 issue = f"- Note: PT vs TS {name} shows moderate discrepancies (mean {mean_diff:.2f}%)"
-                print(issue)
+                print(issue, file=report)
                 property_warnings.append(issue)
     
     reasons = [
@@ -708,9 +845,11 @@ def sanity_check_eos_with_composition(composition, description):
         "6. Thermodynamic consistency of the underlying equation of state"
     ]
     
-    print("\nPossible reasons for discrepancies:")
+    print("\nPossible reasons for discrepancies:", file=report)
     for reason in reasons:
-        print(reason)
+        print(reason, file=report)
+    
+    sys.stdout.write(report.getvalue())
     
     # Return results
     results = {
@@ -731,6 +870,27 @@ def sanity_check_eos_with_composition(composition, description):
     
     return results
 
+def composition_stats(results):
+    """
+    Collect the mean relative differences of all tested compositions.
+    
+    Args:
+        results: Results returned by sanity_check_eos_with_composition
+    
+    Returns:
+        DataFrame with one row per composition, comparison and property
+    """
+    rows = [
+        (i, comparison, short, stat_dict.get("rel_mean", np.nan))
+        for i, result in enumerate(results)
+        for comparison, key in (("PT-PH", "pt_ph_stats"), ("PT-TS", "pt_ts_stats"))
+        for short, stat_dict in result[key].items()
+    ]
+    # Typed once here, so an all-error run still gives numeric columns
+    return pd.DataFrame(rows, columns=["composition", "comparison", "property", "rel_mean"]).astype(
+        {"composition": "int64", "rel_mean": "float64"}
+    )
+
 def run_composition_tests():
     """
     Run multiple sanity checks with different compositions
@@ -898,47 +1058,46 @@ def run_composition_tests():
                 "raw_data": None
             })
     
-    # Generate overall summary
-    print(f"\n\n{'*' * 100}")
-    print("* SUMMARY OF ALL COMPOSITION TESTS")
-    print(f"{'*' * 100}")
+    # Generate overall summary, collected in memory and written out once
+    report = io.StringIO()
+    print(f"\n\n{'*' * 100}", file=report)
+    print("* SUMMARY OF ALL COMPOSITION TESTS", file=report)
+    print(f"{'*' * 100}", file=report)
+    
+    # Key metrics and severe discrepancies of all compositions, from one stats frame
+    stats = composition_stats(results)
+    key_metrics = (
+        stats.set_index(["composition", "comparison", "property"])["rel_mean"]
+        .unstack(["comparison", "property"])
+        .reindex(index=range(len(results)), columns=pd.MultiIndex.from_tuples(KEY_METRICS))
+        .to_numpy()
+    )
+    key_metric_strings = np.where(np.isnan(key_metrics), "N/A", np.char.mod("%.4f%%", key_metrics)).tolist()
+    
+    overall_results = np.array([r["overall_result"] for r in results])
+    co2_percents = np.array([next((c["fraction"] * 100 for c in r["composition"] if c["fluid"] == "CO2"), 0)
+                             for r in results])
+    component_counts = np.array([len(r["composition"]) for r in results], dtype=int)
+    
+    severe = stats[stats["rel_mean"] > 5.0]
+    severe_issues_by_composition = (severe["comparison"] + " " + severe["property"]).groupby(severe["composition"], sort=False).agg(list)
     
     summary_table = []
-    for result in results:
-        co2_pct = next((c["fraction"] * 100 for c in result["composition"] if c["fluid"] == "CO2"), 0)
-        num_components = len(result["composition"])
-        
-        # Extract key metrics for primary properties
-        pt_ph_temp_diff = result["pt_ph_stats"].get("T", {}).get("rel_mean", float('nan'))
-        pt_ph_dens_diff = result["pt_ph_stats"].get("D", {}).get("rel_mean", float('nan'))
-        pt_ts_pres_diff = result["pt_ts_stats"].get("P", {}).get("rel_mean", float('nan'))
-        pt_ts_dens_diff = result["pt_ts_stats"].get("D", {}).get("rel_mean", float('nan'))
-        
+    for i, (result, metric_strings) in enumerate(zip(results, key_metric_strings)):
         # Determine if there are any severe discrepancies
-        severe_issues = []
-        for stat_key, stat_dict in result["pt_ph_stats"].items():
-            if stat_dict.get("rel_mean", 0) > 5.0:
-                severe_issues.append(f"PT-PH {stat_key}")
-        
-        for stat_key, stat_dict in result["pt_ts_stats"].items():
-            if stat_dict.get("rel_mean", 0) > 5.0:
-                severe_issues.append(f"PT-TS {stat_key}")
-        
+        severe_issues = severe_issues_by_composition.get(i, [])
         severe_str = ", ".join(severe_issues[:3])
         if len(severe_issues) > 3:
             severe_str += f" and {len(severe_issues) - 3} more"
         
         summary_table.append([
-            f"{co2_pct:.0f}% CO2",
-            num_components,
+            f"{co2_percents[i]:.0f}% CO2",
+            len(result["composition"]),
             result["description"],
             result["pt_ph_result"].split(":")[0],
             result["pt_ts_result"].split(":")[0],
             result["overall_result"],
-            f"{pt_ph_temp_diff:.4f}%" if not np.isnan(pt_ph_temp_diff) else "N/A",
-            f"{pt_ph_dens_diff:.4f}%" if not np.isnan(pt_ph_dens_diff) else "N/A",
-            f"{pt_ts_pres_diff:.4f}%" if not np.isnan(pt_ts_pres_diff) else "N/A",
-            f"{pt_ts_dens_diff:.4f}%" if not np.isnan(pt_ts_dens_diff) else "N/A",
+            *metric_strings,
             severe_str if severe_issues else "None"
         ])
     
@@ -956,54 +1115,58 @@ def run_composition_tests():
         "Severe Issues"
     ]
     
-    print("\nComposition Test Summary:")
-    print(tabulate(summary_table, headers=summary_headers, tablefmt="grid"))
+    print("\nComposition Test Summary:", file=report)
+    print(tabulate(summary_table, headers=summary_headers, tablefmt="grid", disable_numparse=True), file=report)
     
     # Draw conclusions about the best composition ranges
-    print("\nConclusions:")
+    print("\nConclusions:", file=report)
     
-    # Count results by type
-    passed_count = sum(1 for r in results if r["overall_result"] == "PASSED")
-    partial_count = sum(1 for r in results if r["overall_result"] == "PARTIALLY PASSED")
-    failed_count = sum(1 for r in results if r["overall_result"] == "FAILED")
-    error_count = sum(1 for r in results if r["overall_result"] == "ERROR")
+    # Count results by type in one pass over the overall results
+    result_counts = dict(zip(*np.unique(overall_results, return_counts=True)))
+    passed_count = result_counts.get("PASSED", 0)
+    partial_count = result_counts.get("PARTIALLY PASSED", 0)
+    failed_count = result_counts.get("FAILED", 0)
+    error_count = result_counts.get("ERROR", 0)
     
-    print(f"- {passed_count} compositions PASSED the sanity check")
-    print(f"- {partial_count} compositions PARTIALLY PASSED the sanity check")
-    print(f"- {failed_count} compositions FAILED the sanity check")
-    print(f"- {error_count} compositions had ERRORS during testing")
+    print(f"- {passed_count} compositions PASSED the sanity check", file=report)
+    print(f"- {partial_count} compositions PARTIALLY PASSED the sanity check", file=report)
+    print(f"- {failed_count} compositions FAILED the sanity check", file=report)
+    print(f"- {error_count} compositions had ERRORS during testing", file=report)
     
     # Analyze by CO2 percentage
-    passed_co2 = [next((c["fraction"] * 100 for c in r["composition"] if c["fluid"] == "CO2"), 0) 
-                  for r in results if r["overall_result"] == "PASSED"]
+    passed = overall_results == "PASSED"
+    passed_co2 = co2_percents[passed]
     
-    if passed_co2:
-        print(f"\nThe API performs best with compositions containing:")
-        print(f"- CO2 percentages: {', '.join(f'{x:.0f}%' for x in passed_co2)}")
+    if passed_co2.size:
+        print(f"\nThe API performs best with compositions containing:", file=report)
+        print(f"- CO2 percentages: {', '.join(f'{x:.0f}%' for x in passed_co2)}", file=report)
         
         # Component count analysis
-        passed_comp_counts = [len(r["composition"]) for r in results if r["overall_result"] == "PASSED"]
-        if passed_comp_counts:
-            min_comps = min(passed_comp_counts)
-            max_comps = max(passed_comp_counts)
-            comp_range = f"{min_comps}" if min_comps == max_comps else f"{min_comps}-{max_comps}"
-            print(f"- Component count: {comp_range}")
+        passed_comp_counts = component_counts[passed]
+        min_comps = passed_comp_counts.min()
+        max_comps = passed_comp_counts.max()
+        comp_range = f"{min_comps}" if min_comps == max_comps else f"{min_comps}-{max_comps}"
+        print(f"- Component count: {comp_range}", file=report)
     
     # Recommendations
-    print("\nRecommendations:")
+    print("\nRecommendations:", file=report)
     if passed_count > 0:
-        print("- For most accurate results, use compositions that passed the sanity check")
+        print("- For most accurate results, use compositions that passed the sanity check", file=report)
     elif partial_count > 0:
-        print("- Use compositions that at least partially pass the sanity check")
-        print("- Exercise caution with calculations that involve transport properties, which tend to show greater inconsistencies")
+        print("- Use compositions that at least partially pass the sanity check", file=report)
+        print("- Exercise caution with calculations that involve transport properties, which tend to show greater inconsistencies", file=report)
     else:
-        print("- The API appears to have significant consistency issues with all tested compositions")
-        print("- Consider simplifying to binary mixtures or improving the underlying modeling approach")
+        print("- The API appears to have significant consistency issues with all tested compositions", file=report)
+        print("- Consider simplifying to binary mixtures or improving the underlying modeling approach", file=report)
+    
+    print("\nFor future work:", file=report)
+    print("- Implement validation checks in the API to warn users about potential inconsistencies", file=report)
+    print("- Improve the numerical methods for complex mixtures, especially for transport properties", file=report)
+    print("- Consider adding composition complexity limitations in the API documentation", file=report)
+    
+    print(f"\nFlash point cache: {flash_point.cache_info()}", file=report)
     
-    print("\nFor future work:")
-    print("- Implement validation checks in the API to warn users about potential inconsistencies")
-    print("- Improve the numerical methods for complex mixtures, especially for transport properties")
-    print("- Consider adding composition complexity limitations in the API documentation")
+    sys.stdout.write(report.getvalue())
     
     return results
 